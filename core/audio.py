@@ -0,0 +1,164 @@
+"""Offline audio analysis into per-frame band envelopes."""
+
+import hashlib
+import os
+import threading
+import wave
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# column order of analysis arrays
+BANDS = ("RMS", "LOW", "MID", "HIGH")
+BAND_RANGES = {"LOW": (20.0, 250.0), "MID": (250.0, 4000.0), "HIGH": (4000.0, 20000.0)}
+
+
+def read_wav(path) -> Tuple[np.ndarray, int]:
+    """Return (mono float samples in [-1, 1], sample rate) of a PCM WAV file."""
+    with wave.open(str(path), "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+    return data.reshape(-1, channels).mean(axis=1), rate
+
+
+def analyze(samples: np.ndarray, rate: int, fps: float) -> np.ndarray:
+    """Return an (frames, len(BANDS)) array of envelopes normalized to [0, 1].
+
+    Each video frame covers rate / fps samples; RMS is taken directly and
+    band levels from the magnitude spectrum of the Hann windowed block.
+    """
+    hop = max(1, int(round(rate / fps)))
+    count = max(1, int(np.ceil(len(samples) / hop)))
+    blocks = np.zeros(count * hop, dtype=np.float32)
+    blocks[: len(samples)] = samples
+    blocks = blocks.reshape(count, hop)
+    out = np.empty((count, len(BANDS)), dtype=np.float32)
+    out[:, 0] = np.sqrt(np.mean(blocks ** 2, axis=1))
+    spectrum = np.abs(np.fft.rfft(blocks * np.hanning(hop), axis=1))
+    freqs = np.fft.rfftfreq(hop, 1.0 / rate)
+    for col, band in enumerate(BANDS[1:], start=1):
+        lo, hi = BAND_RANGES[band]
+        mask = (freqs >= lo) & (freqs < hi)
+        out[:, col] = np.sqrt(np.mean(spectrum[:, mask] ** 2, axis=1)) if mask.any() else 0.0
+    peak = out.max(axis=0)
+    peak[peak == 0] = 1.0
+    return out / peak
+
+
+def follow(values: np.ndarray, attack: float, release: float) -> np.ndarray:
+    """Smooth values with separate attack and release times in frames."""
+    values = np.asarray(values, dtype=np.float64)
+    if attack <= 0 and release <= 0:
+        return values
+    up = 1.0 - np.exp(-1.0 / attack) if attack > 0 else 1.0
+    down = 1.0 - np.exp(-1.0 / release) if release > 0 else 1.0
+    out = np.empty_like(values)
+    level = 0.0
+    for i, v in enumerate(values.tolist()):
+        level += (v - level) * (up if v > level else down)
+        out[i] = level
+    return out
+
+
+def file_key(path, fps: float) -> str:
+    """Return a cache key from the file contents and the frame rate."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return f"{h.hexdigest()}_{fps:g}"
+
+
+class AudioCache:
+    """Band envelopes stored as .npy files and opened memory mapped.
+
+    get() never blocks on analysis: a missing file is analyzed in a
+    background thread and None is returned until it is ready.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._arrays: Dict[Tuple[str, float], np.ndarray] = {}
+        self._envelopes: Dict[tuple, np.ndarray] = {}
+        self._jobs: Dict[Tuple[str, float], threading.Thread] = {}
+        self.errors: Dict[Tuple[str, float], str] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def _analyze(self, source: str, fps: float) -> None:
+        try:
+            target = self._path(file_key(source, fps))
+            if not target.exists():
+                samples, rate = read_wav(source)
+                data = analyze(samples, rate, fps)
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.stem + f".{os.getpid()}.tmp.npy")
+                np.save(tmp, data)
+                os.replace(tmp, target)
+            arr = np.load(target, mmap_mode="r")
+            with self._lock:
+                self._arrays[(source, fps)] = arr
+        except (OSError, EOFError, ValueError, wave.Error) as exc:
+            with self._lock:
+                self.errors[(source, fps)] = str(exc)
+
+    def get(self, source: str, fps: float) -> Optional[np.ndarray]:
+        """Return the analysis of source at fps, starting it if needed."""
+        key = (source, fps)
+        with self._lock:
+            arr = self._arrays.get(key)
+            if arr is not None or key in self.errors:
+                return arr
+            job = self._jobs.get(key)
+            if job is None or not job.is_alive():
+                job = threading.Thread(target=self._analyze, args=key, daemon=True)
+                self._jobs[key] = job
+                job.start()
+        return None
+
+    def wait(self, source: str, fps: float, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Like get(), but block until the analysis has finished."""
+        arr = self.get(source, fps)
+        job = self._jobs.get((source, fps))
+        if arr is None and job is not None:
+            job.join(timeout)
+        return self._arrays.get((source, fps))
+
+    def envelope(
+        self, source: str, fps: float, band: str, attack: float = 0.0, release: float = 0.0
+    ) -> Optional[np.ndarray]:
+        """Return the smoothed envelope of one band, or None while analyzing."""
+        key = (source, fps, band, attack, release)
+        env = self._envelopes.get(key)
+        if env is None:
+            data = self.get(source, fps)
+            if data is None:
+                return None
+            column = np.asarray(data[:, BANDS.index(band)])
+            env = follow(column, attack, release)
+            self._envelopes[key] = env
+        return env
+
+    def clear(self) -> None:
+        with self._lock:
+            self._arrays.clear()
+            self._envelopes.clear()
+            self.errors.clear()
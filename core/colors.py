@@ -0,0 +1,79 @@
+"""Vectorized color helpers for batch material operations."""
+
+import numpy as np
+
+
+HARMONY_OFFSETS = {
+    "TRIAD": (0.0, 1.0 / 3.0, 2.0 / 3.0),
+    "COMPLEMENT": (0.0, 0.5),
+}
+
+
+def make_rng(seed: int = 0) -> np.random.Generator:
+    """Return a generator seeded with seed, or a fresh one when seed is 0."""
+    return np.random.default_rng(seed if seed else None)
+
+
+def rgb_to_hsv(rgb) -> np.ndarray:
+    """Convert an (N, 3) RGB array to HSV, matching colorsys."""
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    delta = maxc - minc
+    s = np.divide(delta, maxc, out=np.zeros_like(maxc), where=maxc > 0)
+    safe = np.where(delta > 0, delta, 1.0)
+    rc = (maxc - r) / safe
+    gc = (maxc - g) / safe
+    bc = (maxc - b) / safe
+    h = np.where(
+        r == maxc,
+        bc - gc,
+        np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc),
+    )
+    h = np.where(delta > 0, (h / 6.0) % 1.0, 0.0)
+    return np.stack([h, s, maxc], axis=1)
+
+
+def hsv_to_rgb(hsv) -> np.ndarray:
+    """Convert an (N, 3) HSV array to RGB, matching colorsys."""
+    hsv = np.asarray(hsv, dtype=np.float64).reshape(-1, 3)
+    h, s, v = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=1)
+
+
+def hue_shift(rgb, hue_range: float, rng: np.random.Generator) -> np.ndarray:
+    """Shift the hue of every row in rgb by a random amount in +-hue_range."""
+    hsv = rgb_to_hsv(rgb)
+    hsv[:, 0] = (hsv[:, 0] + rng.uniform(-hue_range, hue_range, len(hsv))) % 1.0
+    return hsv_to_rgb(hsv)
+
+
+def palette(
+    base_rgb,
+    count: int,
+    rng: np.random.Generator,
+    harmony: str = "NONE",
+    hue_range: float = 0.1,
+    sat_range: float = 0.1,
+    val_range: float = 0.1,
+) -> np.ndarray:
+    """Return count RGB variations of base_rgb following a harmony rule."""
+    h, s, v = rgb_to_hsv(np.asarray(base_rgb, dtype=np.float64)[:3])[0]
+    offsets = HARMONY_OFFSETS.get(harmony)
+    if offsets:
+        hues = h + rng.choice(np.asarray(offsets), count)
+    else:
+        hues = h + rng.uniform(-hue_range, hue_range, count)
+    sats = np.clip(s + rng.uniform(-sat_range, sat_range, count), 0.0, 1.0)
+    vals = np.clip(v + rng.uniform(-val_range, val_range, count), 0.0, 1.0)
+    return hsv_to_rgb(np.stack([hues % 1.0, sats, vals], axis=1))
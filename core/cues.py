@@ -0,0 +1,98 @@
+"""Precompiled cue lists that swap signal stacks at cue frames."""
+
+from bisect import bisect_right
+from dataclasses import replace
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import morph, signals
+
+# (channel key, params, evaluated in tempo map ticks)
+Row = Tuple[Hashable, signals.SignalParams, bool]
+
+
+class CompiledCue:
+    """Signal stacks of every object a cue switches, stored as one table.
+
+    LIVE rows read the value given to set_live; live_sources holds what the
+    caller reads them from, one entry per live_rows index.
+    """
+
+    def __init__(self, frame: float, stacks: Dict[str, Sequence[Row]], name: str = ""):
+        self.frame = frame
+        self.name = name
+        self.objects = list(stacks)
+        self.owners: List[str] = []
+        self.keys: List[Hashable] = []
+        self.params: List[signals.SignalParams] = []
+        beats = []
+        for obj_name, rows in stacks.items():
+            for key, params, in_beats in rows:
+                self.owners.append(obj_name)
+                self.keys.append(key)
+                self.params.append(params)
+                beats.append(in_beats)
+        self.beats = np.array(beats, dtype=bool)
+        self.table = morph.ParamTable.from_params(self.params)
+        self._slow = [i for i, p in enumerate(self.params) if not morph.vectorizable(p)]
+        self.live_rows = [i for i, p in enumerate(self.params) if p.signal_type == "LIVE"]
+        self.live_sources: List[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def set_live(self, row: int, value: float) -> None:
+        """Set the input value LIVE row evaluates to until the next call."""
+        if self.params[row].live_value != value:
+            self.params[row] = replace(self.params[row], live_value=value)
+
+    def evaluate(self, frame: float, tick: Optional[float] = None, *, loop_lock: bool = False) -> np.ndarray:
+        """Return the value of every row at frame; beat rows run at tick."""
+        if not self.params:
+            return np.empty(0)
+        times = np.full(len(self), float(frame))
+        if tick is not None:
+            times[self.beats] = tick
+        out = morph.evaluate_rows(self.table, times, loop_lock)
+        for i in self._slow:
+            out[i] = signals.calc_signal(
+                self.params[i], int(times[i]), loop_lock=loop_lock, cache_key=(id(self), i)
+            )
+        return out
+
+
+class CueList:
+    """Cues sorted by frame, with the owning cue of every object after each.
+
+    Ownership is accumulated once here, so finding what plays at a frame is
+    a bisect plus a dictionary lookup and scrubbing backwards is exact.
+    """
+
+    def __init__(self, cues: Sequence[CompiledCue]):
+        self.cues = sorted(cues, key=lambda c: c.frame)
+        self.frames = [c.frame for c in self.cues]
+        self.owners: List[Dict[str, int]] = []
+        self.active: List[List[int]] = []
+        state: Dict[str, int] = {}
+        for i, cue in enumerate(self.cues):
+            state = dict(state)
+            state.update((name, i) for name in cue.objects)
+            self.owners.append(state)
+            self.active.append(sorted(set(state.values())))
+
+    def __len__(self) -> int:
+        return len(self.cues)
+
+    def index_at(self, frame: float) -> int:
+        """Index of the last cue fired at or before frame, -1 if none."""
+        return bisect_right(self.frames, frame) - 1
+
+    def owners_at(self, frame: float) -> Dict[str, int]:
+        i = self.index_at(frame)
+        return self.owners[i] if i >= 0 else {}
+
+    def active_at(self, frame: float) -> List[int]:
+        """Indices of the cues still owning an object at frame."""
+        i = self.index_at(frame)
+        return self.active[i] if i >= 0 else []
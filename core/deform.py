@@ -0,0 +1,44 @@
+"""Array helpers for the per-vertex wave channels."""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+VERTEX_CHANNELS = ("VTX_NORMAL", "VTX_X", "VTX_Y", "VTX_Z")
+PHASE_MODES = ("NONE", "X", "Y", "Z", "RADIAL", "GROUP")
+
+
+def phase_offsets(
+    mode: str, co: np.ndarray, scale: float, weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Return a start delay in frames per vertex.
+
+    Axis and radial modes delay each vertex by its coordinate (or its
+    distance to the origin) times scale, producing travelling waves;
+    GROUP delays by vertex group weight.
+    """
+    co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+    if mode in ("X", "Y", "Z"):
+        dist = co[:, "XYZ".index(mode)]
+    elif mode == "RADIAL":
+        dist = np.linalg.norm(co, axis=1)
+    elif mode == "GROUP" and weights is not None:
+        dist = np.asarray(weights, dtype=np.float64)
+    else:
+        return np.zeros(len(co))
+    return dist * scale
+
+
+def displacement(
+    normals: np.ndarray, channels: Iterable[Tuple[str, np.ndarray]]
+) -> np.ndarray:
+    """Sum per-vertex channel values into an (N, 3) displacement array."""
+    normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+    out = np.zeros_like(normals)
+    for channel, values in channels:
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (len(out),))
+        if channel == "VTX_NORMAL":
+            out += normals * values[:, None]
+        elif channel in ("VTX_X", "VTX_Y", "VTX_Z"):
+            out[:, "XYZ".index(channel[-1])] += values
+    return out
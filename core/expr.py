@@ -0,0 +1,179 @@
+"""A small expression language for custom signal waveforms.
+
+Expressions are plain arithmetic over the variables t (cycles since the
+start, including phase), frame, cycle (frame within the current loop) and
+seed, plus the functions in FUNCTIONS.  ``^`` means power.  Each unique
+source string is parsed, checked against a node whitelist and compiled
+into an ordinary Python function once; every function is NumPy based so
+the same callable evaluates a scalar frame or a whole frame array.
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+VARIABLES = ("t", "frame", "cycle", "seed")
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that do not parse or use forbidden syntax."""
+
+
+def _fract(x):
+    return x - np.floor(x)
+
+
+def _hash(n, seed):
+    return _fract(np.sin(n * 12.9898 + seed * 78.233) * 43758.5453) * 2.0 - 1.0
+
+
+def _noise(x, seed=0.0):
+    """Smooth value noise in [-1, 1] with a new random value per unit of x."""
+    i = np.floor(x)
+    f = x - i
+    f = f * f * (3.0 - 2.0 * f)
+    a, b = _hash(i, seed), _hash(i + 1.0, seed)
+    return a + (b - a) * f
+
+
+FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "floor": np.floor,
+    "fract": _fract,
+    "min": np.minimum,
+    "max": np.maximum,
+    "clamp": lambda x, lo=0.0, hi=1.0: np.clip(x, lo, hi),
+    "mix": lambda a, b, f: a + (b - a) * f,
+    "step": lambda edge, x: np.where(x >= edge, 1.0, 0.0),
+    "sine": lambda t: np.sin(2 * np.pi * t),
+    "square": lambda t: np.where(np.sin(2 * np.pi * t) >= 0, 1.0, -1.0),
+    "triangle": lambda t: np.where(_fract(t) < 0.5, 4 * _fract(t) - 1, 3 - 4 * _fract(t)),
+    "saw": lambda t: 2 * _fract(t) - 1,
+    "noise": _noise,
+}
+
+CONSTANTS = {"pi": np.pi, "tau": 2 * np.pi}
+
+_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.BitXor)
+_UNARYOPS = (ast.UAdd, ast.USub)
+
+
+class _Checker(ast.NodeTransformer):
+    """Reject anything but arithmetic, known names and calls; rewrite ^ to **."""
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.Load)):
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BINOPS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        node.left, node.right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, ast.BitXor):
+            node.op = ast.Pow()
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARYOPS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+        # floats overflow instead of building huge integers, e.g. 9^9^9^9
+        node.value = float(node.value)
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in VARIABLES and node.id not in CONSTANTS:
+            raise ExpressionError(f"Unknown name: {node.id}")
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("Only built-in functions can be called")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+def parse(source: str) -> ast.Expression:
+    """Return the checked syntax tree of source."""
+    if len(source) > 500:
+        raise ExpressionError("Expression too long")
+    try:
+        tree = ast.parse(source.strip() or "0", mode="eval")
+    except SyntaxError as exc:
+        raise ExpressionError(f"Syntax error: {exc.msg}") from None
+    return _Checker().visit(tree)
+
+
+@lru_cache(maxsize=256)
+def _compiled(source: str) -> Tuple[Optional[Callable], str]:
+    try:
+        tree = parse(source)
+    except ExpressionError as exc:
+        return None, str(exc)
+    args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in VARIABLES],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    lam = ast.fix_missing_locations(ast.Expression(ast.Lambda(args=args, body=tree.body)))
+    namespace = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+    return eval(compile(lam, "<signal expression>", "eval"), namespace), ""
+
+
+def compile_expr(source: str) -> Callable:
+    """Return the cached evaluator for source, raising ExpressionError if invalid."""
+    fn, error = _compiled(source)
+    if fn is None:
+        raise ExpressionError(error)
+    return fn
+
+
+def error(source: str) -> str:
+    """Return why source does not compile, or an empty string."""
+    return _compiled(source)[1]
+
+
+def evaluate(source: str, t, frame, cycle, seed: int = 0):
+    """Evaluate source for scalar or array inputs.
+
+    Invalid expressions and complex or non-finite results evaluate to 0 so
+    a typo cannot stop playback.
+    """
+    array = isinstance(t, np.ndarray)
+    fn, _ = _compiled(source)
+    if fn is None:
+        return np.zeros_like(t) if array else 0.0
+    with np.errstate(all="ignore"):
+        try:
+            out = fn(t, frame, cycle, float(seed))
+            if np.iscomplexobj(out):
+                raise TypeError("complex result")
+            out = np.asarray(out, dtype=np.float64)
+            if array:
+                out = np.broadcast_to(out, np.shape(t)).copy()
+            else:
+                out = float(out.reshape(-1)[0]) if out.size else 0.0
+        except (ArithmeticError, TypeError, ValueError):
+            out = np.zeros(np.shape(t)) if array else 0.0
+    if array:
+        return np.nan_to_num(out, nan=0.0, posinf=0.0, neginf=0.0)
+    return out if math.isfinite(out) else 0.0
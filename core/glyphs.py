@@ -0,0 +1,165 @@
+"""Array helpers for splitting text meshes into glyphs."""
+
+import hashlib
+from itertools import product
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+def connected_components(count: int, edges) -> np.ndarray:
+    """Return a component id per vertex, numbered by lowest vertex index."""
+    labels = np.arange(count, dtype=np.int64)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if count == 0 or len(edges) == 0:
+        return labels
+    a, b = edges[:, 0], edges[:, 1]
+    while True:
+        la, lb = labels[a], labels[b]
+        lo = np.minimum(la, lb)
+        new = labels.copy()
+        # hook every root onto the smallest root it touches
+        np.minimum.at(new, la, lo)
+        np.minimum.at(new, lb, lo)
+        while True:
+            jumped = new[new]
+            if np.array_equal(jumped, new):
+                break
+            new = jumped
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    return np.unique(labels, return_inverse=True)[1].reshape(-1)
+
+
+def split_indices(keys: np.ndarray, count: int) -> List[np.ndarray]:
+    """Return, for each key in range(count), the sorted indices holding it."""
+    keys = np.asarray(keys, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    bounds = np.searchsorted(keys[order], np.arange(1, count))
+    return np.split(order, bounds)
+
+
+def loop_ranges(starts: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """Return the concatenated loop indices of polygons given by starts/totals."""
+    starts = np.asarray(starts, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    if len(totals) == 0:
+        return np.empty(0, dtype=np.int64)
+    first = np.cumsum(totals) - totals
+    return np.arange(totals.sum()) - np.repeat(first - starts, totals)
+
+
+def component_bounds(co: np.ndarray, labels: np.ndarray, count: int):
+    """Return per-component (min, max) corners of co grouped by labels."""
+    lo = np.full((count, 3), np.inf)
+    hi = np.full((count, 3), -np.inf)
+    np.minimum.at(lo, labels, co)
+    np.maximum.at(hi, labels, co)
+    return lo, hi
+
+
+def bounds_centers(co: np.ndarray, labels: np.ndarray, count: int) -> np.ndarray:
+    """Return the bounding box center of each component."""
+    lo, hi = component_bounds(co, labels, count)
+    return (lo + hi) / 2
+
+
+def component_centers(co: np.ndarray, labels: np.ndarray, count: int) -> np.ndarray:
+    """Return the mean position of each component."""
+    sizes = np.bincount(labels, minlength=count).astype(np.float64)
+    sizes[sizes == 0] = 1.0
+    return np.stack(
+        [np.bincount(labels, weights=co[:, i], minlength=count) for i in range(3)],
+        axis=1,
+    ) / sizes[:, None]
+
+
+def transform_points(co: np.ndarray, matrix: Sequence[Sequence[float]]) -> np.ndarray:
+    """Apply a 4x4 matrix to an (N, 3) array of points."""
+    m = np.asarray(matrix, dtype=np.float64)
+    return co @ m[:3, :3].T + m[:3, 3]
+
+
+def mesh_fingerprint(
+    co, edges, loop_verts, loop_total, mat_index, smooth=(), uvs=None, decimals: int = 5
+):
+    """Return a hashable key identifying an origin-normalized glyph mesh.
+
+    smooth holds the per-face shading flags and uvs maps UV layer names
+    to per-loop coordinates; both take part in the key.
+    """
+    h = hashlib.sha1()
+    h.update(np.round(np.asarray(co, dtype=np.float64), decimals).astype(np.float32).tobytes())
+    for arr in (edges, loop_verts, loop_total, mat_index, smooth):
+        h.update(np.asarray(arr, dtype=np.int32).tobytes())
+        h.update(b"|")
+    for name, uv in sorted((uvs or {}).items()):
+        h.update(name.encode("utf-8") + b"|")
+        h.update(np.round(np.asarray(uv, dtype=np.float64), decimals).astype(np.float32).tobytes())
+    return len(co), h.hexdigest()
+
+
+def mesh_nbytes(verts: int, edges: int, loops: int, polys: int) -> int:
+    """Rough in-memory size of a mesh with the given element counts."""
+    return verts * 12 + edges * 8 + loops * 8 + polys * 12
+
+
+class UnionFind:
+    """Disjoint sets whose representative is always the smallest member."""
+
+    def __init__(self, count: int):
+        self.parent = list(range(count))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra < rb:
+            self.parent[rb] = ra
+        elif rb < ra:
+            self.parent[ra] = rb
+
+    def groups(self) -> List[List[int]]:
+        """Return sorted groups ordered by their smallest member."""
+        out: Dict[int, List[int]] = {}
+        for i in range(len(self.parent)):
+            out.setdefault(self.find(i), []).append(i)
+        return list(out.values())
+
+
+def group_pairs(count: int, pairs: Iterable[Tuple[int, int]]) -> List[List[int]]:
+    """Return the transitive groups formed by linking every pair."""
+    uf = UnionFind(count)
+    for a, b in pairs:
+        uf.union(a, b)
+    return uf.groups()
+
+
+def range_pairs(centers, radius: float) -> List[Tuple[int, int]]:
+    """Return index pairs (i < j) of centers closer than radius.
+
+    Pure Python spatial hashing used when mathutils.kdtree is unavailable.
+    """
+    pts = [tuple(float(v) for v in c) for c in centers]
+    if radius <= 0:
+        return []
+    cells: Dict[Tuple[int, int, int], List[int]] = {}
+    keys = []
+    for i, p in enumerate(pts):
+        key = tuple(int(v // radius) for v in p)
+        keys.append(key)
+        cells.setdefault(key, []).append(i)
+    r2 = radius * radius
+    pairs = []
+    for i, (p, key) in enumerate(zip(pts, keys)):
+        for d in product((-1, 0, 1), repeat=3):
+            for j in cells.get((key[0] + d[0], key[1] + d[1], key[2] + d[2]), ()):
+                if j > i and sum((a - b) ** 2 for a, b in zip(p, pts[j])) <= r2:
+                    pairs.append((i, j))
+    return pairs
@@ -0,0 +1,27 @@
+"""Named signal layers with mute and solo, resolved into active item sets."""
+
+from typing import Iterable, List, Sequence, Tuple
+
+
+class LayerFilter:
+    """Decide which layers play from (name, mute, solo) rows.
+
+    While any layer is soloed only soloed layers play, including over their
+    own mute, and items outside every layer are silenced.  Otherwise every
+    layer but the muted ones plays.
+    """
+
+    def __init__(self, layers: Iterable[Tuple[str, bool, bool]] = ()):
+        layers = list(layers)
+        self.muted = {name for name, mute, _solo in layers if mute}
+        self.soloed = {name for name, _mute, solo in layers if solo}
+
+    def plays(self, layer: str) -> bool:
+        if self.soloed:
+            return layer in self.soloed
+        return layer not in self.muted
+
+
+def active_indices(items: Sequence[Tuple[bool, bool, str]], flt: LayerFilter) -> List[int]:
+    """Return the indices of (enabled, native, layer) items the handler evaluates."""
+    return [i for i, (enabled, native, layer) in enumerate(items) if enabled and not native and flt.plays(layer)]
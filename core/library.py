@@ -0,0 +1,79 @@
+"""Index of node groups available in asset .blend files."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class AssetIndex:
+    """Remember which groups each asset file holds, keyed by file mtime.
+
+    Entries go stale as soon as the file on disk changes, so callers only
+    need to open a .blend again after it was modified. With a path the
+    index is loaded from that JSON file on first use and saved on store.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self._loaded = path is None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text())
+            for key, entry in data.items():
+                self._entries[key] = (float(entry["mtime"]), [str(g) for g in entry["groups"]])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            self._entries.clear()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        data = {key: {"mtime": mtime, "groups": groups} for key, (mtime, groups) in self._entries.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _mtime(path) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def lookup(self, path) -> Optional[List[str]]:
+        """Return the indexed groups of path, or None if missing or stale."""
+        self._load()
+        entry = self._entries.get(str(path))
+        if entry is None or entry[0] != self._mtime(path):
+            return None
+        return entry[1]
+
+    def store(self, path, groups) -> None:
+        self._load()
+        mtime = self._mtime(path)
+        if mtime is not None:
+            self._entries[str(path)] = (mtime, list(groups))
+            self._save()
+
+    def find(self, group: str) -> Optional[Path]:
+        """Return a fresh indexed file providing group."""
+        self._load()
+        for path in sorted(self._entries):
+            groups = self.lookup(path)
+            if groups is not None and group in groups:
+                return Path(path)
+        return None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loaded = True
+        self._save()
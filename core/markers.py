@@ -0,0 +1,17 @@
+"""Timeline marker selection for marker triggered signals."""
+
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Tuple
+
+
+def split_patterns(pattern: str) -> List[str]:
+    """Return the comma separated glob patterns of pattern, "*" if empty."""
+    return [p.strip() for p in pattern.split(",") if p.strip()] or ["*"]
+
+
+def matching_frames(markers: Iterable[Tuple[str, int]], pattern: str) -> List[float]:
+    """Return the sorted, distinct frames of (name, frame) markers matching pattern."""
+    patterns = split_patterns(pattern)
+    return sorted(
+        {float(frame) for name, frame in markers if any(fnmatchcase(name, p) for p in patterns)}
+    )
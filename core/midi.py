@@ -0,0 +1,206 @@
+"""Standard MIDI file parsing into per-lane trigger timelines."""
+
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+
+# (tick, kind, channel, data1, data2); kind is NOTE_ON, NOTE_OFF, CC or TEMPO
+Event = Tuple[int, str, int, int, int]
+
+
+@dataclass
+class MidiFile:
+    division: int
+    events: List[Event] = field(default_factory=list)
+
+
+def _varlen(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        value = (value << 7) | (b & 0x7F)
+        if not b & 0x80:
+            return value, pos
+
+
+def _parse_track(data: bytes, pos: int, end: int, events: List[Event]) -> None:
+    tick = 0
+    status = None
+    while pos < end:
+        delta, pos = _varlen(data, pos)
+        tick += delta
+        b = data[pos]
+        if b == 0xFF:
+            kind = data[pos + 1]
+            length, pos = _varlen(data, pos + 2)
+            if kind == 0x51:
+                events.append((tick, "TEMPO", 0, int.from_bytes(data[pos:pos + length], "big"), 0))
+            pos += length
+            status = None
+            continue
+        if b in (0xF0, 0xF7):
+            length, pos = _varlen(data, pos + 1)
+            pos += length
+            status = None
+            continue
+        if b & 0x80:
+            status = b
+            pos += 1
+        elif status is None:
+            raise ValueError("Running status without a status byte")
+        kind, channel = status & 0xF0, status & 0x0F
+        if kind in (0xC0, 0xD0):
+            pos += 1
+            continue
+        a, v = data[pos], data[pos + 1]
+        pos += 2
+        if kind == 0x90 and v > 0:
+            events.append((tick, "NOTE_ON", channel, a, v))
+        elif kind in (0x80, 0x90):
+            events.append((tick, "NOTE_OFF", channel, a, 0))
+        elif kind == 0xB0:
+            events.append((tick, "CC", channel, a, v))
+
+
+def parse_midi(data: bytes) -> MidiFile:
+    """Parse the bytes of a type 0 or 1 standard MIDI file."""
+    if data[:4] != b"MThd" or len(data) < 14:
+        raise ValueError("Not a standard MIDI file")
+    length = int.from_bytes(data[4:8], "big")
+    _fmt, tracks, division = struct.unpack(">HHH", data[8:14])
+    midi = MidiFile(division)
+    pos = 8 + length
+    try:
+        for _ in range(tracks):
+            if data[pos:pos + 4] != b"MTrk":
+                raise ValueError("Missing track chunk")
+            end = pos + 8 + int.from_bytes(data[pos + 4:pos + 8], "big")
+            _parse_track(data, pos + 8, min(end, len(data)), midi.events)
+            pos = end
+    except IndexError:
+        raise ValueError("Truncated MIDI file") from None
+    # stable sort keeps note-offs before note-ons given earlier on a tick
+    midi.events.sort(key=lambda e: e[0])
+    return midi
+
+
+def ticks_to_seconds(midi: MidiFile, ticks) -> np.ndarray:
+    """Convert tick positions to seconds following the file's tempo events."""
+    ticks = np.asarray(ticks, dtype=np.float64)
+    if midi.division & 0x8000:
+        fps = 256 - (midi.division >> 8)
+        return ticks / (fps * (midi.division & 0xFF))
+    tpb = midi.division or 480
+    tempo_ticks = [0.0]
+    tempos = [500000.0]
+    for tick, kind, _ch, value, _ in midi.events:
+        if kind == "TEMPO":
+            if tick == tempo_ticks[-1]:
+                tempos[-1] = float(value)
+            else:
+                tempo_ticks.append(float(tick))
+                tempos.append(float(value))
+    tempo_ticks = np.asarray(tempo_ticks)
+    rates = np.asarray(tempos) / 1e6 / tpb
+    starts = np.concatenate([[0.0], np.cumsum(np.diff(tempo_ticks) * rates[:-1])])
+    i = np.clip(np.searchsorted(tempo_ticks, ticks, side="right") - 1, 0, None)
+    return starts[i] + (ticks - tempo_ticks[i]) * rates[i]
+
+
+@dataclass
+class Lane:
+    """Sorted trigger frames with the release frame and velocity of each."""
+
+    on: np.ndarray
+    off: np.ndarray
+    velocity: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.on)
+
+    def last(self, frame: float) -> int:
+        """Index of the last trigger at or before frame, -1 if none."""
+        return int(np.searchsorted(self.on, frame, side="right")) - 1
+
+    def as_tuple(self):
+        return self.on, self.off, self.velocity
+
+
+def note_name(note: int) -> str:
+    return f"{NOTE_NAMES[note % 12]}{note // 12 - 1}"
+
+
+def _lane(on, off, vel) -> Lane:
+    order = np.argsort(on, kind="stable")
+    return Lane(
+        np.asarray(on, dtype=np.float64)[order],
+        np.asarray(off, dtype=np.float64)[order],
+        np.asarray(vel, dtype=np.float64)[order],
+    )
+
+
+def build_lanes(midi: MidiFile, fps: float, cc_threshold: int = 64) -> Dict[str, Lane]:
+    """Return trigger lanes keyed "NOTE ch:note", "NOTE ch:ALL" and "CC ch:num".
+
+    Notes trigger on note-on and release on the matching note-off; CC lanes
+    trigger when the controller rises to cc_threshold and release when it
+    falls below it.  Channels are numbered from 1.
+    """
+    frames = ticks_to_seconds(midi, [e[0] for e in midi.events]) * fps
+    notes: Dict[Tuple[int, int], List[List[float]]] = {}
+    pending: Dict[Tuple[int, int], List[List[float]]] = {}
+    gates: Dict[Tuple[int, int], List[List[float]]] = {}
+    for frame, (_tick, kind, ch, a, v) in zip(frames.tolist(), midi.events):
+        if kind == "NOTE_ON":
+            hit = [frame, np.inf, v / 127.0]
+            notes.setdefault((ch, a), []).append(hit)
+            pending.setdefault((ch, a), []).append(hit)
+        elif kind == "NOTE_OFF":
+            waiting = pending.get((ch, a))
+            if waiting:
+                waiting.pop(0)[1] = frame
+        elif kind == "CC":
+            lane = gates.setdefault((ch, a), [])
+            is_open = bool(lane) and lane[-1][1] == np.inf
+            if v >= cc_threshold and not is_open:
+                lane.append([frame, np.inf, v / 127.0])
+            elif v < cc_threshold and is_open:
+                lane[-1][1] = frame
+    lanes: Dict[str, Lane] = {}
+    by_channel: Dict[int, List[List[float]]] = {}
+    for (ch, note), hits in sorted(notes.items()):
+        on, off, vel = zip(*hits)
+        lanes[f"NOTE {ch + 1}:{note}"] = _lane(on, off, vel)
+        by_channel.setdefault(ch, []).extend(hits)
+    for ch, hits in sorted(by_channel.items()):
+        on, off, vel = zip(*hits)
+        lanes[f"NOTE {ch + 1}:ALL"] = _lane(on, off, vel)
+    for (ch, num), hits in sorted(gates.items()):
+        if hits:
+            on, off, vel = zip(*hits)
+            lanes[f"CC {ch + 1}:{num}"] = _lane(on, off, vel)
+    return lanes
+
+
+def lane_label(key: str) -> str:
+    """Return a readable name for a lane key."""
+    kind, _, rest = key.partition(" ")
+    ch, _, num = rest.partition(":")
+    if kind == "NOTE":
+        return f"Ch {ch} {'All notes' if num == 'ALL' else note_name(int(num))}"
+    return f"Ch {ch} CC {num}"
+
+
+def lane_number(key: str) -> int:
+    """Return a stable enum number of at least 2 for a lane key.
+
+    The number depends on the key alone, so it survives reloading or
+    re-exporting the MIDI file with lanes in another order.
+    """
+    return 2 + zlib.crc32(key.encode("utf-8")) % 0x7FFFFFF0
@@ -0,0 +1,187 @@
+"""Vectorized crossfades between two signal stacks."""
+
+from dataclasses import dataclass, fields
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from . import signals
+
+MORPH_PARAMS = ("amplitude", "frequency", "phase_offset", "base_value")
+
+# signal types evaluate_rows handles without falling back to calc_signal
+VECTOR_TYPES = ("SINE", "COSINE", "SQUARE", "TRIANGLE", "SAWTOOTH", "RAMP")
+
+# columns that must match for two rows to be interpolated instead of faded
+_SHAPE_COLUMNS = ("signal_type", "duration", "start", "loop_count", "use_clamp", "clamp_min", "clamp_max")
+
+
+def vectorizable(params: signals.SignalParams) -> bool:
+    """Return True if evaluate_rows reproduces calc_signal for params."""
+    return (
+        params.signal_type in VECTOR_TYPES
+        and not params.smoothing
+        and not params.blend_frames
+        and params.triggers is None
+    )
+
+
+@dataclass
+class ParamTable:
+    """SignalParams of many rows stored column-wise."""
+
+    signal_type: np.ndarray
+    amplitude: np.ndarray
+    frequency: np.ndarray
+    phase_offset: np.ndarray
+    base_value: np.ndarray
+    duration: np.ndarray
+    start: np.ndarray
+    loop_count: np.ndarray
+    use_clamp: np.ndarray
+    clamp_min: np.ndarray
+    clamp_max: np.ndarray
+
+    @classmethod
+    def from_params(cls, rows: Sequence[signals.SignalParams]) -> "ParamTable":
+        def col(fn, dtype=np.float64):
+            return np.array([fn(p) for p in rows], dtype=dtype)
+
+        return cls(
+            signal_type=np.array([p.signal_type for p in rows], dtype=object),
+            amplitude=col(lambda p: p.amplitude),
+            frequency=col(lambda p: p.frequency),
+            phase_offset=col(lambda p: p.phase_offset),
+            base_value=col(lambda p: p.base_value),
+            duration=col(lambda p: max(1, int(p.duration))),
+            start=col(lambda p: p.start_frame + p.offset),
+            loop_count=col(lambda p: p.loop_count),
+            use_clamp=col(lambda p: p.use_clamp, bool),
+            clamp_min=col(lambda p: p.clamp_min),
+            clamp_max=col(lambda p: p.clamp_max),
+        )
+
+    def __len__(self) -> int:
+        return len(self.amplitude)
+
+    def take(self, mask) -> "ParamTable":
+        return ParamTable(**{f.name: getattr(self, f.name)[mask] for f in fields(self)})
+
+    def lerp(self, other: "ParamTable", w: float, mask) -> "ParamTable":
+        """Return rows in mask with MORPH_PARAMS blended w of the way to other."""
+        out = self.take(mask)
+        for name in MORPH_PARAMS:
+            a = getattr(out, name)
+            setattr(out, name, a + (getattr(other, name)[mask] - a) * w)
+        return out
+
+
+def evaluate_rows(table: ParamTable, times, loop_lock: bool = False) -> np.ndarray:
+    """Evaluate every row of table at its own time, like calc_signal."""
+    times = np.asarray(times, dtype=np.float64)
+    kind = table.signal_type
+    dur = table.duration
+    rel = times - table.start
+    freq = np.round(table.frequency * dur) / dur if loop_lock else table.frequency
+    cycle = np.mod(rel, dur)
+    t = cycle / dur * freq + table.phase_offset / 360.0
+    s = np.sin(2 * np.pi * t)
+    p = np.mod(t, 1.0)
+    ramp = np.clip(rel / dur, 0.0, 1.0)
+    wave = np.select(
+        [kind == "SINE", kind == "COSINE", kind == "SQUARE", kind == "TRIANGLE", kind == "SAWTOOTH", kind == "RAMP"],
+        [s, np.cos(2 * np.pi * t), np.where(s >= 0, 1.0, -1.0), np.where(p < 0.5, 4 * p - 1, 3 - 4 * p),
+         2 * p - 1, ramp * ramp * (3 - 2 * ramp)],
+        0.0,
+    )
+    out = table.base_value + table.amplitude * wave
+    out = np.where(table.use_clamp, np.clip(out, table.clamp_min, table.clamp_max), out)
+    idle = (kind != "RAMP") & ((rel < 0) | ((table.loop_count > 0) & (rel >= dur * table.loop_count)))
+    return np.where(idle, table.base_value, out)
+
+
+class Morph:
+    """Transition of many channels from source to target params over length frames.
+
+    Row i drives one channel.  Rows whose source and target share a wave
+    shape have MORPH_PARAMS interpolated; the others crossfade the two
+    outputs.  A missing side (None) holds rest[i].  same_clock marks rows
+    whose sides are evaluated on the same time base and may interpolate.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Optional[signals.SignalParams]],
+        targets: Sequence[Optional[signals.SignalParams]],
+        rest: Sequence[float],
+        start: float,
+        length: float,
+        same_clock: Optional[Sequence[bool]] = None,
+    ):
+        self.start = float(start)
+        self.length = max(1.0, float(length))
+        self.rest = np.asarray(rest, dtype=np.float64)
+        self.sources = list(sources)
+        self.targets = list(targets)
+        idle = signals.SignalParams("SINE", amplitude=0.0)
+        self.has_a = np.array([p is not None for p in sources], dtype=bool)
+        self.has_b = np.array([p is not None for p in targets], dtype=bool)
+        self.a = ParamTable.from_params([p or idle for p in sources])
+        self.b = ParamTable.from_params([p or idle for p in targets])
+        fast_a = np.array([p is None or vectorizable(p) for p in sources], dtype=bool)
+        fast_b = np.array([p is None or vectorizable(p) for p in targets], dtype=bool)
+        self._slow_a = np.flatnonzero(~fast_a)
+        self._slow_b = np.flatnonzero(~fast_b)
+        same = self.has_a & self.has_b & fast_a & fast_b
+        if same_clock is not None:
+            same &= np.asarray(same_clock, dtype=bool)
+        for name in _SHAPE_COLUMNS:
+            same &= getattr(self.a, name) == getattr(self.b, name)
+        self.interpolated = same
+
+    def __len__(self) -> int:
+        return len(self.rest)
+
+    def progress(self, frame: float) -> float:
+        return min(1.0, max(0.0, (frame - self.start) / self.length))
+
+    def done(self, frame: float) -> bool:
+        return frame >= self.start + self.length
+
+    def _side(self, table, present, slow, params, times, loop_lock, side) -> np.ndarray:
+        out = evaluate_rows(table, times, loop_lock)
+        for i in slow:
+            out[i] = signals.calc_signal(
+                params[i], int(times[i]), loop_lock=loop_lock, cache_key=(id(self), side, int(i))
+            )
+        return np.where(present, out, self.rest)
+
+    def evaluate(self, frame: float, times_a=None, times_b=None, *, loop_lock: bool = False) -> np.ndarray:
+        """Return the value of every row at frame.
+
+        times_a and times_b give each row's evaluation time on either side,
+        defaulting to frame, so rows may run on different clocks.
+        """
+        n = len(self)
+        times_a = np.full(n, float(frame)) if times_a is None else np.asarray(times_a, dtype=np.float64)
+        times_b = np.full(n, float(frame)) if times_b is None else np.asarray(times_b, dtype=np.float64)
+        w = signals._ease(self.progress(frame))
+        va = self._side(self.a, self.has_a, self._slow_a, self.sources, times_a, loop_lock, 0)
+        vb = self._side(self.b, self.has_b, self._slow_b, self.targets, times_b, loop_lock, 1)
+        out = va + (vb - va) * w
+        mask = self.interpolated
+        if mask.any():
+            out[mask] = evaluate_rows(self.a.lerp(self.b, w, mask), times_a[mask], loop_lock)
+        return out
+
+
+def pair_rows(source_keys: Sequence, target_keys: Sequence) -> List[tuple]:
+    """Return (key, source index or None, target index or None) per channel.
+
+    The last entry of a key wins on each side, like the frame handler
+    writing channels in stack order.
+    """
+    a = {k: i for i, k in enumerate(source_keys)}
+    b = {k: i for i, k in enumerate(target_keys)}
+    keys = list(a) + [k for k in b if k not in a]
+    return [(k, a.get(k), b.get(k)) for k in keys]
@@ -0,0 +1,209 @@
+"""Plans for evaluating signals natively inside Blender instead of Python."""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from . import signals
+
+LUT_TYPES = {"SINE", "COSINE", "SQUARE", "TRIANGLE", "SAWTOOTH", "NOISE"}
+STEP_TYPES = {"SQUARE", "NOISE"}
+
+# Blender's frame limits, used for open-ended restricted ranges
+MIN_FRAME = -1048574.0
+MAX_FRAME = 1048574.0
+
+
+@dataclass
+class Lut:
+    """One cycle of a signal sampled into a normalized lookup table."""
+
+    values: List[float]
+    low: float
+    high: float
+    start: int
+    duration: int
+    loop_count: int
+    base_value: float
+
+    def value(self, frame: float) -> float:
+        """Evaluate the table the same way the generated node tree does."""
+        rel = frame - self.start
+        if rel < 0 or (self.loop_count and rel >= self.duration * self.loop_count):
+            return self.base_value
+        pos = (rel % self.duration) / self.duration * (len(self.values) - 1)
+        i = min(int(pos), len(self.values) - 2)
+        norm = self.values[i] + (self.values[i + 1] - self.values[i]) * (pos - i)
+        return self.low + norm * (self.high - self.low)
+
+
+def lut_supported(params: signals.SignalParams, loop_lock: bool = False) -> bool:
+    """Return True if params can be reproduced by a per-cycle lookup table."""
+    if params.signal_type not in LUT_TYPES or params.smoothing or params.triggers is not None:
+        return False
+    if params.signal_type == "NOISE" and not loop_lock:
+        # without loop lock noise never repeats
+        return False
+    return not (loop_lock and params.blend_frames)
+
+
+def bake_lut(
+    params: signals.SignalParams, samples: int = 65, *, loop_lock: bool = False
+) -> Optional[Lut]:
+    """Sample one cycle of params into a Lut, or None if unsupported."""
+    if not lut_supported(params, loop_lock):
+        return None
+    duration = max(1, int(params.duration))
+    values = signals.sample_cycle(params, min(duration + 1, samples), loop_lock=loop_lock)
+    low, high = min(values), max(values)
+    span = high - low
+    return Lut(
+        values=[(v - low) / span if span > 1e-9 else 0.0 for v in values],
+        low=low,
+        high=high,
+        start=params.start_frame + params.offset,
+        duration=duration,
+        loop_count=params.loop_count,
+        base_value=params.base_value,
+    )
+
+
+@dataclass
+class FModifier:
+    """Settings for one F-Curve modifier, optionally limited to a frame range."""
+
+    type: str
+    settings: Dict[str, float] = field(default_factory=dict)
+    frame_range: Optional[Tuple[float, float]] = None
+
+    def active(self, frame: float) -> bool:
+        if self.frame_range is None:
+            return True
+        return self.frame_range[0] <= frame <= self.frame_range[1]
+
+
+@dataclass
+class CurvePlan:
+    """Keyframes plus a modifier stack reproducing a signal on an F-Curve.
+
+    exact is False when the stack only approximates the handler, as with
+    Blender's Noise modifier standing in for the seeded noise sequence.
+    """
+
+    keys: List[Tuple[float, float]]
+    interpolation: str
+    modifiers: List[FModifier]
+    exact: bool = True
+
+    def _curve(self, frame: float) -> float:
+        keys = self.keys
+        if frame <= keys[0][0]:
+            return keys[0][1]
+        if frame >= keys[-1][0]:
+            return keys[-1][1]
+        for (x0, y0), (x1, y1) in zip(keys, keys[1:]):
+            if x0 <= frame < x1:
+                if self.interpolation == "CONSTANT":
+                    return y0
+                return y0 + (y1 - y0) * (frame - x0) / (x1 - x0)
+        return keys[-1][1]
+
+    def value(self, frame: float) -> float:
+        """Evaluate the plan the way Blender evaluates the F-Curve."""
+        t = frame
+        for mod in self.modifiers:
+            if not mod.active(frame):
+                continue
+            if mod.type == "CYCLES":
+                first, last = self.keys[0][0], self.keys[-1][0]
+                if t > last and last > first:
+                    t = first + (t - first) % (last - first)
+            elif mod.type == "STEPPED":
+                t = math.floor(t / mod.settings["frame_step"]) * mod.settings["frame_step"]
+        v = self._curve(t)
+        for mod in self.modifiers:
+            if not mod.active(frame):
+                continue
+            s = mod.settings
+            if mod.type == "FNGENERATOR":
+                fn = math.sin if s["function_type"] == "SIN" else math.cos
+                v = s["amplitude"] * fn(s["phase_multiplier"] * frame + s["phase_offset"]) + s["value_offset"]
+            elif mod.type == "GENERATOR":
+                v = s["value"]
+            elif mod.type == "LIMITS":
+                v = max(s["min_y"], min(s["max_y"], v))
+        return v
+
+
+def _hold(value: float, start: float, end: float) -> FModifier:
+    return FModifier("GENERATOR", {"value": value}, (start, end))
+
+
+def _holds(params: signals.SignalParams, start: int, duration: int) -> List[FModifier]:
+    mods = [_hold(params.base_value, MIN_FRAME, start - 0.5)]
+    if params.loop_count:
+        mods.append(_hold(params.base_value, start + duration * params.loop_count - 0.5, MAX_FRAME))
+    return mods
+
+
+def _limits(params: signals.SignalParams) -> List[FModifier]:
+    if not params.use_clamp:
+        return []
+    return [FModifier("LIMITS", {"min_y": params.clamp_min, "max_y": params.clamp_max})]
+
+
+def plan_curve(
+    params: signals.SignalParams, *, loop_lock: bool = False, approximate: bool = False
+) -> Optional[CurvePlan]:
+    """Return a CurvePlan matching calc_signal on integer frames, or None.
+
+    Sine and cosine with whole cycles become a Built-in Function modifier,
+    ramps and other periodic waves are keyed over one cycle and repeated
+    with a Cycles modifier.  Unlooped noise maps to a stepped Noise
+    modifier only when approximate is set.  Smoothing keeps state between
+    frames and triggers restart the signal at arbitrary frames, so neither
+    is compiled.
+    """
+    if params.smoothing or params.triggers is not None:
+        return None
+    start = params.start_frame + params.offset
+    duration = max(1, int(params.duration))
+    if params.signal_type == "RAMP":
+        keys = [(start + c, signals._ramp(params, c)) for c in range(duration + 1)]
+        return CurvePlan(keys, "LINEAR", [])
+    if params.signal_type not in LUT_TYPES:
+        return None
+    blends = loop_lock and params.blend_frames > 0
+    frequency = signals._frequency(params, duration, loop_lock)
+    whole = abs(frequency - round(frequency)) < 1e-9
+    if params.signal_type in ("SINE", "COSINE") and whole and not blends:
+        step = 2 * math.pi * frequency / duration
+        fn = FModifier(
+            "FNGENERATOR",
+            {
+                "function_type": "SIN" if params.signal_type == "SINE" else "COS",
+                "amplitude": params.amplitude,
+                "phase_multiplier": step,
+                "phase_offset": math.radians(params.phase_offset) - step * start,
+                "value_offset": params.base_value,
+            },
+        )
+        mods = [fn] + _limits(params) + _holds(params, start, duration)
+        return CurvePlan([(start, params.base_value)], "CONSTANT", mods)
+    if params.signal_type == "NOISE" and not loop_lock:
+        if not approximate:
+            return None
+        mods = [
+            FModifier("STEPPED", {"frame_step": 1.0}),
+            FModifier(
+                "NOISE",
+                {"strength": 2 * params.amplitude, "scale": 1.0, "phase": float(params.noise_seed)},
+            ),
+        ] + _limits(params) + _holds(params, start, duration)
+        return CurvePlan([(start, params.base_value)], "CONSTANT", mods, exact=False)
+    values = [signals.calc_signal(params, start + c, loop_lock=loop_lock) for c in range(duration)]
+    keys = [(start + c, v) for c, v in enumerate(values)]
+    keys.append((start + duration, values[0]))
+    interpolation = "CONSTANT" if params.signal_type in STEP_TYPES else "LINEAR"
+    mods = [FModifier("CYCLES")] + _holds(params, start, duration)
+    return CurvePlan(keys, interpolation, mods)
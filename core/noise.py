@@ -1,7 +1,19 @@
-import random
+_MASK = 0xFFFFFFFF
 
 
-def noise_value(seed: int) -> float:
-    """Return deterministic noise between -1 and 1 for given seed."""
-    random.seed(seed)
-    return random.uniform(-1.0, 1.0)
+def _hash32(x):
+    """Integer hash of 32-bit x; works on ints and int64 NumPy arrays alike."""
+    x = ((x >> 16) ^ x) * 0x45D9F3B & _MASK
+    x = ((x >> 16) ^ x) * 0x45D9F3B & _MASK
+    return (x >> 16) ^ x
+
+
+def noise_value(seed):
+    """Return deterministic noise between -1 and 1 for given seed.
+
+    seed may also be an int64 NumPy array, which is hashed element-wise
+    to the same values without a Python loop.
+    """
+    if isinstance(seed, float):
+        seed = int(seed)
+    return _hash32(seed & _MASK) / 2 ** 31 - 1.0
@@ -0,0 +1,283 @@
+"""Live OSC input over UDP, buffered per address for the frame handler."""
+
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+BUNDLE = b"#bundle\x00"
+MAX_BUNDLE_DEPTH = 8
+
+
+def _pad(n: int) -> int:
+    return (n + 4) & ~3
+
+
+def _string(data: bytes, pos: int) -> Tuple[str, int]:
+    end = data.index(b"\x00", pos)
+    return data[pos:end].decode("utf-8", "replace"), pos + _pad(end - pos)
+
+
+def decode_message(data: bytes) -> Tuple[str, List[object]]:
+    """Return (address, arguments) of one OSC message."""
+    try:
+        address, pos = _string(data, 0)
+        if not address.startswith("/"):
+            raise ValueError("OSC address must start with '/'")
+        if pos >= len(data):
+            return address, []
+        tags, pos = _string(data, pos)
+        args: List[object] = []
+        for tag in tags[1:]:
+            if tag == "f":
+                args.append(struct.unpack_from(">f", data, pos)[0])
+                pos += 4
+            elif tag == "i":
+                args.append(struct.unpack_from(">i", data, pos)[0])
+                pos += 4
+            elif tag == "d":
+                args.append(struct.unpack_from(">d", data, pos)[0])
+                pos += 8
+            elif tag == "h":
+                args.append(struct.unpack_from(">q", data, pos)[0])
+                pos += 8
+            elif tag == "s":
+                text, pos = _string(data, pos)
+                args.append(text)
+            elif tag == "b":
+                size = struct.unpack_from(">i", data, pos)[0]
+                args.append(data[pos + 4:pos + 4 + size])
+                pos += 4 + ((size + 3) & ~3)
+            elif tag in "TF":
+                args.append(tag == "T")
+            elif tag in "NI":
+                args.append(None)
+            else:
+                raise ValueError(f"Unsupported OSC type tag: {tag}")
+    except (struct.error, IndexError):
+        raise ValueError("Truncated OSC message") from None
+    if pos > len(data):
+        raise ValueError("Truncated OSC message")
+    return address, args
+
+
+def decode_packet(data: bytes) -> Iterator[Tuple[str, List[object]]]:
+    """Yield every message of a packet, flattening nested bundles.
+
+    Bundles are walked with an explicit stack and may nest at most
+    MAX_BUNDLE_DEPTH levels deep; deeper packets raise ValueError.
+    """
+    if not data.startswith(BUNDLE):
+        yield decode_message(data)
+        return
+    # (position of the next element, end of the bundle) per open bundle
+    stack = [(16, len(data))]  # skip bundle tag and time tag
+    while stack:
+        pos, end = stack.pop()
+        if pos >= end:
+            continue
+        if pos + 4 > end:
+            raise ValueError("Truncated OSC bundle")
+        size = struct.unpack_from(">i", data, pos)[0]
+        if size <= 0 or pos + 4 + size > end:
+            raise ValueError("Truncated OSC bundle")
+        element = data[pos + 4:pos + 4 + size]
+        stack.append((pos + 4 + size, end))
+        if element.startswith(BUNDLE):
+            if len(stack) >= MAX_BUNDLE_DEPTH:
+                raise ValueError("OSC bundles nested too deeply")
+            stack.append((pos + 4 + 16, pos + 4 + size))
+        else:
+            yield decode_message(element)
+
+
+def encode_message(address: str, *args) -> bytes:
+    """Encode address and int, float, bool or str arguments as an OSC message."""
+
+    def string(text: str) -> bytes:
+        raw = text.encode("utf-8")
+        return raw + b"\x00" * (_pad(len(raw)) - len(raw))
+
+    tags, body = ",", b""
+    for a in args:
+        if isinstance(a, bool):
+            tags += "T" if a else "F"
+        elif isinstance(a, int):
+            tags += "i"
+            body += struct.pack(">i", a)
+        elif isinstance(a, float):
+            tags += "f"
+            body += struct.pack(">f", a)
+        else:
+            tags += "s"
+            body += string(str(a))
+    return string(address) + string(tags) + body
+
+
+def encode_bundle(*messages: bytes) -> bytes:
+    """Wrap encoded messages in a bundle to be handled immediately."""
+    out = BUNDLE + struct.pack(">Q", 1)
+    for m in messages:
+        out += struct.pack(">i", len(m)) + m
+    return out
+
+
+class RingBuffer:
+    """Fixed-size history of argument rows written by a single thread.
+
+    The writer fills a row before publishing it by bumping count, so
+    readers on other threads never need a lock to see the latest value.
+    """
+
+    def __init__(self, size: int = 64, width: int = 4):
+        self.rows = np.full((max(1, size), width), np.nan)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.rows))
+
+    def push(self, values) -> None:
+        row = self.rows[self.count % len(self.rows)]
+        row[:] = np.nan
+        n = min(len(values), len(row))
+        row[:n] = values[:n]
+        self.count += 1
+
+    def latest(self, index: int = 0, default: float = 0.0) -> float:
+        count = self.count
+        if not count or not 0 <= index < self.rows.shape[1]:
+            return default
+        value = self.rows[(count - 1) % len(self.rows), index]
+        return default if np.isnan(value) else float(value)
+
+    def history(self, index: int = 0) -> np.ndarray:
+        """Return the buffered values of one argument, oldest first."""
+        count = self.count
+        size = len(self.rows)
+        if count <= size:
+            return self.rows[:count, index].copy()
+        return np.roll(self.rows[:, index], -(count % size))
+
+
+def _numbers(args) -> Optional[List[float]]:
+    out = [float(a) for a in args if isinstance(a, (int, float))]
+    return out or None
+
+
+class OscListener:
+    """Receive OSC over UDP on a background thread into RingBuffers.
+
+    Only numeric arguments are kept.  Messages are dropped when they do
+    not decode, carry no numbers or would exceed max_addresses.
+    """
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 9000,
+        size: int = 64,
+        width: int = 4,
+        max_addresses: int = 256,
+    ):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.width = width
+        self.max_addresses = max_addresses
+        self.buffers: Dict[str, RingBuffer] = {}
+        self.packets = 0
+        self.messages = 0
+        self.dropped = 0
+        self.busy = 0.0
+        self.error = ""
+        self._started = 0.0
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Bind the socket and start receiving, raising OSError on failure."""
+        if self.running:
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(0.1)
+        self.port = sock.getsockname()[1]
+        self._sock = sock
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+        self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _run(self) -> None:
+        sock = self._sock
+        while not self._stop.is_set():
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                self.error = str(e)
+                return
+            t0 = time.perf_counter()
+            try:
+                self.feed(data)
+            except Exception as e:  # one bad packet must not end the listener
+                self.error = str(e)
+                self.dropped += 1
+            self.busy += time.perf_counter() - t0
+
+    def feed(self, data: bytes) -> None:
+        """Decode one packet into the buffers; called by the listener thread."""
+        self.packets += 1
+        try:
+            messages = list(decode_packet(data))
+        except ValueError:
+            self.dropped += 1
+            return
+        for address, args in messages:
+            values = _numbers(args)
+            buf = self.buffers.get(address)
+            if values is None or (buf is None and len(self.buffers) >= self.max_addresses):
+                self.dropped += 1
+                continue
+            if buf is None:
+                buf = self.buffers[address] = RingBuffer(self.size, self.width)
+            buf.push(values)
+            self.messages += 1
+
+    def latest(self, address: str, index: int = 0, default: float = 0.0) -> float:
+        buf = self.buffers.get(address)
+        return buf.latest(index, default) if buf is not None else default
+
+    def stats(self) -> Dict[str, float]:
+        """Return counters plus the share of wall time spent decoding."""
+        uptime = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "packets": self.packets,
+            "messages": self.messages,
+            "dropped": self.dropped,
+            "addresses": len(self.buffers),
+            "load": self.busy / uptime if uptime > 0 else 0.0,
+            "us_per_packet": 1e6 * self.busy / self.packets if self.packets else 0.0,
+        }
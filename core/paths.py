@@ -0,0 +1,49 @@
+"""Parsing helpers for generic RNA data path channels."""
+
+import re
+from typing import NamedTuple, Optional
+
+_TAIL = re.compile(r'^(?P<owner>.*?)(?:\.(?P<attr>[A-Za-z_]\w*)|\[(?P<key>"(?:[^"\\]|\\.)*"|\'[^\']*\'|-?\d+)\])$')
+
+
+class PathTarget(NamedTuple):
+    """A data path split into the owner path and the last step.
+
+    Exactly one of attr or key is set.  index is the array element written
+    when the path ends in an integer subscript of a property.
+    """
+
+    owner: str
+    attr: Optional[str]
+    key: Optional[str]
+    index: Optional[int]
+
+
+def _step(path: str):
+    m = _TAIL.match(path)
+    if m is None:
+        if re.fullmatch(r"[A-Za-z_]\w*", path):
+            return "", path, None
+        raise ValueError(f"Invalid data path: {path!r}")
+    return m.group("owner"), m.group("attr"), m.group("key")
+
+
+def split_data_path(path: str) -> PathTarget:
+    """Split path into the owner to resolve once and the value to write.
+
+    "data.energy" -> owner "data", attr "energy"; "color[1]" -> attr
+    "color", index 1; 'modifiers["GN"]["Socket_2"]' -> owner
+    'modifiers["GN"]', key "Socket_2".
+    """
+    path = path.strip()
+    if not path:
+        raise ValueError("Empty data path")
+    owner, attr, key = _step(path)
+    if key is not None and key.lstrip("-").isdigit():
+        inner, inner_attr, inner_key = _step(owner)
+        if inner_attr is None:
+            raise ValueError(f"Index without property: {path!r}")
+        return PathTarget(inner, inner_attr, None, int(key))
+    if key is not None:
+        return PathTarget(owner, None, key[1:-1], None)
+    return PathTarget(owner, attr, None, None)
@@ -0,0 +1,150 @@
+"""Cached sparkline geometry for the 3D view signal preview."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from . import signals
+
+
+@dataclass
+class Sparkline:
+    """Downsampled one-cycle waveform of a signal in pixel offsets."""
+
+    params: signals.SignalParams
+    loop_lock: bool
+    label: str
+    summary: str
+    points: List[Tuple[float, float]]
+    width: float
+
+    def cursor(self, frame: int) -> Tuple[float, float]:
+        """Return the pixel offset of frame along the sparkline."""
+        duration = max(1, int(self.params.duration))
+        rel = frame - (self.params.start_frame + self.params.offset)
+        pos = (rel % duration) / duration if rel > 0 else 0.0
+        seg = pos * (len(self.points) - 1)
+        i = min(int(seg), len(self.points) - 2)
+        (_, y0), (_, y1) = self.points[i], self.points[i + 1]
+        return pos * self.width, y0 + (y1 - y0) * (seg - i)
+
+
+def summarize(params: signals.SignalParams, label: str = "") -> str:
+    """Return the overlay text for a signal."""
+    text = f"{params.signal_type} {params.frequency:.2f}Hz A{params.amplitude:.2f}"
+    return f"{label}: {text}" if label else text
+
+
+@dataclass
+class Overlay:
+    """Sparklines of one object's stack laid out in rows below the object.
+
+    Coordinates are pixel offsets from the object, so the overlay is built
+    once and only translated when the view or the object moves; batch holds
+    the caller's GPU batch of coords.
+    """
+
+    lines: List[Sparkline]
+    beats: List[bool]
+    loop_lock: bool
+    row_height: float
+    coords: List[Tuple[float, float]]
+    labels: List[Tuple[float, float, str]]
+    batch: Any = None
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def cursors(self, frame: float, tick: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Return LINES segments of every row's cursor; beat rows run at tick."""
+        out = []
+        for i, (line, beats) in enumerate(zip(self.lines, self.beats)):
+            cx, cy = line.cursor(tick if beats and tick is not None else frame)
+            y = cy - i * self.row_height
+            out.append((cx, y - 4))
+            out.append((cx, y + 4))
+        return out
+
+
+def layout(
+    lines: Sequence[Sparkline], row_height: float, beats: Optional[Sequence[bool]] = None, loop_lock: bool = False
+) -> Overlay:
+    """Stack lines in rows of row_height pixels, first row at the object."""
+    coords: List[Tuple[float, float]] = []
+    labels: List[Tuple[float, float, str]] = []
+    for i, line in enumerate(lines):
+        y0 = -i * row_height
+        pts = line.points
+        for (ax, ay), (bx, by) in zip(pts, pts[1:]):
+            coords.append((ax, y0 + ay))
+            coords.append((bx, y0 + by))
+        labels.append((line.width + 6, y0, line.summary))
+    return Overlay(
+        lines=list(lines),
+        beats=list(beats) if beats is not None else [False] * len(lines),
+        loop_lock=loop_lock,
+        row_height=row_height,
+        coords=coords,
+        labels=labels,
+    )
+
+
+class PreviewCache:
+    """Sparklines keyed by caller-defined keys, rebuilt when params change."""
+
+    def __init__(self, samples: int = 32, width: float = 96.0, height: float = 24.0):
+        self.samples = max(2, samples)
+        self.width = width
+        self.height = height
+        self._entries: Dict[Hashable, Sparkline] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: Hashable,
+        params: signals.SignalParams,
+        label: str = "",
+        loop_lock: bool = False,
+    ) -> Sparkline:
+        """Return the sparkline for key, recomputing it only when stale."""
+        line = self._entries.get(key)
+        if (
+            line is None
+            or line.params != params
+            or line.loop_lock != loop_lock
+            or line.label != label
+        ):
+            line = self._build(params, label, loop_lock)
+            self._entries[key] = line
+        return line
+
+    def _build(self, params, label, loop_lock) -> Sparkline:
+        values = signals.sample_cycle(params, self.samples, loop_lock=loop_lock)
+        lo, hi = min(values), max(values)
+        span = hi - lo
+        step = self.width / (self.samples - 1)
+        points = [
+            (i * step, (v - lo) / span * self.height if span > 1e-9 else self.height / 2)
+            for i, v in enumerate(values)
+        ]
+        return Sparkline(
+            params=params,
+            loop_lock=loop_lock,
+            label=label,
+            summary=summarize(params, label),
+            points=points,
+            width=self.width,
+        )
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def prune(self, keys: Iterable[Hashable]) -> None:
+        """Drop every entry whose key is not in keys."""
+        keep = set(keys)
+        for key in [k for k in self._entries if k not in keep]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
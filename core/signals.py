@@ -1,11 +1,15 @@
 """Pure signal computation utilities for VjLooper."""
 
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 import math
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
 from . import noise
 
+# progress curves of the ADSR segments
+ADSR_SHAPES = ("LINEAR", "EASE_IN", "EASE_OUT", "EASE_IN_OUT")
+
 
 @dataclass
 class SignalParams:
@@ -24,12 +28,29 @@ class SignalParams:
     clamp_min: float = -1.0
     clamp_max: float = 1.0
     blend_frames: int = 0
+    expression: str = ""
+    # identifies the envelope below, which is too large to compare directly
+    audio_key: str = ""
+    envelope: Optional[Sequence[float]] = field(default=None, compare=False, repr=False)
+    # attack, decay (frames), sustain level and release (frames)
+    adsr: Tuple[float, float, float, float] = (2.0, 6.0, 0.6, 12.0)
+    adsr_shape: str = "LINEAR"
+    # identifies the sorted (on, off, velocity) trigger frames below; off
+    # and velocity may be None for a gate of duration frames at full velocity
+    trigger_key: str = ""
+    triggers: Optional[Tuple[Sequence[float], Sequence[float], Sequence[float]]] = field(
+        default=None, compare=False, repr=False
+    )
+    # latest external controller value of LIVE signals, changing every frame
+    live_value: float = field(default=0.0, compare=False)
 
 
 smoothing_cache = {}
 
 
-def _wave(signal_type: str, t: float, seed: int, frame: int) -> float:
+def _wave(
+    signal_type: str, t: float, seed: int, frame: int, expression: str = "", cycle: float = 0.0
+) -> float:
     if signal_type == "SINE":
         return math.sin(2 * math.pi * t)
     if signal_type == "COSINE":
@@ -43,9 +64,103 @@ def _wave(signal_type: str, t: float, seed: int, frame: int) -> float:
         return 2 * (t % 1.0) - 1
     if signal_type == "NOISE":
         return noise.noise_value(seed + frame)
+    if signal_type == "RAMP":
+        return _ease(t)
+    if signal_type == "EXPR":
+        # expressions need NumPy, which the built-in waves do not
+        from . import expr
+
+        return expr.evaluate(expression, t, frame, cycle, seed)
     return 0.0
 
 
+def _ease(p: float) -> float:
+    p = min(1.0, max(0.0, p))
+    return p * p * (3 - 2 * p)
+
+
+def _ramp(params: SignalParams, rel: int) -> float:
+    """One-shot eased transition from base_value to base_value + amplitude."""
+    duration = max(1, int(params.duration))
+    out = params.base_value + params.amplitude * _ease(rel / duration)
+    if params.use_clamp:
+        out = max(params.clamp_min, min(params.clamp_max, out))
+    return out
+
+
+def _audio(params: SignalParams, rel: int) -> float:
+    """Envelope level rel frames after the start, silent outside the file."""
+    env = params.envelope
+    level = float(env[int(rel)]) if env is not None and 0 <= rel < len(env) else 0.0
+    out = params.base_value + params.amplitude * level
+    if params.use_clamp:
+        out = max(params.clamp_min, min(params.clamp_max, out))
+    return out
+
+
+def shape_progress(p, shape: str = "LINEAR"):
+    """Map segment progress p in [0, 1] through an ADSR shape (scalar or array)."""
+    if shape == "EASE_IN":
+        return p * p
+    if shape == "EASE_OUT":
+        return 1.0 - (1.0 - p) * (1.0 - p)
+    if shape == "EASE_IN_OUT":
+        return p * p * (3.0 - 2.0 * p)
+    return p
+
+
+def adsr_level(
+    t: float,
+    gate: float,
+    attack: float,
+    decay: float,
+    sustain: float,
+    release: float,
+    shape: str = "LINEAR",
+) -> float:
+    """Level of an ADSR envelope t frames after a note-on held for gate frames."""
+    if t < 0:
+        return 0.0
+    held = min(t, gate)
+    if held < attack:
+        level = shape_progress(held / attack, shape)
+    elif held < attack + decay:
+        level = 1.0 - (1.0 - sustain) * shape_progress((held - attack) / decay, shape)
+    else:
+        level = sustain
+    if t <= gate:
+        return level
+    if release <= 0:
+        return 0.0
+    return level * (1.0 - shape_progress(min(1.0, (t - gate) / release), shape))
+
+
+def _adsr(params: SignalParams, rel: float, gate: float, velocity: float = 1.0) -> float:
+    level = adsr_level(rel, gate, *params.adsr, params.adsr_shape)
+    out = params.base_value + params.amplitude * velocity * level
+    if params.use_clamp:
+        out = max(params.clamp_min, min(params.clamp_max, out))
+    return out
+
+
+def last_trigger(params: SignalParams, frame: float) -> int:
+    """Index of the last trigger of params at or before frame, -1 if none."""
+    return bisect_right(params.triggers[0], frame - params.offset) - 1
+
+
+def _live(params: SignalParams) -> float:
+    out = params.base_value + params.amplitude * params.live_value
+    if params.use_clamp:
+        out = max(params.clamp_min, min(params.clamp_max, out))
+    return out
+
+
+def _frequency(params: SignalParams, duration: int, loop_lock: bool) -> float:
+    if loop_lock:
+        return round(params.frequency * duration) / duration
+    return params.frequency
+
+
 def calc_signal(
     params: SignalParams,
     frame: int,
@@ -53,18 +168,36 @@ def calc_signal(
     loop_lock: bool = False,
     cache_key: Optional[object] = None,
 ) -> float:
-    """Calculate signal value for given frame using pure parameters."""
+    """Calculate signal value for given frame using pure parameters.
+
+    With triggers set the signal restarts at every trigger instead of at
+    start_frame and rests at base_value before the first one.
+    """
+    if params.signal_type == "LIVE":
+        return _live(params)
     sf = params.start_frame + params.offset
+    if params.triggers is not None:
+        hit = last_trigger(params, frame)
+        if hit < 0:
+            return params.base_value
+        on, off, velocity = params.triggers
+        sf = on[hit] + params.offset
+        if params.signal_type == "ADSR":
+            gate = off[hit] - on[hit] if off is not None else max(1, int(params.duration))
+            return _adsr(params, frame - sf, gate, velocity[hit] if velocity is not None else 1.0)
+    if params.signal_type == "ADSR":
+        return _adsr(params, frame - sf, max(1, int(params.duration)))
+    if params.signal_type == "RAMP":
+        return _ramp(params, frame - sf)
+    if params.signal_type == "AUDIO":
+        return _audio(params, frame - sf)
     if frame < sf:
         return params.base_value
 
     rel = frame - sf
     duration = max(1, int(params.duration))
     amplitude = params.amplitude
-    frequency = params.frequency
-
-    if loop_lock:
-        frequency = round(frequency * duration) / duration
+    frequency = _frequency(params, duration, loop_lock)
 
     if params.loop_count and rel >= duration * params.loop_count:
         return params.base_value
@@ -72,16 +205,15 @@ def calc_signal(
     cycle = rel % duration
     t = (cycle / duration) * frequency + params.phase_offset / 360.0
     seed_frame = cycle if loop_lock else frame
-    wave = _wave(params.signal_type, t, params.noise_seed, seed_frame)
-
-    key = id(params) if cache_key is None else cache_key
-    last = smoothing_cache.get(key, wave)
-    val = (
-        last * params.smoothing + wave * (1 - params.smoothing)
-        if params.smoothing
-        else wave
-    )
-    smoothing_cache[key] = val
+    wave = _wave(params.signal_type, t, params.noise_seed, seed_frame, params.expression, cycle)
+
+    val = wave
+    if params.smoothing:
+        # unsmoothed calls leave the cache alone, so sampling has no side effects
+        key = id(params) if cache_key is None else cache_key
+        last = smoothing_cache.get(key, wave)
+        val = last * params.smoothing + wave * (1 - params.smoothing)
+        smoothing_cache[key] = val
 
     if (
         loop_lock
@@ -90,7 +222,7 @@ def calc_signal(
     ):
         factor = (cycle - (duration - params.blend_frames)) / params.blend_frames
         t0 = params.phase_offset / 360.0
-        start_w = _wave(params.signal_type, t0, params.noise_seed, seed_frame)
+        start_w = _wave(params.signal_type, t0, params.noise_seed, seed_frame, params.expression, 0)
         val = val * (1 - factor) + start_w * factor
 
     out = params.base_value + amplitude * val
@@ -99,3 +231,35 @@ def calc_signal(
         out = max(params.clamp_min, min(params.clamp_max, out))
 
     return out
+
+
+def sample_cycle(
+    params: SignalParams, samples: int = 32, *, loop_lock: bool = False
+) -> List[float]:
+    """Return samples values spanning one cycle, ignoring smoothing state.
+
+    Audio signals have no cycle and sample their whole envelope instead;
+    ADSR signals sample one note held for duration frames and LIVE
+    signals hold their current value.
+    """
+    if params.signal_type == "LIVE":
+        return [_live(params)] * samples
+    if params.signal_type == "AUDIO":
+        length = len(params.envelope) if params.envelope is not None else 1
+        step = (length - 1) / (samples - 1) if samples > 1 else 0.0
+        return [_audio(params, int(i * step)) for i in range(samples)]
+    duration = max(1, int(params.duration))
+    if params.signal_type == "ADSR":
+        length = duration + params.adsr[3]
+        return [_adsr(params, length * i / max(1, samples - 1), duration) for i in range(samples)]
+    frequency = _frequency(params, duration, loop_lock)
+    out = []
+    for i in range(samples):
+        cycle = duration * i / (samples - 1) if samples > 1 else 0.0
+        t = (cycle / duration) * frequency + params.phase_offset / 360.0
+        wave = _wave(params.signal_type, t, params.noise_seed, int(cycle), params.expression, cycle)
+        v = params.base_value + params.amplitude * wave
+        if params.use_clamp:
+            v = max(params.clamp_min, min(params.clamp_max, v))
+        out.append(v)
+    return out
@@ -0,0 +1,99 @@
+"""Signal stacks shared by many objects with cheap per-object overrides."""
+
+from dataclasses import replace
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import morph, signals
+
+
+class SharedStack:
+    """One stack of signals evaluated for every object linked to it.
+
+    Objects override only a time offset, a phase offset and an amplitude
+    scale.  Objects sharing the same offset and phase share one
+    evaluation, and the amplitude scale is applied around each row's base
+    value afterwards, so a stack costs one numpy pass per frame however
+    many objects use it.  LIVE rows read the value given to set_live.
+    """
+
+    def __init__(self, keys: Sequence[Hashable], params: Sequence[signals.SignalParams], beats=None):
+        self.keys = list(keys)
+        self.params = list(params)
+        self.beats = np.zeros(len(self.params), dtype=bool) if beats is None else np.asarray(beats, dtype=bool)
+        self.table = morph.ParamTable.from_params(self.params)
+        self._slow = [i for i, p in enumerate(self.params) if not morph.vectorizable(p)]
+        self.live_rows = [i for i, p in enumerate(self.params) if p.signal_type == "LIVE"]
+        self._phased: Dict[Tuple[int, float], signals.SignalParams] = {}
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def set_live(self, row: int, value: float) -> None:
+        """Set the input value LIVE row evaluates to until the next call."""
+        params = self.params[row]
+        if params.live_value == value:
+            return
+        self.params[row] = replace(params, live_value=value)
+        for key in [k for k in self._phased if k[0] == row]:
+            del self._phased[key]
+
+    def _with_phase(self, row: int, phase: float) -> signals.SignalParams:
+        params = self._phased.get((row, phase))
+        if params is None:
+            base = self.params[row]
+            params = replace(base, phase_offset=base.phase_offset + phase)
+            self._phased[(row, phase)] = params
+        return params
+
+    def evaluate(
+        self,
+        frame: float,
+        offsets,
+        phases,
+        amp_scales,
+        *,
+        loop_lock: bool = False,
+        clock: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """Return an (objects, rows) array of values at frame.
+
+        Each object runs offsets[i] frames late with phases[i] degrees added
+        to every row.  clock maps frames to ticks for beat based rows.
+        """
+        offsets = np.asarray(offsets, dtype=np.float64).reshape(-1)
+        phases = np.asarray(phases, dtype=np.float64).reshape(-1)
+        amp_scales = np.asarray(amp_scales, dtype=np.float64).reshape(-1)
+        rows = len(self)
+        if not rows or not len(offsets):
+            return np.zeros((len(offsets), rows))
+        combos, inverse = np.unique(np.stack([offsets, phases], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        count = len(combos)
+        local = frame - combos[:, 0]
+        times = np.repeat(local[:, None], rows, axis=1)
+        if clock is not None and self.beats.any():
+            times[:, self.beats] = np.asarray(clock(local))[:, None]
+        tiled = self.table.take(np.tile(np.arange(rows), count))
+        tiled.phase_offset = tiled.phase_offset + np.repeat(combos[:, 1], rows)
+        values = morph.evaluate_rows(tiled, times.reshape(-1), loop_lock).reshape(count, rows)
+        for c, (_offset, phase) in enumerate(combos.tolist()):
+            for i in self._slow:
+                values[c, i] = signals.calc_signal(
+                    self._with_phase(i, phase),
+                    int(times[c, i]),
+                    loop_lock=loop_lock,
+                    cache_key=(id(self), i, c),
+                )
+        base = self.table.base_value
+        return base + (values[inverse] - base) * amp_scales[:, None]
+
+
+def group_links(links: Sequence[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Group (object, stack) links into stack -> objects, skipping empty names."""
+    out: Dict[str, List[str]] = {}
+    for obj_name, stack_name in links:
+        if stack_name:
+            out.setdefault(stack_name, []).append(obj_name)
+    return out
@@ -0,0 +1,98 @@
+"""Tempo maps converting between frames and musical beats."""
+
+from bisect import bisect_right
+from statistics import median
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# resolution of beat based signals, in evaluation steps per beat
+TICKS_PER_BEAT = 96
+
+
+class TempoMap:
+    """Piecewise constant tempo starting at frame 0.
+
+    base_bpm applies from frame 0 (and is extrapolated before it) until the
+    first change.  Cumulative beat counts at every change are computed once
+    so conversions in either direction are a binary search.
+    """
+
+    def __init__(
+        self,
+        changes: Iterable[Tuple[float, float]] = (),
+        fps: float = 24.0,
+        base_bpm: float = 120.0,
+        beats_per_bar: int = 4,
+    ):
+        self.fps = float(fps)
+        self.beats_per_bar = max(1, int(beats_per_bar))
+        self.frames: List[float] = [0.0]
+        self.bpms: List[float] = [float(base_bpm) if base_bpm > 0 else 120.0]
+        for frame, bpm in sorted((float(f), float(b)) for f, b in changes if b > 0):
+            if frame <= self.frames[-1]:
+                self.bpms[-1] = bpm
+            else:
+                self.frames.append(frame)
+                self.bpms.append(bpm)
+        self.beats: List[float] = [0.0]
+        for i in range(1, len(self.frames)):
+            span = self.frames[i] - self.frames[i - 1]
+            self.beats.append(self.beats[-1] + span * self._beats_per_frame(i - 1))
+        self._frames_arr = np.asarray(self.frames)
+        self._beats_arr = np.asarray(self.beats)
+        self._rate_arr = np.asarray([self._beats_per_frame(i) for i in range(len(self.bpms))])
+
+    def _beats_per_frame(self, i: int) -> float:
+        return self.bpms[i] / (60.0 * self.fps)
+
+    def bpm_at(self, frame: float) -> float:
+        return self.bpms[max(0, bisect_right(self.frames, frame) - 1)]
+
+    def beat_at(self, frame: float) -> float:
+        """Return the beat position of frame."""
+        i = max(0, bisect_right(self.frames, frame) - 1)
+        return self.beats[i] + (frame - self.frames[i]) * self._beats_per_frame(i)
+
+    def beat_at_array(self, frames) -> np.ndarray:
+        """Vectorized beat_at for an array of frames."""
+        frames = np.asarray(frames, dtype=np.float64)
+        i = np.clip(np.searchsorted(self._frames_arr, frames, side="right") - 1, 0, None)
+        return self._beats_arr[i] + (frames - self._frames_arr[i]) * self._rate_arr[i]
+
+    def frame_at(self, beat: float) -> float:
+        """Return the frame at which beat is reached."""
+        i = max(0, bisect_right(self.beats, beat) - 1)
+        return self.frames[i] + (beat - self.beats[i]) / self._beats_per_frame(i)
+
+    def frames_per_beat(self, frame: float) -> float:
+        return 60.0 * self.fps / self.bpm_at(frame)
+
+    def span_frames(self, start_frame: float, beats: float) -> float:
+        """Return how many frames beats last when starting at start_frame."""
+        return self.frame_at(self.beat_at(start_frame) + beats) - start_frame
+
+    def snap_beats(self, beats: float) -> float:
+        """Round a beat length to a whole number of bars, at least one."""
+        bpb = self.beats_per_bar
+        return max(1, round(beats / bpb)) * bpb
+
+    def snap_frame_to_bar(self, frame: float) -> float:
+        bpb = self.beats_per_bar
+        return self.frame_at(round(self.beat_at(frame) / bpb) * bpb)
+
+
+def tap_tempo(times: Sequence[float], timeout: float = 2.0) -> float:
+    """Return the BPM of tap timestamps in seconds, or 0 for too few taps.
+
+    Only the taps after the last pause longer than timeout count.
+    """
+    taps: List[float] = []
+    for t in times:
+        if taps and t - taps[-1] > timeout:
+            taps = []
+        taps.append(t)
+    if len(taps) < 2:
+        return 0.0
+    interval = median(b - a for a, b in zip(taps, taps[1:]))
+    return 60.0 / interval if interval > 0 else 0.0
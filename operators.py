@@ -5,6 +5,8 @@ import importlib
 import json
 import random
 import sys
+import time
+import numpy as np
 from mathutils import Vector
 from bpy.props import (
     BoolProperty,
@@ -17,7 +19,68 @@ from bpy.props import (
 from bpy.types import Operator
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
-from . import signals
+from . import signals, tunnelfx
+from .core import colors as core_colors
+from .core import instances as core_instances
+from .core import native as core_native
+from .core import tempo as core_tempo
+
+
+COLOR_TARGETS = [
+    ('VIEWPORT', "Viewport", "Material viewport display color"),
+    ('BASE', "Base Color", "Principled BSDF base color input"),
+    ('EMISSION', "Emission", "Principled BSDF emission color input"),
+]
+
+
+def _principled_node(mat):
+    """Return the first Principled BSDF node of mat or None."""
+    if not mat.use_nodes or not mat.node_tree:
+        return None
+    for node in mat.node_tree.nodes:
+        if node.type == 'BSDF_PRINCIPLED':
+            return node
+    return None
+
+
+def _target_materials(ctx, mat, selection=True):
+    """Return mat plus materials of selected objects in a stable order."""
+    targets = [mat]
+    if selection:
+        for obj in ctx.selected_objects:
+            for slot in obj.material_slots:
+                if slot.material:
+                    targets.append(slot.material)
+    return list(dict.fromkeys(targets))
+
+
+def _read_material_colors(mats):
+    """Return an (N, 4) array with the viewport color of each material."""
+    cols = np.empty((len(mats), 4), dtype=np.float64)
+    for i, m in enumerate(mats):
+        cols[i] = m.diffuse_color[:]
+    return cols
+
+
+def _write_material_colors(mats, rgb, alpha, targets):
+    """Write rgb rows back to mats on the requested color targets."""
+    node_targets = targets - {'VIEWPORT'}
+    for m, col, a in zip(mats, rgb.tolist(), alpha.tolist()):
+        if 'VIEWPORT' in targets:
+            m.diffuse_color = (*col, a)
+        node = _principled_node(m) if node_targets else None
+        if node is None:
+            continue
+        names = []
+        if 'BASE' in node_targets:
+            names.append("Base Color")
+        if 'EMISSION' in node_targets:
+            # renamed from "Emission" in Blender 4.0
+            names.append("Emission Color" if "Emission Color" in node.inputs else "Emission")
+        for name in names:
+            sock = node.inputs.get(name)
+            if sock is not None:
+                sock.default_value = (*col, sock.default_value[3])
 
 
 class VJLOOPER_OT_hot_reload(Operator):
@@ -71,10 +134,12 @@ class VJLOOPER_OT_add_signal(Operator):
         it.clamp_max = sc.signal_new_clamp_max
         it.noise_seed = sc.signal_new_noise
         it.smoothing = sc.signal_new_smoothing
-        it.base_value = signals.get_channel_value(o, it.channel)
+        it.data_path = sc.signal_new_data_path
+        it.base_value = signals.get_channel_value(o, it.channel, it.data_path)
         it.start_frame = sc.frame_current
         marker = ctx.scene.timeline_markers.new(it.name, frame=it.start_frame)
         it.marker_name = marker.name
+        signals.invalidate_layers()
         return {'FINISHED'}
 
 
@@ -96,6 +161,76 @@ class VJLOOPER_OT_remove_signal(Operator):
             if mk:
                 ctx.scene.timeline_markers.remove(mk)
         o.signal_items.remove(self.index)
+        signals.invalidate_mod_graph()
+        signals.invalidate_layers()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_lfo(Operator):
+    """Add a scene level LFO that animations can be modulated by."""
+    bl_idname = "vjlooper.add_lfo"
+    bl_label = "Add Global LFO"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        lfo = ctx.scene.vj_lfos.add()
+        lfo.name = f"LFO{len(ctx.scene.vj_lfos):02d}"
+        signals.invalidate_mod_graph()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_lfo(Operator):
+    """Remove a global LFO."""
+    bl_idname = "vjlooper.remove_lfo"
+    bl_label = "Remove Global LFO"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        lfos = ctx.scene.vj_lfos
+        if 0 <= self.index < len(lfos):
+            lfos.remove(self.index)
+            signals.invalidate_mod_graph()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_mod_route(Operator):
+    """Modulate a parameter of this animation by another signal."""
+    bl_idname = "vjlooper.add_mod_route"
+    bl_label = "Add Modulation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        o = ctx.object
+        if not o or not (0 <= self.index < len(o.signal_items)):
+            return {'CANCELLED'}
+        route = o.signal_items[self.index].mod_routes.add()
+        if ctx.scene.vj_lfos:
+            route.source_name = ctx.scene.vj_lfos[0].name
+        signals.invalidate_mod_graph()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_mod_route(Operator):
+    """Remove a modulation route."""
+    bl_idname = "vjlooper.remove_mod_route"
+    bl_label = "Remove Modulation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+    route: IntProperty()
+
+    def execute(self, ctx):
+        o = ctx.object
+        if not o or not (0 <= self.index < len(o.signal_items)):
+            return {'CANCELLED'}
+        routes = o.signal_items[self.index].mod_routes
+        if 0 <= self.route < len(routes):
+            routes.remove(self.route)
+            signals.invalidate_mod_graph()
         return {'FINISHED'}
 
 
@@ -138,7 +273,10 @@ class VJLOOPER_OT_add_preset(Operator):
         for it in ctx.object.signal_items:
             data.append({
                 p.identifier: getattr(it, p.identifier)
-                for p in it.bl_rna.properties if not p.is_readonly
+                for p in it.bl_rna.properties
+                if not p.is_readonly
+                and p.type not in {'COLLECTION', 'POINTER'}
+                and p.identifier not in signals.PICKER_PROPS
             })
         pr = sc.signal_presets.add()
         pr.name = self.name
@@ -176,6 +314,33 @@ class VJLOOPER_OT_load_preset(Operator):
         return {'FINISHED'}
 
 
+class VJLOOPER_OT_morph_preset(Operator):
+    """Morph the selected objects from their animations to the active preset."""
+    bl_idname = "vjlooper.morph_preset"
+    bl_label = "Morph to Preset"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    frames: IntProperty(default=48, min=1, description="Length of the transition in frames")
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        idx = sc.signal_preset_index
+        if idx >= len(sc.signal_presets):
+            return {'CANCELLED'}
+        pr = sc.signal_presets[idx]
+        if not signals.validate_preset(pr.data):
+            self.report({'ERROR'}, "Invalid preset")
+            return {'CANCELLED'}
+        objs = [o for o in (ctx.selected_objects or [ctx.object]) if o and hasattr(o, "signal_items")]
+        if not objs:
+            return {'CANCELLED'}
+        morph = signals.start_morph(
+            sc, objs, json.loads(pr.data), self.frames, sc.frame_current, sc.preset_mirror
+        )
+        self.report({'INFO'}, f"Morphing {len(morph)} channels on {len(objs)} objects")
+        return {'FINISHED'}
+
+
 class VJLOOPER_OT_apply_preset_multi(Operator):
     """Apply the active preset to all selected objects."""
     bl_idname = "vjlooper.apply_preset_multi"
@@ -253,12 +418,9 @@ class VJLOOPER_OT_apply_preset_offset(Operator):
                     off,
                 )
         else:  # BPM
-            bpm = sc.offset_bpm
-            if bpm <= 0:
-                bpm = 120
-            frames_per_beat = ctx.scene.render.fps * 60 / bpm
+            tm = signals.tempo_map(sc)
             for i, obj in enumerate(selected):
-                off = int(i * frames_per_beat)
+                off = int(tm.span_frames(sc.frame_current, i))
                 signals.apply_preset_to_object(
                     obj,
                     arr,
@@ -269,6 +431,102 @@ class VJLOOPER_OT_apply_preset_offset(Operator):
         return {'FINISHED'}
 
 
+def build_instancer_group(source):
+    """Return a node group instancing source on points driven by vj_* attributes."""
+    ng = bpy.data.node_groups.new(f"VJ_Instancer_{source.name}", 'GeometryNodeTree')
+    signals.new_socket(ng, "Geometry", 'INPUT')
+    signals.new_socket(ng, "Geometry", 'OUTPUT')
+    nodes, links = ng.nodes, ng.links
+
+    def attribute(name):
+        node = nodes.new("GeometryNodeInputNamedAttribute")
+        node.data_type = 'FLOAT_VECTOR'
+        node.inputs["Name"].default_value = name
+        return node.outputs["Attribute"]
+
+    gin = nodes.new("NodeGroupInput")
+    gout = nodes.new("NodeGroupOutput")
+    points = nodes.new("GeometryNodeMeshToPoints")
+    links.new(gin.outputs[0], points.inputs["Mesh"])
+    move = nodes.new("GeometryNodeSetPosition")
+    links.new(points.outputs["Points"], move.inputs["Geometry"])
+    links.new(attribute("vj_location"), move.inputs["Position"])
+    info = nodes.new("GeometryNodeObjectInfo")
+    info.inputs["Object"].default_value = source
+    inst = nodes.new("GeometryNodeInstanceOnPoints")
+    links.new(move.outputs["Geometry"], inst.inputs["Points"])
+    links.new(info.outputs["Geometry"], inst.inputs["Instance"])
+    links.new(attribute("vj_rotation"), inst.inputs["Rotation"])
+    links.new(attribute("vj_scale"), inst.inputs["Scale"])
+    links.new(inst.outputs["Instances"], gout.inputs[0])
+    return ng
+
+
+class VJLOOPER_OT_make_instancer(Operator):
+    """Animate many copies of the active object from a single point cloud."""
+    bl_idname = "vjlooper.make_instancer"
+    bl_label = "Make Instancer"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    count: IntProperty(default=100, min=1, description="Number of instances")
+    columns: IntProperty(default=10, min=1, description="Instances per grid row")
+    spacing: FloatProperty(default=2.0, description="Grid spacing")
+    from_selection: BoolProperty(
+        default=False,
+        description="Place instances at the selected objects instead of a grid",
+    )
+    mode: EnumProperty(
+        items=[
+            ('LINEAR', 'Linear', ''),
+            ('RADIAL', 'Radial', ''),
+            ('BPM', 'Beat', ''),
+        ],
+        default='LINEAR'
+    )
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        source = ctx.object
+        if source is None:
+            return {'CANCELLED'}
+        if self.from_selection:
+            others = [o for o in ctx.selected_objects if o != source]
+            if not others:
+                self.report({'WARNING'}, "Select the objects to replace")
+                return {'CANCELLED'}
+            rest = np.array([o.matrix_world.translation[:] for o in others])
+        else:
+            rest = core_instances.grid_positions(self.count, self.columns, self.spacing)
+        offsets = core_instances.instance_offsets(
+            self.mode,
+            rest,
+            origin=source.matrix_world.translation[:],
+            step=sc.multi_offset_frames,
+            radial_factor=sc.offset_radial_factor,
+            frames_per_beat=signals.tempo_map(sc).frames_per_beat(sc.frame_current),
+        )
+        me = bpy.data.meshes.new(f"{source.name}_Points")
+        me.vertices.add(len(rest))
+        me.vertices.foreach_set("co", rest.astype(np.float32).ravel())
+        attr = me.attributes.new("vj_offset", 'FLOAT', 'POINT')
+        attr.data.foreach_set("value", offsets.astype(np.float32))
+        obj = bpy.data.objects.new(f"{source.name}_Instancer", me)
+        ctx.collection.objects.link(obj)
+        obj["vj_instancer"] = True
+        mod = obj.modifiers.new("VJ Instancer", 'NODES')
+        mod.node_group = build_instancer_group(source)
+        idx = sc.signal_preset_index
+        if idx < len(sc.signal_presets) and signals.validate_preset(sc.signal_presets[idx].data):
+            arr = json.loads(sc.signal_presets[idx].data)
+            signals.apply_preset_to_object(obj, arr, sc.frame_current, sc.preset_mirror)
+        signals.update_instancer(obj, sc.frame_current, getattr(sc, "loop_lock", False))
+        for o in ctx.selected_objects:
+            o.select_set(False)
+        obj.select_set(True)
+        ctx.view_layer.objects.active = obj
+        return {'FINISHED'}
+
+
 class VJLOOPER_OT_remove_preset(Operator):
     """Delete the selected preset from the list."""
     bl_idname = "vjlooper.remove_preset"
@@ -324,6 +582,24 @@ class VJLOOPER_OT_import_presets(Operator, ImportHelper):
         return {'FINISHED'}
 
 
+class VJLOOPER_OT_import_midi(Operator, ImportHelper):
+    """Load a MIDI file whose notes and controllers trigger signals."""
+    bl_idname = "vjlooper.import_midi"
+    bl_label = "Import MIDI"
+    filename_ext = ".mid"
+    filter_glob: StringProperty(default="*.mid;*.midi", options={'HIDDEN'})
+
+    def execute(self, ctx):
+        ctx.scene.vj_midi_file = self.filepath
+        signals.update_midi(None, ctx)
+        lanes = signals.midi_lanes(ctx.scene)
+        if signals.midi_state["error"]:
+            self.report({'ERROR'}, signals.midi_state["error"])
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"{len(lanes)} trigger lanes")
+        return {'FINISHED'}
+
+
 class VJLOOPER_OT_rename_category(Operator):
     """Rename a preset category across all presets."""
     bl_idname = "vjlooper.rename_category"
@@ -382,6 +658,533 @@ class VJLOOPER_OT_bake_animation(Operator):
         return {'FINISHED'}
 
 
+NATIVE_GROUP = signals.NATIVE_GROUP
+
+
+def _native_path(obj, channel):
+    """Return the (data_path, index) an F-Curve needs to drive channel."""
+    if channel == "GN_SCROLL":
+        mod = tunnelfx.tunnel_modifier(obj)
+        ident = tunnelfx.scroll_input_id(mod) if mod else None
+        return (f'modifiers["{mod.name}"]["{ident}"]', 0) if ident else None
+    return signals.CHANNEL_PATHS.get(channel)
+
+
+def _winning_items(obj):
+    """Return {channel: item} for the item the frame handler writes last."""
+    flt = signals.layer_state["filter"]
+    last = {}
+    for it in obj.signal_items:
+        if it.enabled and flt.plays(it.layer):
+            last[it.channel] = it
+    if "SCL_ALL" in last and {"SCL_X", "SCL_Y", "SCL_Z"} & last.keys():
+        # the handler result depends on item order across these channels
+        for ch in ("SCL_ALL", "SCL_X", "SCL_Y", "SCL_Z"):
+            last.pop(ch, None)
+    return last
+
+
+# signal types whose values only exist while the frame handler runs
+HANDLER_TYPES = {"AUDIO", "LIVE", "EXPR"}
+
+
+def _mod_sources(scene):
+    """Return the (object name, item name) keys modulation routes read."""
+    return {r.source for r in signals.mod_graph(scene).routes}
+
+
+def _handler_only(obj, it, mod_sources):
+    """Return True if it must stay on the frame handler to keep its behaviour."""
+    if it.signal_type in HANDLER_TYPES or getattr(it, "trigger_source", "NONE") != "NONE":
+        return True
+    # modulation is evaluated by the frame handler, for targets and sources
+    return bool(it.mod_routes) or (obj.name, it.name) in mod_sources
+
+
+def _apply_curve_plan(fc, plan):
+    """Replace keyframes and modifiers of fc with plan."""
+    while fc.modifiers:
+        fc.modifiers.remove(fc.modifiers[0])
+    points = fc.keyframe_points
+    points.clear()
+    points.add(len(plan.keys))
+    points.foreach_set("co", [c for key in plan.keys for c in key])
+    for kp in points:
+        kp.interpolation = plan.interpolation
+    fc.extrapolation = 'CONSTANT'
+    for spec in plan.modifiers:
+        mod = fc.modifiers.new(spec.type)
+        s = spec.settings
+        if spec.type == "GENERATOR":
+            mod.mode = 'POLYNOMIAL'
+            mod.poly_order = 1
+            mod.coefficients = (s["value"], 0.0)
+        elif spec.type == "FNGENERATOR":
+            for key, v in s.items():
+                setattr(mod, key, v)
+        elif spec.type == "CYCLES":
+            mod.mode_before = 'NONE'
+            mod.mode_after = 'REPEAT'
+        elif spec.type == "STEPPED":
+            mod.frame_step = s["frame_step"]
+        elif spec.type == "NOISE":
+            mod.blend_type = 'REPLACE'
+            for key, v in s.items():
+                setattr(mod, key, v)
+        elif spec.type == "LIMITS":
+            mod.use_min_y = mod.use_max_y = True
+            mod.min_y, mod.max_y = s["min_y"], s["max_y"]
+        if spec.frame_range is not None:
+            mod.use_restricted_range = True
+            mod.frame_start, mod.frame_end = spec.frame_range
+    fc.update()
+
+
+def _copy_driver(obj, index):
+    """Drive scale[index] of obj from scale[0]."""
+    fc = obj.driver_add("scale", index)
+    drv = fc.driver
+    drv.type = 'AVERAGE'
+    while drv.variables:
+        drv.variables.remove(drv.variables[0])
+    var = drv.variables.new()
+    var.name = "vj_scale"
+    var.targets[0].id = obj
+    var.targets[0].data_path = "scale[0]"
+    return fc
+
+
+def remove_native(obj):
+    """Remove F-Curves and drivers created by compile_native from obj."""
+    ad = obj.animation_data
+    if ad is not None and ad.action is not None:
+        for fc in [fc for fc in ad.action.fcurves if fc.group and fc.group.name == NATIVE_GROUP]:
+            ad.action.fcurves.remove(fc)
+    if ad is not None:
+        for fc in list(ad.drivers):
+            variables = fc.driver.variables
+            if fc.data_path == "scale" and len(variables) == 1 and variables[0].name == "vj_scale":
+                ad.drivers.remove(fc)
+    keep = tunnelfx.scroll_compiled(obj)
+    for it in obj.signal_items:
+        it.native = keep and it.channel == "GN_SCROLL"
+
+
+def compile_native(obj, loop_lock=False, approximate=False, mod_sources=frozenset()):
+    """Move obj's signal items onto native F-Curves where possible.
+
+    Returns (compiled, approximated, skipped) lists of item names.  Items
+    that stay on the frame handler keep native unset, among them items
+    with modulation routes and the items in mod_sources that routes read.
+    """
+    remove_native(obj)
+    compiled, approximated, skipped = [], [], []
+    native = set()
+    winners = _winning_items(obj)
+    ad = obj.animation_data or obj.animation_data_create()
+    action = ad.action
+    for i, it in enumerate(obj.signal_items):
+        if not it.enabled:
+            continue
+        if it.native:
+            # already evaluated inside the TunnelFX node group
+            compiled.append(it.name)
+            continue
+        if _handler_only(obj, it, mod_sources):
+            skipped.append(it.name)
+            continue
+        if winners.get(it.channel) is not it:
+            # shadowed by a later item on the same channel, or on a mixed scale stack
+            skipped.append(it.name)
+            continue
+        if it.time_unit != 'FRAMES':
+            # tempo changes bend beat based cycles
+            skipped.append(it.name)
+            continue
+        target = _native_path(obj, it.channel)
+        plan = core_native.plan_curve(
+            signals.item_params(it, obj), loop_lock=loop_lock, approximate=approximate
+        )
+        if target is None or plan is None:
+            skipped.append(it.name)
+            continue
+        path, index = target
+        if action is None:
+            action = ad.action = bpy.data.actions.new(f"{obj.name}Action")
+        fc = action.fcurves.find(path, index=index)
+        if fc is not None:
+            # keyframed by the user, leave it to the handler
+            skipped.append(it.name)
+            continue
+        fc = action.fcurves.new(path, index=index, action_group=NATIVE_GROUP)
+        _apply_curve_plan(fc, plan)
+        if it.channel == "SCL_ALL":
+            _copy_driver(obj, 1)
+            _copy_driver(obj, 2)
+        (compiled if plan.exact else approximated).append(it.name)
+        native.add(i)
+    for i in native:
+        obj.signal_items[i].native = True
+    return compiled, approximated, skipped
+
+
+class VJLOOPER_OT_compile_native(Operator):
+    """Evaluate signal animations with F-Curve modifiers instead of the frame handler."""
+    bl_idname = "vjlooper.compile_native"
+    bl_label = "Compile to Native"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    approximate: BoolProperty(
+        default=False,
+        description="Use Blender's Noise modifier for unlooped noise, which does not match the handler exactly",
+    )
+
+    def execute(self, ctx):
+        loop_lock = getattr(ctx.scene, "loop_lock", False)
+        # refresh the layer filter _winning_items reads
+        signals.active_items(ctx.scene)
+        sources = _mod_sources(ctx.scene)
+        compiled, approximated, skipped = [], [], []
+        for obj in ctx.selected_objects:
+            if not getattr(obj, "signal_items", None) or obj.get("vj_instancer"):
+                continue
+            done, approx, rest = compile_native(obj, loop_lock, self.approximate, sources)
+            compiled += [f"{obj.name}/{n}" for n in done]
+            approximated += [f"{obj.name}/{n}" for n in approx]
+            skipped += [f"{obj.name}/{n}" for n in rest]
+        msg = f"Native: {len(compiled) + len(approximated)} compiled"
+        if approximated:
+            msg += f" ({len(approximated)} approximated: {', '.join(approximated)})"
+        if skipped:
+            msg += f", {len(skipped)} skipped (frame handler): {', '.join(skipped)}"
+        self.report({'WARNING'} if skipped else {'INFO'}, msg)
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_decompile_native(Operator):
+    """Return compiled signal animations to the frame handler."""
+    bl_idname = "vjlooper.decompile_native"
+    bl_label = "Use Frame Handler"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        for obj in ctx.selected_objects:
+            if getattr(obj, "signal_items", None):
+                remove_native(obj)
+                tunnelfx.restore_scroll(obj)
+        return {'FINISHED'}
+
+
+tap_times = []
+
+
+class VJLOOPER_OT_tap_tempo(Operator):
+    """Tap repeatedly to set the tempo at the current frame."""
+    bl_idname = "vjlooper.tap_tempo"
+    bl_label = "Tap Tempo"
+
+    def execute(self, ctx):
+        tap_times.append(time.monotonic())
+        del tap_times[:-16]
+        bpm = core_tempo.tap_tempo(tap_times)
+        if not bpm:
+            self.report({'INFO'}, "Keep tapping")
+            return {'FINISHED'}
+        sc = ctx.scene
+        bpm = round(bpm, 1)
+        change = next((c for c in sc.vj_tempo_changes if c.frame == sc.frame_current), None)
+        if change is None and sc.frame_current > 0 and sc.vj_tempo_changes:
+            change = sc.vj_tempo_changes.add()
+            change.frame = sc.frame_current
+        if change is not None:
+            change.bpm = bpm
+        else:
+            sc.offset_bpm = round(bpm)
+        self.report({'INFO'}, f"{bpm} BPM")
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_osc_listen(Operator):
+    """Start or stop receiving OSC for Live signals."""
+    bl_idname = "vjlooper.osc_listen"
+    bl_label = "OSC Listen"
+
+    enable: BoolProperty(default=True)
+
+    def execute(self, ctx):
+        if not self.enable:
+            signals.stop_osc()
+            return {'FINISHED'}
+        try:
+            signals.start_osc(ctx.scene.vj_osc_port)
+        except OSError as e:
+            self.report({'ERROR'}, f"Cannot listen on port {ctx.scene.vj_osc_port}: {e}")
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_tempo_change(Operator):
+    """Change the tempo from the current frame on."""
+    bl_idname = "vjlooper.add_tempo_change"
+    bl_label = "Add Tempo Change"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        change = sc.vj_tempo_changes.add()
+        change.frame = sc.frame_current
+        change.bpm = signals.tempo_map(sc).bpm_at(sc.frame_current)
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_tempo_change(Operator):
+    """Remove a tempo change."""
+    bl_idname = "vjlooper.remove_tempo_change"
+    bl_label = "Remove Tempo Change"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        changes = ctx.scene.vj_tempo_changes
+        if 0 <= self.index < len(changes):
+            changes.remove(self.index)
+            signals.update_tempo(None, ctx)
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_make_stack(Operator):
+    """Turn the active object's animations into a shared stack."""
+    bl_idname = "vjlooper.make_stack"
+    bl_label = "Make Shared Stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(default="Stack")
+    link_selected: BoolProperty(default=True, description="Also link the selected objects")
+    clear_items: BoolProperty(default=True, description="Remove the copied animations from linked objects")
+
+    @classmethod
+    def poll(cls, ctx):
+        return ctx.object is not None
+
+    def invoke(self, ctx, ev):
+        return ctx.window_manager.invoke_props_dialog(self)
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        stack = sc.vj_stacks.add()
+        stack.name = self.name
+        for src in ctx.object.signal_items:
+            signals.copy_item(src, stack.items.add())
+        sc.vj_stack_index = len(sc.vj_stacks) - 1
+        objs = set(ctx.selected_objects) if self.link_selected else set()
+        objs.add(ctx.object)
+        for obj in objs:
+            _link_stack(obj, stack.name, self.clear_items)
+        signals.invalidate_stacks()
+        return {'FINISHED'}
+
+
+def _link_stack(obj, name, clear_items):
+    obj.vj_stack = name
+    if clear_items:
+        obj.signal_items.clear()
+
+
+class VJLOOPER_OT_link_stack(Operator):
+    """Link the selected objects to the active shared stack."""
+    bl_idname = "vjlooper.link_stack"
+    bl_label = "Link Shared Stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    clear_items: BoolProperty(default=True, description="Remove the objects' own animations")
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        if sc.vj_stack_index >= len(sc.vj_stacks):
+            return {'CANCELLED'}
+        name = sc.vj_stacks[sc.vj_stack_index].name
+        for obj in ctx.selected_objects:
+            _link_stack(obj, name, self.clear_items)
+        signals.invalidate_stacks()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_unlink_stack(Operator):
+    """Unlink the selected objects from their shared stack."""
+    bl_idname = "vjlooper.unlink_stack"
+    bl_label = "Unlink Shared Stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    realize: BoolProperty(default=True, description="Copy the stack into the objects' own animations")
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        for obj in ctx.selected_objects:
+            stack = sc.vj_stacks.get(obj.vj_stack)
+            if stack is not None and self.realize:
+                for src in stack.items:
+                    it = obj.signal_items.add()
+                    signals.copy_item(src, it)
+                    it.offset += obj.vj_stack_offset
+                    it.phase_offset += obj.vj_stack_phase
+                    it.amplitude *= obj.vj_stack_amp
+            obj.vj_stack = ""
+        signals.invalidate_stacks()
+        signals.invalidate_layers()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_stack_item(Operator):
+    """Add an animation to the active shared stack."""
+    bl_idname = "vjlooper.add_stack_item"
+    bl_label = "Add Stack Animation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        if sc.vj_stack_index >= len(sc.vj_stacks):
+            return {'CANCELLED'}
+        items = sc.vj_stacks[sc.vj_stack_index].items
+        it = items.add()
+        it.name = f"Animation{len(items):02d}"
+        it.channel = sc.signal_new_channel
+        it.signal_type = sc.signal_new_type
+        it.amplitude = sc.signal_new_amplitude
+        it.frequency = sc.signal_new_frequency
+        it.phase_offset = sc.signal_new_phase
+        it.duration = sc.signal_new_duration
+        it.start_frame = sc.frame_current
+        signals.invalidate_stacks()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_stack_item(Operator):
+    """Remove an animation from the active shared stack."""
+    bl_idname = "vjlooper.remove_stack_item"
+    bl_label = "Remove Stack Animation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        if sc.vj_stack_index >= len(sc.vj_stacks):
+            return {'CANCELLED'}
+        items = sc.vj_stacks[sc.vj_stack_index].items
+        if 0 <= self.index < len(items):
+            items.remove(self.index)
+        signals.invalidate_stacks()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_layer(Operator):
+    """Add a layer that animations can be grouped into."""
+    bl_idname = "vjlooper.add_layer"
+    bl_label = "Add Layer"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        layers = ctx.scene.vj_layers
+        n = len(layers) + 1
+        while f"Layer{n:02d}" in layers:
+            n += 1
+        layer = layers.add()
+        layer.name = f"Layer{n:02d}"
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_layer(Operator):
+    """Remove a layer, moving its animations out of any layer."""
+    bl_idname = "vjlooper.remove_layer"
+    bl_label = "Remove Layer"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        if not 0 <= self.index < len(sc.vj_layers):
+            return {'CANCELLED'}
+        name = sc.vj_layers[self.index].name
+        for obj in sc.objects:
+            for it in getattr(obj, "signal_items", ()):
+                if it.layer == name:
+                    it["layer"] = ""
+        for stack in sc.vj_stacks:
+            for it in stack.items:
+                if it.layer == name:
+                    it["layer"] = ""
+        sc.vj_layers.remove(self.index)
+        signals.invalidate_layers()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_assign_layer(Operator):
+    """Put every animation of the selected objects on a layer."""
+    bl_idname = "vjlooper.assign_layer"
+    bl_label = "Assign Layer to Selected"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    layer: StringProperty(default="")
+
+    def execute(self, ctx):
+        for obj in ctx.selected_objects:
+            for it in obj.signal_items:
+                # assigned directly so the active set is rebuilt only once
+                it["layer"] = self.layer
+        signals.invalidate_layers()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_add_cue(Operator):
+    """Add a cue switching to the active preset at the current frame."""
+    bl_idname = "vjlooper.add_cue"
+    bl_label = "Add Cue"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        sc = ctx.scene
+        cue = sc.vj_cues.add()
+        cue.name = f"Cue {len(sc.vj_cues)}"
+        mk = next((m for m in sc.timeline_markers if m.frame == sc.frame_current), None)
+        if mk is None:
+            mk = sc.timeline_markers.new(cue.name, frame=sc.frame_current)
+        cue.marker = mk.name
+        if sc.signal_preset_index < len(sc.signal_presets):
+            cue.preset = sc.signal_presets[sc.signal_preset_index].name
+        cue.collection = sc.vj_target_collection or ctx.collection
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_remove_cue(Operator):
+    """Remove a cue."""
+    bl_idname = "vjlooper.remove_cue"
+    bl_label = "Remove Cue"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty()
+
+    def execute(self, ctx):
+        cues = ctx.scene.vj_cues
+        if 0 <= self.index < len(cues):
+            cues.remove(self.index)
+            signals.invalidate_cues()
+        return {'FINISHED'}
+
+
+class VJLOOPER_OT_compile_cues(Operator):
+    """Precompile every cue so firing it during playback is instant."""
+    bl_idname = "vjlooper.compile_cues"
+    bl_label = "Compile Cues"
+
+    def execute(self, ctx):
+        cl = signals.compile_cues(ctx.scene)
+        rows = sum(len(c) for c in cl.cues)
+        self.report({'INFO'}, f"{len(cl)} cues, {rows} channels")
+        return {'FINISHED'}
+
+
 class VJLOOPER_OT_toggle_preset_brush(Operator):
     """Enable or disable preset brush mode."""
     bl_idname = "vjlooper.toggle_preset_brush"
@@ -516,9 +1319,11 @@ class VJLOOPER_OT_random_hue_shift(Operator):
     bl_label = "Random Hue Shift"
 
     range: FloatProperty(default=0.0, min=0.0, max=1.0)
+    selection: BoolProperty(default=False, description="Also shift materials of selected objects")
+    seed: IntProperty(default=0, min=0, description="Random seed (0 = different every run)")
+    targets: EnumProperty(items=COLOR_TARGETS, options={'ENUM_FLAG'}, default={'VIEWPORT'})
 
     def execute(self, ctx):
-        import colorsys
         sc = ctx.scene
         prefs = signals._prefs()
         rng = self.range if self.range > 0 else (prefs.hue_shift_range if prefs else 0.0)
@@ -526,12 +1331,10 @@ class VJLOOPER_OT_random_hue_shift(Operator):
         idx = sc.vj_material_index
         if idx >= len(mats):
             return {'CANCELLED'}
-        mat = mats[idx]
-        col = mat.diffuse_color
-        h, s, v = colorsys.rgb_to_hsv(col[0], col[1], col[2])
-        h = (h + random.uniform(-rng, rng)) % 1.0
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        mat.diffuse_color = (r, g, b, col[3])
+        targets = _target_materials(ctx, mats[idx], self.selection)
+        cols = _read_material_colors(targets)
+        rgb = core_colors.hue_shift(cols[:, :3], rng, core_colors.make_rng(self.seed))
+        _write_material_colors(targets, rgb, cols[:, 3], set(self.targets))
         return {'FINISHED'}
 
 
@@ -551,35 +1354,28 @@ class VJLOOPER_OT_random_palette(Operator):
         ],
         default='NONE'
     )
+    seed: IntProperty(default=0, min=0, description="Random seed (0 = different every run)")
+    targets: EnumProperty(items=COLOR_TARGETS, options={'ENUM_FLAG'}, default={'VIEWPORT'})
 
     def execute(self, ctx):
-        import colorsys
         sc = ctx.scene
         mats = signals.get_materials_list(sc)
         idx = sc.vj_material_index
         if idx >= len(mats):
             return {'CANCELLED'}
         mat = mats[idx]
-        h, s, v = colorsys.rgb_to_hsv(*mat.diffuse_color[:3])
-        targets = [mat]
-        for obj in ctx.selected_objects:
-            for slot in obj.material_slots:
-                if slot.material:
-                    targets.append(slot.material)
-        for m in set(targets):
-            if self.harmony == 'TRIAD':
-                options = [h, (h + 1/3) % 1.0, (h + 2/3) % 1.0]
-                nh = random.choice(options)
-            elif self.harmony == 'COMPLEMENT':
-                options = [h, (h + 0.5) % 1.0]
-                nh = random.choice(options)
-            else:
-                nh = h + random.uniform(-self.hue_range, self.hue_range)
-            nh = nh % 1.0
-            ns = max(0.0, min(1.0, s + random.uniform(-self.sat_range, self.sat_range)))
-            nv = max(0.0, min(1.0, v + random.uniform(-self.val_range, self.val_range)))
-            r, g, b = colorsys.hsv_to_rgb(nh, ns, nv)
-            m.diffuse_color = (r, g, b, m.diffuse_color[3])
+        targets = _target_materials(ctx, mat)
+        cols = _read_material_colors(targets)
+        rgb = core_colors.palette(
+            mat.diffuse_color[:3],
+            len(targets),
+            core_colors.make_rng(self.seed),
+            self.harmony,
+            self.hue_range,
+            self.sat_range,
+            self.val_range,
+        )
+        _write_material_colors(targets, rgb, cols[:, 3], set(self.targets))
         return {'FINISHED'}
 
 
@@ -588,16 +1384,40 @@ classes = (
     VJLOOPER_OT_add_signal,
     VJLOOPER_OT_remove_signal,
     VJLOOPER_OT_randomize_signal,
+    VJLOOPER_OT_add_lfo,
+    VJLOOPER_OT_remove_lfo,
+    VJLOOPER_OT_add_mod_route,
+    VJLOOPER_OT_remove_mod_route,
     VJLOOPER_OT_add_preset,
     VJLOOPER_OT_load_preset,
+    VJLOOPER_OT_morph_preset,
     VJLOOPER_OT_apply_preset_multi,
     VJLOOPER_OT_apply_preset_offset,
+    VJLOOPER_OT_make_instancer,
     VJLOOPER_OT_remove_preset,
     VJLOOPER_OT_export_presets,
     VJLOOPER_OT_import_presets,
+    VJLOOPER_OT_import_midi,
     VJLOOPER_OT_rename_category,
     VJLOOPER_OT_bake_settings,
     VJLOOPER_OT_bake_animation,
+    VJLOOPER_OT_compile_native,
+    VJLOOPER_OT_decompile_native,
+    VJLOOPER_OT_tap_tempo,
+    VJLOOPER_OT_osc_listen,
+    VJLOOPER_OT_add_tempo_change,
+    VJLOOPER_OT_remove_tempo_change,
+    VJLOOPER_OT_make_stack,
+    VJLOOPER_OT_link_stack,
+    VJLOOPER_OT_unlink_stack,
+    VJLOOPER_OT_add_stack_item,
+    VJLOOPER_OT_remove_stack_item,
+    VJLOOPER_OT_add_layer,
+    VJLOOPER_OT_remove_layer,
+    VJLOOPER_OT_assign_layer,
+    VJLOOPER_OT_add_cue,
+    VJLOOPER_OT_remove_cue,
+    VJLOOPER_OT_compile_cues,
     VJLOOPER_OT_toggle_preset_brush,
     VJLOOPER_OT_set_pivot,
     VJLOOPER_OT_apply_mat_sel,
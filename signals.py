@@ -2,14 +2,33 @@
 
 import bpy
 import json
+import math
+import numpy as np
 import os
+from dataclasses import replace
 from pathlib import Path
 from mathutils import Vector
 from bpy_extras.view3d_utils import location_3d_to_region_2d
 import blf
+import gpu
+from gpu_extras.batch import batch_for_shader
 
 from .core import signals as core_signals
 from .core import persistence as core_persistence
+from .core import preview as core_preview
+from .core import instances as core_instances
+from .core import deform as core_deform
+from .core import paths as core_paths
+from .core import modgraph as core_modgraph
+from .core import tempo as core_tempo
+from .core import audio as core_audio
+from .core import midi as core_midi
+from .core import osc as core_osc
+from .core import markers as core_markers
+from .core import morph as core_morph
+from .core import cues as core_cues
+from .core import stacks as core_stacks
+from .core import layers as core_layers
 
 
 def _scene():
@@ -46,15 +65,392 @@ CHANNEL_ITEMS = [
     ("SCL_Z", "Scale Z", ""),
     ("SCL_ALL", "Uniform Scale", ""),
     ("GN_SCROLL", "GN Scroll", ""),
+    ("VTX_NORMAL", "Vertex Normal Wave", "Displace vertices along their normals"),
+    ("VTX_X", "Vertex X Wave", "Displace vertices along X"),
+    ("VTX_Y", "Vertex Y Wave", "Displace vertices along Y"),
+    ("VTX_Z", "Vertex Z Wave", "Displace vertices along Z"),
+    ("DATA_PATH", "Data Path", "Any property reachable from the object"),
+]
+
+VERTEX_PHASE_ITEMS = [
+    ("NONE", "None", "Every vertex moves in sync"),
+    ("X", "X", "Delay by X coordinate"),
+    ("Y", "Y", "Delay by Y coordinate"),
+    ("Z", "Z", "Delay by Z coordinate"),
+    ("RADIAL", "Radial", "Delay by distance to the object origin"),
+    ("GROUP", "Vertex Group", "Delay by vertex group weight"),
+]
+
+# data path and array index written by each channel; GN_SCROLL is resolved
+# against the TunnelFX modifier at compile time
+CHANNEL_PATHS = {
+    "LOC_X": ("location", 0),
+    "LOC_Y": ("location", 1),
+    "LOC_Z": ("location", 2),
+    "ROT_X": ("rotation_euler", 0),
+    "ROT_Y": ("rotation_euler", 1),
+    "ROT_Z": ("rotation_euler", 2),
+    "SCL_X": ("scale", 0),
+    "SCL_Y": ("scale", 1),
+    "SCL_Z": ("scale", 2),
+    "SCL_ALL": ("scale", 0),
+}
+
+# action group of the F-Curves written by the Compile to Native operator
+NATIVE_GROUP = "VjLooper Native"
+
+SIGNAL_TYPES = [
+    ("SINE", "Sine", ""),
+    ("COSINE", "Cosine", ""),
+    ("SQUARE", "Square", ""),
+    ("TRIANGLE", "Triangle", ""),
+    ("SAWTOOTH", "Sawtooth", ""),
+    ("NOISE", "Noise", ""),
+    ("RAMP", "Ramp", "One-shot eased transition over duration"),
+    ("EXPR", "Expression", "Custom waveform written as an expression"),
+    ("AUDIO", "Audio", "Envelope of a WAV file band"),
+    ("ADSR", "ADSR", "Attack, decay, sustain and release envelope fired by triggers"),
+    ("LIVE", "Live", "Latest value received over OSC"),
+]
+
+AUDIO_BAND_ITEMS = [
+    ("RMS", "Level", "Overall loudness"),
+    ("LOW", "Low", "20-250 Hz"),
+    ("MID", "Mid", "250-4000 Hz"),
+    ("HIGH", "High", "4-20 kHz"),
+]
+
+ADSR_SHAPE_ITEMS = [
+    ("LINEAR", "Linear", "Straight segments"),
+    ("EASE_IN", "Ease In", "Segments start slowly"),
+    ("EASE_OUT", "Ease Out", "Segments start quickly"),
+    ("EASE_IN_OUT", "Ease In Out", "Smooth segments"),
+]
+
+TIME_UNIT_ITEMS = [
+    ("FRAMES", "Frames", "Duration and offset in frames"),
+    ("BEATS", "Beats", "Duration and offset in beats of the scene tempo map"),
+    ("BARS", "Bars", "Duration and offset in bars of the scene tempo map"),
+]
+
+MOD_PARAM_ITEMS = [
+    ("amplitude", "Amplitude", ""),
+    ("frequency", "Frequency", ""),
+    ("phase_offset", "Phase", ""),
+    ("base_value", "Base Value", ""),
 ]
 
 brush_last_obj = None
 brush_counter = 0
 preview_handle = None
+preview_cache = core_preview.PreviewCache()
+
+# object name -> core_preview.Overlay with its GPU batch; entries are dropped
+# by invalidate_preview from the property update callbacks
+overlay_cache = {}
+
+# object name -> (mesh pointer, point count, rest positions, frame offsets)
+instancer_cache = {}
+
+# object name -> {"key", "rest", "normals", "phases"} for vertex channels
+deform_cache = {}
+
+# (object name, vertex group name) -> weight per vertex, read outside the
+# frame handler when the phase settings change or by a timer for the
+# groups in pending_weights
+group_weights = {}
+pending_weights = set()
+
+# temporary node group and attribute used to read vertex group weights
+WEIGHT_GROUP = "VJ Group Weight"
+WEIGHT_ATTR = "vj_group_weight"
+
+# (object name, data path) -> (object pointer, getter, setter); dropped by
+# data path edits, undo, file loads and watch_path_owners, since a swapped
+# obj.data or material slot leaves the setter writing to the old owner
+path_cache = {}
+
+# modulation graph of the scene, rebuilt lazily after routing changes
+mod_state = {"graph": None, "error": ""}
+
+# scene tempo map, rebuilt after tempo edits or frame rate changes
+tempo_state = {"map": None, "key": None}
+
+# trigger lanes of the scene MIDI file
+midi_state = {"lanes": {}, "key": None, "error": ""}
+
+# marker frames as an int array, and sorted hits per trigger pattern
+marker_state = {"frames": None, "hits": {}}
+
+# trigger key -> (on, off) converted to tempo map ticks for beat based items
+trigger_ticks = {}
+
+# morphs, each {"morph", "slots", "beats", "objects"}; objects holds the
+# names whose channels the morph still drives until it ends.  Entries stay
+# after the end so scrubbing back replays the source stacks.
+morphs = []
+
+# shared stack name -> {"stack", "objects", "offsets", "phases", "amps"};
+# links are rescanned after link edits or when the object count changes
+stack_state = {"entries": None, "objects": 0}
+
+# object name -> (item count, indices of the items the frame handler
+# evaluates); rebuilt once after layer, enabled or native changes
+layer_state = {"active": None, "objects": 0, "filter": core_layers.LayerFilter()}
+
+# compiled cue list of the scene, recompiled by a timer after edits so the
+# frame handler never parses presets; members maps cue names to the object
+# names of their collections when compiled
+cue_state = {"list": None, "error": "", "dirty": False, "members": {}}
+
+# OSC listener feeding LIVE signals; its thread never touches bpy
+osc_state = {"listener": None}
+
+# (blend path, audio_file, band, attack, release, fps) -> (envelope, audio
+# key) of resolved audio items; cleared by update_audio on property edits
+audio_params_cache = {}
+
+_audio_cache = None
+
+
+def audio_cache():
+    """Return the shared AudioCache, stored in the user data directory."""
+    global _audio_cache
+    if _audio_cache is None:
+        directory = bpy.utils.user_resource('DATAFILES', path="vjlooper_audio")
+        _audio_cache = core_audio.AudioCache(directory)
+    return _audio_cache
+
+
+def update_audio(self, ctx=None):
+    """Update callback of the audio properties of SignalItem."""
+    audio_params_cache.clear()
+    update_item(self, ctx)
+
+
+def _audio_params(it, params):
+    if not it.audio_file:
+        return params
+    sc = _scene()
+    fps = sc.render.fps / sc.render.fps_base
+    # the blend path is part of the key because relative paths resolve against it
+    lookup = (bpy.data.filepath, it.audio_file, it.audio_band, it.audio_attack, it.audio_release, fps)
+    hit = audio_params_cache.get(lookup)
+    if hit is None:
+        source = bpy.path.abspath(it.audio_file)
+        cache = audio_cache()
+        args = (source, fps, it.audio_band, it.audio_attack, it.audio_release)
+        env = cache.envelope(*args)
+        if env is None and bpy.app.background:
+            # renders from the command line cannot wait for a later frame
+            cache.wait(source, fps)
+            env = cache.envelope(*args)
+        if env is None:
+            # still analyzing, resolve again on a later frame
+            return replace(params, envelope=None, audio_key="")
+        hit = audio_params_cache[lookup] = (env, "|".join(str(a) for a in args))
+    return replace(params, envelope=hit[0], audio_key=hit[1])
+
+
+def update_midi(self, ctx):
+    midi_state["key"] = None
+    invalidate_stacks()
+    invalidate_cues()
+
+
+def midi_lanes(scene):
+    """Return the trigger lanes of the scene MIDI file, parsing it only once."""
+    source = bpy.path.abspath(scene.vj_midi_file) if scene.vj_midi_file else ""
+    fps = scene.render.fps / scene.render.fps_base
+    key = (source, fps)
+    if midi_state["key"] != key:
+        lanes, error = {}, ""
+        if source:
+            try:
+                with open(source, "rb") as f:
+                    lanes = core_midi.build_lanes(core_midi.parse_midi(f.read()), fps)
+            except (OSError, ValueError) as e:
+                error = str(e)
+        midi_state.update(lanes=lanes, key=key, error=error)
+        trigger_ticks.clear()
+    return midi_state["lanes"]
+
+
+def refresh_markers(scene):
+    """Drop cached marker hits when markers were added, removed or moved.
+
+    Only the marker frames are compared, read in one foreach_get call;
+    renames are picked up by invalidate_markers.
+    """
+    markers = scene.timeline_markers
+    frames = np.empty(len(markers), dtype=np.int32)
+    markers.foreach_get("frame", frames)
+    old = marker_state["frames"]
+    if old is None or not np.array_equal(old, frames):
+        marker_state.update(frames=frames, hits={})
+        trigger_ticks.clear()
+        invalidate_cues()
+        invalidate_stacks()
+
+
+def invalidate_markers(self=None, ctx=None):
+    """Drop cached marker hits; also the update callback of marker patterns."""
+    marker_state.update(frames=None, hits={})
+    trigger_ticks.clear()
+    invalidate_cues()
+    invalidate_stacks()
+
+
+def marker_hits(scene, pattern):
+    """Return the sorted frames of markers matching pattern."""
+    hits = marker_state["hits"].get(pattern)
+    if hits is None:
+        if marker_state["frames"] is None:
+            refresh_markers(scene)
+        hits = np.asarray(
+            core_markers.matching_frames(((m.name, m.frame) for m in scene.timeline_markers), pattern),
+            dtype=np.float64,
+        )
+        marker_state["hits"][pattern] = hits
+    return hits
+
+
+_trigger_items = []
+
+# SignalItem enums that only pick a value stored in another property;
+# presets and copies skip them
+PICKER_PROPS = {"trigger_lane"}
+
+
+def _lane_value(key):
+    """Stable enum number of a trigger source, independent of the MIDI file."""
+    if key == "NONE":
+        return 0
+    if key == "MARKERS":
+        return 1
+    return core_midi.lane_number(key)
+
+
+def trigger_lane_items(self, ctx):
+    """Enum items for the lanes of the scene MIDI file."""
+    sc = getattr(ctx, "scene", None) or _scene()
+    lanes = midi_lanes(sc) if sc else {}
+    # Blender needs the item strings to outlive this call
+    _trigger_items[:] = [
+        ("NONE", "Start Frame", "Start at the start frame, without triggers", 0),
+        ("MARKERS", "Markers", "Restart at every timeline marker matching a pattern", 1),
+    ]
+    _trigger_items.extend(
+        (key, core_midi.lane_label(key), f"{len(lane)} triggers", _lane_value(key))
+        for key, lane in lanes.items()
+    )
+    return _trigger_items
+
+
+def get_trigger_lane(self):
+    return _lane_value(self.trigger_source)
+
+
+def set_trigger_lane(self, value):
+    for key, _name, _desc, number in trigger_lane_items(self, bpy.context):
+        if number == value:
+            self.trigger_source = key
+            return
+
+
+def _to_ticks(key, frames):
+    tm = tempo_map(_scene())
+    ticks = trigger_ticks.get(key)
+    if ticks is None:
+        tpb = core_tempo.TICKS_PER_BEAT
+        ticks = tuple(None if f is None else np.floor(tm.beat_at_array(f) * tpb) for f in frames)
+        trigger_ticks[key] = ticks
+    return ticks
+
+
+def _trigger_params(it, params):
+    sc = _scene()
+    if it.trigger_source == "MARKERS":
+        # marker hits hold for duration frames at full velocity
+        key = "MARKERS " + it.marker_pattern
+        on, off, velocity = marker_hits(sc, it.marker_pattern), None, None
+    else:
+        lane = midi_lanes(sc).get(it.trigger_source)
+        if lane is None:
+            return params
+        key = it.trigger_source
+        on, off, velocity = lane.as_tuple()
+    if getattr(it, "time_unit", "FRAMES") != "FRAMES":
+        on, off = _to_ticks(key, (on, off))
+    return replace(params, triggers=(on, off, velocity), trigger_key=key)
+
+
+def start_osc(port):
+    """Start listening for OSC on port, raising OSError if it is taken."""
+    stop_osc()
+    listener = core_osc.OscListener(port=port)
+    listener.start()
+    osc_state["listener"] = listener
+    return listener
+
+
+def stop_osc():
+    listener = osc_state["listener"]
+    if listener is not None:
+        listener.stop()
+        osc_state["listener"] = None
+
+
+def _live_params(it, params):
+    listener = osc_state["listener"]
+    if listener is None:
+        return params
+    return replace(params, live_value=listener.latest(it.live_address, it.live_index))
+
+
+def invalidate_preview(self=None, ctx=None):
+    """Drop the cached overlay of the object owning self, or all of them.
+
+    Also the undo and redo handler, where self is the scene.
+    """
+    owner = getattr(self, "id_data", None)
+    if isinstance(owner, bpy.types.Object):
+        overlay_cache.pop(owner.name, None)
+    else:
+        overlay_cache.clear()
+
+
+def update_item(self, ctx=None):
+    """Update callback of SignalItem properties that change its output."""
+    if isinstance(getattr(self, "id_data", None), bpy.types.Scene):
+        # items of shared stacks live on the scene
+        invalidate_stacks()
+    invalidate_preview(self)
+    graph = mod_state["graph"]
+    if graph is not None:
+        # the memo holds values of the last frame, which may be evaluated again
+        graph.invalidate()
+    if getattr(self, "native", False):
+        obj = self.id_data
+        from . import tunnelfx
+
+        if self.channel == "GN_SCROLL" and tunnelfx.scroll_compiled(obj):
+            # baked into the TunnelFX node group; bake it again
+            tunnelfx.request_rebake(obj)
+        else:
+            # the compiled curve is stale; the handler plays the item until it
+            # is compiled again and _sync_native_curves mutes the curve
+            self.native = False
+
+
+def update_loop_lock(self, ctx):
+    invalidate_stacks()
+    invalidate_cues()
 
 
 def update_frequency(self, ctx):
     """Quantize frequency when loop lock is active."""
+    update_item(self)
     sc = ctx.scene
     if getattr(sc, "loop_lock", False) and self.duration:
         q = round(self.frequency * self.duration) / self.duration
@@ -64,6 +460,7 @@ def update_frequency(self, ctx):
 
 def update_duration(self, ctx):
     """Quantize frequency when duration changes and loop lock active."""
+    update_item(self)
     sc = ctx.scene
     if getattr(sc, "loop_lock", False) and self.duration:
         q = round(self.frequency * self.duration) / self.duration
@@ -93,6 +490,7 @@ def update_new_duration(self, ctx):
 
 def update_offset(self, ctx):
     """Keep offset within duration when loop lock is active."""
+    update_item(self)
     sc = ctx.scene
     if getattr(sc, "loop_lock", False) and self.duration:
         self["offset"] = int(self.offset) % self.duration
@@ -100,18 +498,529 @@ def update_offset(self, ctx):
 
 def apply_preset_to_object(obj, preset_data, base_frame=0, mirror=False, offset=0):
     """Load a serialized preset onto obj at base_frame."""
+    release_morph(obj.name)
     obj.signal_items.clear()
+    invalidate_layers()
     for d in preset_data:
         it = obj.signal_items.add()
-        for k, v in d.items():
+        for k, v in preset_fields(d):
             if k == "amplitude" and mirror:
                 v = -v
             setattr(it, k, v)
         it.start_frame = base_frame + offset
 
 
-def calc_signal(it, obj, frame):
-    """Calculate value for it at frame on obj using pure core implementation."""
+def preset_fields(data):
+    """Yield the (property, value) pairs of a preset dict that SignalItem accepts.
+
+    Presets saved before trigger sources were stored as strings carry the
+    lane in trigger_lane.  Unknown properties and enum values no longer
+    offered are skipped instead of failing the whole preset.
+    """
+    props = bpy.types.Object.bl_rna.properties["signal_items"].fixed_type.properties
+    for k, v in data.items():
+        if k == "trigger_lane":
+            k = "trigger_source"
+        prop = props.get(k)
+        if prop is None or k == "native" or k in PICKER_PROPS:
+            continue
+        if prop.type == 'ENUM' and prop.enum_items and v not in prop.enum_items.keys():
+            continue
+        yield k, v
+
+
+class PresetItem:
+    """Read-only stand-in for a SignalItem holding preset data.
+
+    Missing keys fall back to the SignalItem property defaults, so preset
+    stacks can be evaluated with item_params before they are applied.
+    """
+
+    def __init__(self, data, start_frame=0, mirror=False):
+        self._data = dict(preset_fields(data))
+        self._data["start_frame"] = start_frame
+        if mirror and "amplitude" in self._data:
+            self._data["amplitude"] = -self._data["amplitude"]
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_data"][name]
+        except KeyError:
+            pass
+        prop = bpy.types.Object.bl_rna.properties["signal_items"].fixed_type.properties.get(name)
+        if prop is None:
+            raise AttributeError(name)
+        if prop.type == 'COLLECTION':
+            return ()
+        return prop.default
+
+
+def _slot_key(it):
+    return (it.channel, it.data_path if it.channel == "DATA_PATH" else "")
+
+
+def _morph_stack(items):
+    return [
+        it for it in items
+        if it.enabled and not getattr(it, "native", False) and it.channel not in core_deform.VERTEX_CHANNELS
+    ]
+
+
+def start_morph(scene, objects, preset_data, frames, base_frame, mirror=False, offsets=None):
+    """Morph objects from their current stacks to preset_data over frames.
+
+    Each object's target stack starts at base_frame plus its offset and is
+    applied right away, so call this from an undoable operator; the morph
+    then only overrides the channels until it ends.  Objects already
+    morphing are released from their previous morph.
+    """
+    offsets = offsets or [0] * len(objects)
+    sources, targets, rest, same_clock, slots, beats = [], [], [], [], [], []
+    owned = set()
+    for obj, offset in zip(objects, offsets):
+        start = base_frame + offset
+        src = _morph_stack(obj.signal_items)
+        dst = _morph_stack([PresetItem(d, start, mirror) for d in preset_data])
+        for key, i, j in core_morph.pair_rows([_slot_key(it) for it in src], [_slot_key(it) for it in dst]):
+            a = src[i] if i is not None else None
+            b = dst[j] if j is not None else None
+            unit_a = getattr(a, "time_unit", "FRAMES")
+            unit_b = getattr(b, "time_unit", "FRAMES")
+            sources.append(item_params(a, obj) if a is not None else None)
+            targets.append(item_params(b, obj) if b is not None else None)
+            rest.append(get_channel_value(obj, *key))
+            same_clock.append(unit_a == unit_b)
+            beats.append((unit_a != "FRAMES", unit_b != "FRAMES"))
+            slots.append((obj.name, key))
+        owned.add(obj.name)
+    morph = core_morph.Morph(sources, targets, rest, scene.frame_current, frames, same_clock)
+    for obj, offset in zip(objects, offsets):
+        apply_preset_to_object(obj, preset_data, base_frame + offset, mirror)
+    morphs.append({
+        "morph": morph,
+        "slots": slots,
+        "beats": np.array(beats, dtype=bool).reshape(-1, 2),
+        "objects": owned,
+    })
+    return morph
+
+
+def release_morph(name):
+    """Stop every morph from driving the object called name."""
+    for entry in morphs:
+        entry["objects"].discard(name)
+    morphs[:] = [e for e in morphs if e["objects"]]
+
+
+def clear_morphs(*args):
+    """Drop every morph; undo and redo handler, as both restore the stacks."""
+    morphs.clear()
+
+
+def update_morphs(scene, frame, loop_lock=False):
+    """Write every morph running at frame and return the names they own.
+
+    Before its start a morph holds the source stacks, after its end the
+    applied target stacks play on their own.
+    """
+    owned = set()
+    for entry in morphs:
+        morph = entry["morph"]
+        if morph.done(frame):
+            continue
+        beats = entry["beats"]
+        times_a = times_b = None
+        if beats.any():
+            tick = math.floor(tempo_map(scene).beat_at(frame) * core_tempo.TICKS_PER_BEAT)
+            times_a = np.where(beats[:, 0], tick, frame)
+            times_b = np.where(beats[:, 1], tick, frame)
+        values = morph.evaluate(frame, times_a, times_b, loop_lock=loop_lock)
+        objects = entry["objects"]
+        for (name, (ch, data_path)), v in zip(entry["slots"], values.tolist()):
+            if name in objects:
+                obj = scene.objects.get(name)
+                if obj is not None:
+                    set_channel(obj, ch, v, data_path)
+        owned.update(objects)
+    return owned
+
+
+def copy_item(src, dst):
+    """Copy the plain properties of SignalItem src onto dst."""
+    for p in src.bl_rna.properties:
+        if p.is_readonly or p.type in {'COLLECTION', 'POINTER'} or p.identifier == "native":
+            continue
+        if p.identifier in PICKER_PROPS:
+            continue
+        setattr(dst, p.identifier, getattr(src, p.identifier))
+
+
+def invalidate_stacks(self=None, ctx=None):
+    stack_state["entries"] = None
+
+
+def invalidate_layers(self=None, ctx=None):
+    layer_state["active"] = None
+    # stack rows are filtered by enabled flags and layers too
+    invalidate_stacks()
+    # compiled F-Curves play after the handler, so they follow the filter too
+    if not bpy.app.timers.is_registered(_sync_native_curves):
+        bpy.app.timers.register(_sync_native_curves, first_interval=0.0)
+
+
+def _native_curve_key(data_path, index):
+    # TunnelFX scroll inputs are the only modifier paths compile_native writes
+    return "GN_SCROLL" if data_path.startswith("modifiers[") else (data_path, index)
+
+
+def _sync_native_curves():
+    """Mute compiled F-Curves whose item is no longer native, enabled or playing."""
+    sc = _scene()
+    if sc is None:
+        return None
+    flt = core_layers.LayerFilter((l.name, l.mute, l.solo) for l in getattr(sc, "vj_layers", ()))
+    for obj in sc.objects:
+        items = getattr(obj, "signal_items", None)
+        ad = obj.animation_data
+        if not items or ad is None or ad.action is None:
+            continue
+        playing = set()
+        for it in items:
+            if it.native and it.enabled and flt.plays(it.layer):
+                target = CHANNEL_PATHS.get(it.channel)
+                playing.add(_native_curve_key(*target) if target else it.channel)
+        for fc in ad.action.fcurves:
+            if fc.group is None or fc.group.name != NATIVE_GROUP:
+                continue
+            mute = _native_curve_key(fc.data_path, fc.array_index) not in playing
+            if fc.mute != mute:
+                fc.mute = mute
+    return None
+
+
+def rename_layer(self, ctx=None):
+    """Update callback of SignalLayer.name; moves the layer's items along.
+
+    The previous name is kept in the "vj_name" ID property.  Empty and
+    duplicate names are reverted to it.
+    """
+    old, new = self.get("vj_name", ""), self.name
+    if new == old:
+        return
+    sc = self.id_data
+    taken = any(l.name == new and l.as_pointer() != self.as_pointer() for l in sc.vj_layers)
+    if old and (not new or taken):
+        self["name"] = old
+        return
+    self["vj_name"] = new
+    if old:
+        stacks = [stack.items for stack in sc.vj_stacks]
+        for items in [getattr(obj, "signal_items", ()) for obj in sc.objects] + stacks:
+            for it in items:
+                if it.layer == old:
+                    it["layer"] = new
+    invalidate_layers()
+
+
+def active_items(scene):
+    """Return {object name: (item count, active indices)} for the frame handler.
+
+    Muted layers, disabled and native items are dropped here once, so the
+    handler never visits them.  Objects left without active items are not
+    listed at all.
+    """
+    active = layer_state["active"]
+    if active is not None and layer_state["objects"] == len(scene.objects):
+        return active
+    flt = core_layers.LayerFilter((l.name, l.mute, l.solo) for l in getattr(scene, "vj_layers", ()))
+    active = {}
+    for obj in scene.objects:
+        items = getattr(obj, "signal_items", None)
+        if not items:
+            continue
+        indices = core_layers.active_indices(
+            [(it.enabled, it.native, getattr(it, "layer", "")) for it in items], flt
+        )
+        if indices:
+            active[obj.name] = (len(items), indices)
+    layer_state.update(active=active, objects=len(scene.objects), filter=flt)
+    return active
+
+
+def _link_stacks(scene):
+    groups = core_stacks.group_links([(o.name, getattr(o, "vj_stack", "")) for o in scene.objects])
+    entries = {}
+    for name, obj_names in groups.items():
+        objs = [scene.objects[n] for n in obj_names]
+        entries[name] = {
+            "stack": None,
+            "objects": obj_names,
+            "offsets": np.array([o.vj_stack_offset for o in objs], dtype=np.float64),
+            "phases": np.array([o.vj_stack_phase for o in objs], dtype=np.float64),
+            "amps": np.array([o.vj_stack_amp for o in objs], dtype=np.float64),
+        }
+    stack_state.update(entries=entries, objects=len(scene.objects))
+    return entries
+
+
+def shared_stack(scene, name, entry):
+    """Return the SharedStack of name, built once after the links are scanned.
+
+    Edits of stack items invalidate the links through update_item, so
+    nothing is rebuilt or compared per frame.
+    """
+    stack = entry["stack"]
+    if stack is not None:
+        return stack
+    stack_def = scene.vj_stacks.get(name)
+    if stack_def is None:
+        return None
+    flt = layer_state["filter"]
+    items = [it for it in _morph_stack(stack_def.items) if flt.plays(it.layer)]
+    stack = entry["stack"] = core_stacks.SharedStack(
+        [_slot_key(it) for it in items],
+        [item_params(it, None) for it in items],
+        [it.time_unit != "FRAMES" for it in items],
+    )
+    entry["live"] = [(items[i].live_address, items[i].live_index) for i in stack.live_rows]
+    return stack
+
+
+def _read_live(stack, sources):
+    """Give the LIVE rows of stack the latest OSC values, like _live_params."""
+    listener = osc_state["listener"]
+    if listener is None:
+        return
+    for row, (address, index) in zip(stack.live_rows, sources):
+        stack.set_live(row, listener.latest(address, index))
+
+
+def update_stacks(scene, frame, loop_lock=False):
+    """Evaluate every shared stack once and write it to its objects."""
+    entries = stack_state["entries"]
+    if entries is None or stack_state["objects"] != len(scene.objects):
+        entries = _link_stacks(scene)
+    clock = None
+    for name, entry in entries.items():
+        stack = shared_stack(scene, name, entry)
+        if not stack:
+            continue
+        if stack.live_rows:
+            _read_live(stack, entry["live"])
+        if clock is None and stack.beats.any():
+            tm = tempo_map(scene)
+            tpb = core_tempo.TICKS_PER_BEAT
+
+            def clock(frames):
+                return np.floor(tm.beat_at_array(frames) * tpb)
+        values = stack.evaluate(
+            frame, entry["offsets"], entry["phases"], entry["amps"], loop_lock=loop_lock, clock=clock
+        )
+        for obj_name, row in zip(entry["objects"], values.tolist()):
+            obj = scene.objects.get(obj_name)
+            if obj is None:
+                # renamed or deleted since the links were scanned
+                invalidate_stacks()
+                continue
+            for (ch, data_path), v in zip(stack.keys, row):
+                set_channel(obj, ch, v, data_path)
+
+
+def invalidate_cues(self=None, ctx=None):
+    """Schedule a recompile of the cue list outside the frame handler.
+
+    The previous list keeps playing until the timer has run.
+    """
+    cue_state["dirty"] = True
+    if not bpy.app.timers.is_registered(_recompile_cues):
+        bpy.app.timers.register(_recompile_cues, first_interval=0.0)
+
+
+def _recompile_cues():
+    sc = _scene()
+    if sc is not None and cue_state["dirty"] and getattr(sc, "vj_cues_enabled", False):
+        compile_cues(sc)
+    return None
+
+
+def _cue_members(cue):
+    if cue.collection is None:
+        return ()
+    return tuple(sorted(o.name for o in cue.collection.all_objects))
+
+
+def watch_cue_collections(scene, depsgraph=None):
+    """Recompile cues when objects join or leave a cue's collection."""
+    if cue_state["list"] is None or cue_state["dirty"]:
+        return
+    if depsgraph is not None and not depsgraph.id_type_updated('COLLECTION'):
+        return
+    members = cue_state["members"]
+    if any(_cue_members(c) != members.get(c.name) for c in scene.vj_cues if c.enabled):
+        invalidate_cues()
+
+
+def _cue_offsets(scene, cue, objs, frame):
+    if cue.offset_mode == 'BPM':
+        tm = tempo_map(scene)
+        return [int(tm.span_frames(frame, i)) for i in range(len(objs))]
+    offsets = core_instances.instance_offsets(
+        cue.offset_mode,
+        [o.location[:] for o in objs],
+        cue.collection.instance_offset[:],
+        cue.step,
+        cue.radial_factor,
+    )
+    return [int(v) for v in offsets]
+
+
+def compile_cues(scene):
+    """Parse every cue's preset and snapshot the params of its objects."""
+    presets = {p.name: p for p in scene.signal_presets}
+    parsed = {}
+    compiled, problems = [], []
+    members = {}
+    for cue in scene.vj_cues:
+        if not cue.enabled:
+            continue
+        members[cue.name] = _cue_members(cue)
+        mk = scene.timeline_markers.get(cue.marker)
+        pr = presets.get(cue.preset)
+        if mk is None or pr is None or cue.collection is None:
+            problems.append(cue.name)
+            continue
+        if pr.name not in parsed:
+            parsed[pr.name] = json.loads(pr.data) if validate_preset(pr.data) else None
+        data = parsed[pr.name]
+        if data is None:
+            problems.append(cue.name)
+            continue
+        objs = sorted(
+            (o for o in cue.collection.all_objects if hasattr(o, "signal_items")), key=lambda o: o.name
+        )
+        stacks = {}
+        live = []
+        for obj, offset in zip(objs, _cue_offsets(scene, cue, objs, mk.frame)):
+            items = _morph_stack([PresetItem(d, mk.frame + offset, scene.preset_mirror) for d in data])
+            stacks[obj.name] = [
+                (_slot_key(it), item_params(it, obj), it.time_unit != "FRAMES") for it in items
+            ]
+            live.extend((it.live_address, it.live_index) for it in items if it.signal_type == "LIVE")
+        compiled_cue = core_cues.CompiledCue(mk.frame, stacks, cue.name)
+        compiled_cue.live_sources = live
+        compiled.append(compiled_cue)
+    cue_state.update(list=core_cues.CueList(compiled), dirty=False, members=members)
+    cue_state["error"] = f"Incomplete cues: {', '.join(problems)}" if problems else ""
+    return cue_state["list"]
+
+
+def update_cues(scene, frame, loop_lock=False):
+    """Write the stacks of the cues playing at frame; return their objects.
+
+    Until the first compile has run nothing is written.
+    """
+    cl = cue_state["list"]
+    if cl is None:
+        invalidate_cues()
+        return ()
+    owners = cl.owners_at(frame)
+    if not owners:
+        return owners
+    tick = None
+    listener = osc_state["listener"]
+    for ci in cl.active_at(frame):
+        cue = cl.cues[ci]
+        if listener is not None:
+            for row, (address, index) in zip(cue.live_rows, cue.live_sources):
+                cue.set_live(row, listener.latest(address, index))
+        if tick is None and cue.beats.any():
+            tick = math.floor(tempo_map(scene).beat_at(frame) * core_tempo.TICKS_PER_BEAT)
+        values = cue.evaluate(frame, tick, loop_lock=loop_lock)
+        obj = None
+        for name, (ch, data_path), v in zip(cue.owners, cue.keys, values.tolist()):
+            if owners.get(name) != ci:
+                continue
+            if obj is None or obj.name != name:
+                obj = scene.objects.get(name)
+            if obj is not None:
+                set_channel(obj, ch, v, data_path)
+    return owners
+
+
+def invalidate_tempo(*args):
+    """Drop the tempo map; undo and redo handler, as both may restore tempo edits."""
+    tempo_state.update(map=None, key=None)
+    trigger_ticks.clear()
+
+
+def update_tempo(self, ctx):
+    invalidate_tempo()
+    invalidate_cues()
+    invalidate_stacks()
+    invalidate_preview()
+
+
+def tempo_map(scene):
+    """Return the cached TempoMap of scene."""
+    fps = scene.render.fps / scene.render.fps_base
+    key = (scene.name, fps)
+    if tempo_state["map"] is None or tempo_state["key"] != key:
+        tempo_state["map"] = core_tempo.TempoMap(
+            [(c.frame, c.bpm) for c in scene.vj_tempo_changes],
+            fps,
+            scene.offset_bpm,
+            scene.vj_beats_per_bar,
+        )
+        tempo_state["key"] = key
+        trigger_ticks.clear()
+    return tempo_state["map"]
+
+
+def _in_beats(it, value, tm):
+    return value * tm.beats_per_bar if it.time_unit == "BARS" else value
+
+
+def item_clock(it, frames):
+    """Return the time it is evaluated at for frames (scalar or array).
+
+    Frame based items run on frames; beat based items run on ticks of the
+    tempo map so tempo changes bend their cycles.
+    """
+    if getattr(it, "time_unit", "FRAMES") == "FRAMES":
+        return frames
+    tm = tempo_map(_scene())
+    if isinstance(frames, np.ndarray):
+        return np.floor(tm.beat_at_array(frames) * core_tempo.TICKS_PER_BEAT)
+    return math.floor(tm.beat_at(frames) * core_tempo.TICKS_PER_BEAT)
+
+
+def _beat_params(it, obj, params):
+    sc = _scene()
+    tm = tempo_map(sc)
+    tpb = core_tempo.TICKS_PER_BEAT
+    beats = _in_beats(it, it.beat_duration, tm) * getattr(obj, "global_dur_scale", 1.0)
+    start = tm.beat_at(it.start_frame)
+    ticks_per_frame = tpb / tm.frames_per_beat(it.start_frame)
+    attack, decay, sustain, release = params.adsr
+    if getattr(sc, "loop_lock", False):
+        beats = tm.snap_beats(beats)
+        start = round(start / tm.beats_per_bar) * tm.beats_per_bar
+    return replace(
+        params,
+        duration=max(1, round(beats * tpb)),
+        start_frame=round(start * tpb),
+        offset=round(_in_beats(it, it.beat_offset, tm) * tpb),
+        blend_frames=round(params.blend_frames * ticks_per_frame),
+        adsr=(attack * ticks_per_frame, decay * ticks_per_frame, sustain, release * ticks_per_frame),
+    )
+
+
+def item_params(it, obj):
+    """Return core SignalParams for it with obj's global scales applied.
+
+    Beat based items get durations and offsets in tempo map ticks; evaluate
+    them at item_clock(it, frame).
+    """
     params = core_signals.SignalParams(
         signal_type=it.signal_type,
         amplitude=it.amplitude * getattr(obj, "global_amp_scale", 1.0),
@@ -128,17 +1037,131 @@ def calc_signal(it, obj, frame):
         clamp_min=it.clamp_min,
         clamp_max=it.clamp_max,
         blend_frames=getattr(it, "blend_frames", 0),
+        expression=getattr(it, "expression", ""),
+        adsr=(
+            getattr(it, "adsr_attack", 2.0),
+            getattr(it, "adsr_decay", 6.0),
+            getattr(it, "adsr_sustain", 0.6),
+            getattr(it, "adsr_release", 12.0),
+        ),
+        adsr_shape=getattr(it, "adsr_shape", "LINEAR"),
     )
+    if getattr(it, "time_unit", "FRAMES") != "FRAMES":
+        params = _beat_params(it, obj, params)
+    if it.signal_type == "AUDIO":
+        params = _audio_params(it, params)
+    if it.signal_type == "LIVE":
+        params = _live_params(it, params)
+    if getattr(it, "trigger_source", "NONE") != "NONE":
+        params = _trigger_params(it, params)
+    return params
+
+
+def calc_signal(it, obj, frame):
+    """Calculate value for it at frame on obj using pure core implementation."""
+    params = item_params(it, obj)
     sc = _scene()
     loop_lock = getattr(sc, "loop_lock", False) if sc else False
     cache_key = (getattr(obj, "name", None), getattr(it, "name", None))
     return core_signals.calc_signal(
-        params, frame, loop_lock=loop_lock, cache_key=cache_key
+        params, item_clock(it, frame), loop_lock=loop_lock, cache_key=cache_key
     )
 
 
-def set_channel(obj, ch, v):
+def _resolve_path(obj, data_path):
+    """Return (getter, setter) for data_path on obj, resolving it only once."""
+    key = (obj.name, data_path)
+    cached = path_cache.get(key)
+    if cached and cached[0] == obj.as_pointer():
+        return cached[1], cached[2]
+    target = core_paths.split_data_path(data_path)
+    owner = obj.path_resolve(target.owner) if target.owner else obj
+    if target.key is not None:
+        name = target.key
+
+        def getter():
+            return owner[name]
+
+        def setter(v):
+            owner[name] = v
+    elif target.index is not None:
+        arr, i = getattr(owner, target.attr), target.index
+        arr[i]  # raise IndexError now rather than every frame
+
+        def getter():
+            return arr[i]
+
+        def setter(v):
+            arr[i] = v
+    else:
+        attr = target.attr
+        getattr(owner, attr)
+
+        def getter():
+            return getattr(owner, attr)
+
+        def setter(v):
+            setattr(owner, attr, v)
+    path_cache[key] = (obj.as_pointer(), getter, setter)
+    return getter, setter
+
+
+def invalidate_paths(obj_name=None):
+    """Forget resolved data paths of obj_name, or of every object.
+
+    Entries of objects that were renamed or removed are dropped as well.
+    """
+    if obj_name is None:
+        path_cache.clear()
+        return
+    objects = bpy.data.objects
+    for key in [k for k in path_cache if k[0] == obj_name or k[0] not in objects]:
+        del path_cache[key]
+
+
+def clear_paths(*args):
+    """Forget every resolved data path; undo and redo handler."""
+    path_cache.clear()
+
+
+def watch_path_owners(scene, depsgraph=None):
+    """Drop resolved data paths after edits that may swap the datablocks they write."""
+    if not path_cache:
+        return
+    if depsgraph is None or any(depsgraph.id_type_updated(t) for t in ('OBJECT', 'MATERIAL', 'NODETREE')):
+        path_cache.clear()
+
+
+def update_data_path(self, ctx):
+    invalidate_paths(self.id_data.name)
+    update_item(self)
+
+
+def _access_path(obj, data_path, value=None):
+    """Read, or write when value is given, data_path on obj.
+
+    A cached owner that was removed or renamed away is resolved again once;
+    paths that still fail are ignored so one bad item cannot stop playback.
+    """
+    if not data_path:
+        return 0.0
+    for attempt in range(2):
+        try:
+            getter, setter = _resolve_path(obj, data_path)
+            if value is None:
+                return getter()
+            setter(value)
+            return value
+        except (ReferenceError, ValueError, AttributeError, KeyError, IndexError, TypeError):
+            path_cache.pop((obj.name, data_path), None)
+    return 0.0
+
+
+def set_channel(obj, ch, v, data_path=""):
     """Write value v to object's channel ch."""
+    if ch == "DATA_PATH":
+        _access_path(obj, data_path, v)
+        return
     if ch == "LOC_X":
         obj.location.x = v
     if ch == "LOC_Y":
@@ -163,8 +1186,11 @@ def set_channel(obj, ch, v):
         obj.tfx_scroll_speed = v
 
 
-def get_channel_value(obj, ch):
+def get_channel_value(obj, ch, data_path=""):
     """Return current value of channel ch from obj."""
+    if ch == "DATA_PATH":
+        value = _access_path(obj, data_path)
+        return float(value) if isinstance(value, (int, float)) else 0.0
     if ch == "LOC_X":
         return obj.location.x
     if ch == "LOC_Y":
@@ -206,19 +1232,352 @@ def get_materials_list(scene):
     return list(bpy.data.materials)
 
 
+def instancer_arrays(obj):
+    """Return cached (rest, offsets) arrays of an instancer point cloud."""
+    me = obj.data
+    count = len(me.vertices)
+    cached = instancer_cache.get(obj.name)
+    if cached and cached[0] == me.as_pointer() and cached[1] == count:
+        return cached[2], cached[3]
+    rest = np.empty(count * 3, dtype=np.float64)
+    me.vertices.foreach_get("co", rest)
+    offsets = np.zeros(count, dtype=np.float64)
+    attr = me.attributes.get("vj_offset")
+    if attr is not None:
+        attr.data.foreach_get("value", offsets)
+    rest = rest.reshape(-1, 3)
+    instancer_cache[obj.name] = (me.as_pointer(), count, rest, offsets)
+    return rest, offsets
+
+
+def _write_vectors(me, name, arr):
+    attr = me.attributes.get(name) or me.attributes.new(name, 'FLOAT_VECTOR', 'POINT')
+    attr.data.foreach_set("vector", arr.astype(np.float32).ravel())
+
+
+def update_instancer(obj, frame, loop_lock=False, items=None):
+    """Evaluate every instance of obj at frame and write point attributes.
+
+    items defaults to the enabled SignalItems of obj.
+    """
+    if items is None:
+        items = [it for it in obj.signal_items if it.enabled]
+    rest, offsets = instancer_arrays(obj)
+    frames = frame - offsets
+    channels = [
+        (
+            it.channel,
+            core_instances.calc_signal_batch(
+                item_params(it, obj), item_clock(it, frames), loop_lock=loop_lock
+            ),
+        )
+        for it in items
+    ]
+    loc, rot, scl = core_instances.compose_transforms(rest, channels)
+    me = obj.data
+    _write_vectors(me, "vj_location", loc)
+    _write_vectors(me, "vj_rotation", rot)
+    _write_vectors(me, "vj_scale", scl)
+    me.update_tag()
+
+
+def _deform_state(obj):
+    me = obj.data
+    count = len(me.vertices)
+    key = (me.as_pointer(), count)
+    state = deform_cache.get(obj.name)
+    if state and state["key"] == key:
+        return state
+    rest = np.empty(count * 3, dtype=np.float64)
+    normals = np.empty(count * 3, dtype=np.float64)
+    basis = me.shape_keys.reference_key if me.shape_keys else None
+    (basis.data if basis else me.vertices).foreach_get("co", rest)
+    me.vertices.foreach_get("normal", normals)
+    state = {
+        "key": key,
+        "rest": rest.reshape(-1, 3),
+        "normals": normals.reshape(-1, 3),
+        "phases": {},
+    }
+    deform_cache[obj.name] = state
+    return state
+
+
+def new_socket(ng, name, in_out, socket_type='NodeSocketGeometry'):
+    """Add a group socket on both the 4.x interface and the 3.x API."""
+    if hasattr(ng, "interface"):
+        return ng.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    sockets = ng.inputs if in_out == 'INPUT' else ng.outputs
+    return sockets.new(socket_type, name)
+
+
+def _weight_node_group():
+    """Return the node group copying a vertex group into WEIGHT_ATTR."""
+    ng = bpy.data.node_groups.get(WEIGHT_GROUP)
+    if ng is not None:
+        return ng
+    ng = bpy.data.node_groups.new(WEIGHT_GROUP, 'GeometryNodeTree')
+    new_socket(ng, "Geometry", 'INPUT')
+    new_socket(ng, "Geometry", 'OUTPUT')
+    nodes, links = ng.nodes, ng.links
+    gin = nodes.new("NodeGroupInput")
+    gout = nodes.new("NodeGroupOutput")
+    read = nodes.new("GeometryNodeInputNamedAttribute")
+    read.name = "Group"
+    read.data_type = 'FLOAT'
+    store = nodes.new("GeometryNodeStoreNamedAttribute")
+    store.data_type = 'FLOAT'
+    store.domain = 'POINT'
+    store.inputs["Name"].default_value = WEIGHT_ATTR
+    links.new(gin.outputs[0], store.inputs["Geometry"])
+    links.new(read.outputs["Attribute"], store.inputs["Value"])
+    links.new(store.outputs["Geometry"], gout.inputs[0])
+    return ng
+
+
+def _group_weights(obj, name, count):
+    """Read the weights of vertex group name in bulk, 0 outside the group.
+
+    Vertex groups have no bulk accessor, so a Geometry Nodes modifier
+    stores the group as a point attribute that foreach_get reads from the
+    evaluated mesh.  The modifier sits on a temporary object sharing
+    obj's mesh, so obj's own modifier stack is never touched and the
+    point count matches the original mesh.
+    """
+    ng = _weight_node_group()
+    ng.nodes["Group"].inputs["Name"].default_value = name
+    weights = np.zeros(count, dtype=np.float32)
+    probe = bpy.data.objects.new("VJ Weights", obj.data)
+    try:
+        probe.hide_render = True
+        _scene().collection.objects.link(probe)
+        probe.modifiers.new("VJ Weights", 'NODES').node_group = ng
+        evaluated = probe.evaluated_get(bpy.context.evaluated_depsgraph_get())
+        attr = evaluated.data.attributes.get(WEIGHT_ATTR)
+        if attr is not None and len(attr.data) == count:
+            attr.data.foreach_get("value", weights)
+    finally:
+        bpy.data.objects.remove(probe)
+    return weights.astype(np.float64)
+
+
+def read_group_weights(obj, group):
+    """Cache the weights of obj's vertex group; only the weights timer calls this."""
+    pending_weights.discard((obj.name, group))
+    if obj.type != 'MESH' or obj.vertex_groups.get(group) is None:
+        group_weights.pop((obj.name, group), None)
+    else:
+        group_weights[(obj.name, group)] = _group_weights(obj, group, len(obj.data.vertices))
+    state = deform_cache.get(obj.name)
+    if state is not None:
+        state["phases"].clear()
+
+
+def request_group_weights(obj_name, group):
+    """Have the weights timer read a vertex group outside any handler or callback."""
+    pending_weights.add((obj_name, group))
+    if not bpy.app.timers.is_registered(_read_pending_weights):
+        bpy.app.timers.register(_read_pending_weights, first_interval=0.0)
+
+
+def _read_pending_weights():
+    sc = _scene()
+    while pending_weights:
+        name, group = pending_weights.pop()
+        obj = sc.objects.get(name) if sc is not None else None
+        if obj is not None:
+            read_group_weights(obj, group)
+    return None
+
+
+def update_vertex_phase(self, ctx=None):
+    """Update callback of the vertex phase settings of a SignalItem."""
+    obj = getattr(self, "id_data", None)
+    if isinstance(obj, bpy.types.Object) and self.vertex_phase == "GROUP" and self.vertex_group:
+        request_group_weights(obj.name, self.vertex_group)
+
+
+def _vertex_phase(obj, state, it):
+    """Return cached per-vertex start delays for it.
+
+    Group weights come from group_weights only; missing ones are read by
+    a timer and the group delays stay zero until then.
+    """
+    key = (it.vertex_phase, it.phase_scale, it.vertex_group)
+    phases = state["phases"]
+    if key not in phases:
+        weights = None
+        vg = obj.vertex_groups.get(it.vertex_group) if it.vertex_phase == "GROUP" else None
+        if vg is not None:
+            weights = group_weights.get((obj.name, vg.name))
+            if weights is None or len(weights) != len(state["rest"]):
+                request_group_weights(obj.name, vg.name)
+                return np.zeros(len(state["rest"]))
+        phases[key] = core_deform.phase_offsets(it.vertex_phase, state["rest"], it.phase_scale, weights)
+    return phases[key]
+
+
+def update_deformer(obj, items, frame, loop_lock=False):
+    """Write the summed vertex wave items of obj into its "VJ Wave" shape key."""
+    state = _deform_state(obj)
+    channels = []
+    for it in items:
+        frames = item_clock(it, frame - _vertex_phase(obj, state, it))
+        values = core_instances.calc_signal_batch(item_params(it, obj), frames, loop_lock=loop_lock)
+        channels.append((it.channel, values))
+    disp = core_deform.displacement(state["normals"], channels)
+    me = obj.data
+    if me.shape_keys is None:
+        obj.shape_key_add(name="Basis", from_mix=False)
+        # clear_deformer removes the basis again if nothing else uses it
+        me["vj_basis"] = True
+    shape = me.shape_keys.key_blocks.get("VJ Wave")
+    if shape is None:
+        shape = obj.shape_key_add(name="VJ Wave", from_mix=False)
+        shape.value = 1.0
+    shape.data.foreach_set("co", (state["rest"] + disp).astype(np.float32).ravel())
+    me.update_tag()
+
+
+def clear_deformer(obj_name, scene):
+    """Drop the "VJ Wave" shape key of an object left without vertex items.
+
+    The basis key goes too when update_deformer added it and no other
+    key is left, so modifiers can be applied again.
+    """
+    deform_cache.pop(obj_name, None)
+    for key in [k for k in group_weights if k[0] == obj_name]:
+        del group_weights[key]
+    obj = scene.objects.get(obj_name)
+    keys = obj.data.shape_keys if obj is not None and obj.type == 'MESH' else None
+    shape = keys.key_blocks.get("VJ Wave") if keys else None
+    if shape is not None:
+        obj.shape_key_remove(shape)
+        me = obj.data
+        if me.get("vj_basis"):
+            keys = me.shape_keys
+            if keys is not None and len(keys.key_blocks) == 1:
+                obj.shape_key_remove(keys.key_blocks[0])
+            del me["vj_basis"]
+        me.update_tag()
+
+
+def invalidate_mod_graph():
+    mod_state["graph"] = None
+
+
+def update_mod_routes(self, ctx):
+    invalidate_mod_graph()
+    update_item(self)
+
+
+def _route_source(route):
+    if not route.source_name:
+        return None
+    if route.source_kind == 'LFO':
+        # object names are never empty, so "" marks scene LFOs
+        return ("", route.source_name)
+    if route.source_object is None:
+        return None
+    return (route.source_object.name, route.source_name)
+
+
+def mod_graph(scene):
+    """Return the scene's modulation graph, building it after changes."""
+    graph = mod_state["graph"]
+    if graph is not None:
+        return graph
+    routes = []
+    for obj in scene.objects:
+        for it in getattr(obj, "signal_items", ()):
+            for r in it.mod_routes:
+                src = _route_source(r)
+                if src is not None:
+                    routes.append(core_modgraph.Route(src, (obj.name, it.name), r.param, r.depth))
+    try:
+        graph = core_modgraph.ModGraph(routes)
+        mod_state["error"] = ""
+    except core_modgraph.CycleError as exc:
+        graph = core_modgraph.ModGraph([])
+        mod_state["error"] = str(exc)
+    mod_state["graph"] = graph
+    return graph
+
+
+def _mod_item(scene, key):
+    owner, name = key
+    if owner:
+        obj = scene.objects.get(owner)
+        it = obj.signal_items.get(name) if obj else None
+    else:
+        obj = None
+        it = scene.vj_lfos.get(name)
+    return (it, obj) if it is not None and it.enabled else (None, None)
+
+
+def _mod_params(scene, key):
+    it, obj = _mod_item(scene, key)
+    return item_params(it, obj) if it is not None else None
+
+
+def _mod_time(scene, key, frame):
+    it, _ = _mod_item(scene, key)
+    return item_clock(it, frame) if it is not None else frame
+
+
 def frame_handler(scene):
     """Update object channels for the current frame."""
     f = scene.frame_current
-    for obj in scene.objects:
-        if hasattr(obj, "signal_items"):
-            for it in obj.signal_items:
-                if it.enabled:
-                    v = calc_signal(it, obj, f)
-                    set_channel(obj, it.channel, v)
+    refresh_markers(scene)
+    loop_lock = getattr(scene, "loop_lock", False)
+    active = active_items(scene)
+    graph = mod_graph(scene)
+    mod_values = graph.evaluate(
+        f,
+        lambda key: _mod_params(scene, key),
+        loop_lock,
+        time_for=lambda key: _mod_time(scene, key, f),
+    ) if graph.routes else {}
+    if getattr(scene, "vj_stacks", None):
+        update_stacks(scene, f, loop_lock)
+    morphing = update_morphs(scene, f, loop_lock) if morphs else ()
+    cued = update_cues(scene, f, loop_lock) if getattr(scene, "vj_cues_enabled", False) else ()
+    deformed = set()
+    for name, (count, indices) in active.items():
+        obj = scene.objects.get(name)
+        items = obj.signal_items if obj is not None else ()
+        if len(items) != count:
+            # renamed, deleted or edited since the active set was built
+            invalidate_layers()
+            continue
+        if obj.get("vj_instancer") and obj.type == 'MESH':
+            update_instancer(obj, f, loop_lock, [items[i] for i in indices])
+            continue
+        vertex_items = []
+        for i in indices:
+            it = items[i]
+            if it.channel in core_deform.VERTEX_CHANNELS:
+                vertex_items.append(it)
+                continue
+            if name in morphing or name in cued:
+                continue
+            v = mod_values.get((name, it.name)) if mod_values else None
+            if v is None:
+                if it.mod_routes and (name, it.name) not in graph:
+                    # renamed since the graph was built
+                    invalidate_mod_graph()
+                v = calc_signal(it, obj, f)
+            set_channel(obj, it.channel, v, it.data_path)
+        if vertex_items and obj.type == 'MESH':
+            update_deformer(obj, vertex_items, f, loop_lock)
+            deformed.add(name)
+    for name in [n for n in deform_cache if n not in deformed]:
+        # the last vertex item was disabled, muted or removed
+        clear_deformer(name, scene)
 
 
 def draw_preview_callback():
-    """Draw signal info overlay in the 3D view."""
+    """Draw cached waveform sparklines for selected objects in the 3D view."""
     prefs = _prefs()
     if not prefs or not prefs.use_preview:
         return
@@ -226,17 +1585,70 @@ def draw_preview_callback():
     rv3d = bpy.context.region_data
     if not region or not rv3d:
         return
+    sc = bpy.context.scene
+    frame = sc.frame_current
+    loop_lock = getattr(sc, "loop_lock", False)
+    tick = None
     font_id = 0
     blf.color(font_id, *prefs.brush_color)
+    name = "UNIFORM_COLOR" if bpy.app.version >= (3, 4, 0) else "2D_UNIFORM_COLOR"
+    shader = gpu.shader.from_builtin(name)
+    shader.bind()
+    shader.uniform_float("color", tuple(prefs.brush_color))
+    cursors = []
+    live = {}
     for obj in bpy.context.selected_objects:
-        if not getattr(obj, "signal_items", None):
+        items = getattr(obj, "signal_items", None)
+        if not items:
+            continue
+        live[obj.name] = len(items)
+        co2d = location_3d_to_region_2d(region, rv3d, obj.matrix_world.translation)
+        if not co2d:
             continue
-        it = obj.signal_items[0]
-        text = f"{it.signal_type} {it.frequency:.2f}Hz"
-        co2d = location_3d_to_region_2d(region, rv3d, obj.location)
-        if co2d:
-            blf.position(font_id, co2d.x, co2d.y, 0)
+        ov = _overlay(obj, items, loop_lock, shader)
+        if tick is None and any(ov.beats):
+            tick = math.floor(tempo_map(sc).beat_at(frame) * core_tempo.TICKS_PER_BEAT)
+        with gpu.matrix.push_pop():
+            gpu.matrix.translate((co2d.x, co2d.y))
+            ov.batch.draw(shader)
+        for x, y, text in ov.labels:
+            blf.position(font_id, co2d.x + x, co2d.y + y, 0)
             blf.draw(font_id, text)
+        cursors.extend((co2d.x + x, co2d.y + y) for x, y in ov.cursors(frame, tick))
+    if len(overlay_cache) > 2 * len(live) + 16:
+        # keep recently deselected objects cached, but not every object ever shown
+        for name in [n for n in overlay_cache if n not in live]:
+            del overlay_cache[name]
+        preview_cache.prune((name, i) for name, count in live.items() for i in range(count))
+    if cursors:
+        batch_for_shader(shader, "LINES", {"pos": cursors}).draw(shader)
+
+
+def _overlay(obj, items, loop_lock, shader):
+    """Return the cached overlay of obj, rebuilding it when any row is stale.
+
+    Rows are compared by parameters and names, so edits that skip the update
+    callbacks, such as undo, reordering or animated properties, show up too.
+    """
+    params = [item_params(it, obj) for it in items]
+    beats = [getattr(it, "time_unit", "FRAMES") != "FRAMES" for it in items]
+    ov = overlay_cache.get(obj.name)
+    if (
+        ov is not None
+        and ov.loop_lock == loop_lock
+        and ov.beats == beats
+        and len(ov) == len(items)
+        and all(line.params == p and line.label == it.name for line, p, it in zip(ov.lines, params, items))
+    ):
+        return ov
+    lines = [
+        preview_cache.get((obj.name, i), p, it.name, loop_lock)
+        for i, (p, it) in enumerate(zip(params, items))
+    ]
+    ov = core_preview.layout(lines, preview_cache.height + 8, beats, loop_lock)
+    ov.batch = batch_for_shader(shader, "LINES", {"pos": ov.coords})
+    overlay_cache[obj.name] = ov
+    return ov
 
 
 def preset_brush_handler(scene):
@@ -278,9 +1690,11 @@ def update_signal_markers(scene):
                     it.start_frame = mk.frame
                 if mk.name != it.name:
                     mk.name = it.name
+                    invalidate_markers()
             else:
                 new_mk = scene.timeline_markers.new(it.name, frame=it.start_frame)
                 it.marker_name = new_mk.name
+                invalidate_markers()
 
 
 def validate_preset(data):
@@ -339,6 +1753,40 @@ def load_presets_from_disk():
             p.category = e.get("category", "General")
 
 
+@bpy.app.handlers.persistent
+def clear_caches(*args):
+    """Drop every cache tied to the open file; load_post handler.
+
+    Caches are keyed by object and scene names, which the next file
+    is likely to reuse.
+    """
+    preview_cache.clear()
+    overlay_cache.clear()
+    instancer_cache.clear()
+    deform_cache.clear()
+    group_weights.clear()
+    pending_weights.clear()
+    path_cache.clear()
+    audio_params_cache.clear()
+    invalidate_mod_graph()
+    invalidate_tempo()
+    midi_state.update(lanes={}, key=None, error="")
+    invalidate_markers()
+    morphs.clear()
+    cue_state.update(list=None, error="", members={})
+    invalidate_stacks()
+    invalidate_layers()
+
+
+@bpy.app.handlers.persistent
+def stamp_layer_names(*args):
+    """Record the names rename_layer compares against; load_post handler."""
+    for sc in bpy.data.scenes:
+        for layer in getattr(sc, "vj_layers", ()):
+            if layer.get("vj_name") != layer.name:
+                layer["vj_name"] = layer.name
+
+
 def register():
     bpy.app.handlers.frame_change_pre.append(frame_handler)
     prefs = _prefs()
@@ -349,6 +1797,19 @@ def register():
         )
     if update_signal_markers not in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(update_signal_markers)
+    if watch_cue_collections not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(watch_cue_collections)
+    if watch_path_owners not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(watch_path_owners)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        for fn in (
+            invalidate_layers, invalidate_cues, clear_morphs, invalidate_tempo, clear_paths, invalidate_preview
+        ):
+            if fn not in handlers:
+                handlers.append(fn)
+    for fn in (clear_caches, stamp_layer_names):
+        if fn not in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.append(fn)
 
 
 def unregister():
@@ -358,7 +1819,26 @@ def unregister():
         bpy.app.handlers.depsgraph_update_post.remove(preset_brush_handler)
     if update_signal_markers in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(update_signal_markers)
+    if watch_cue_collections in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(watch_cue_collections)
+    if watch_path_owners in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(watch_path_owners)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        for fn in (
+            invalidate_layers, invalidate_cues, clear_morphs, invalidate_tempo, clear_paths, invalidate_preview
+        ):
+            if fn in handlers:
+                handlers.remove(fn)
+    for fn in (clear_caches, stamp_layer_names):
+        if fn in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(fn)
     global preview_handle
     if preview_handle is not None:
         bpy.types.SpaceView3D.draw_handler_remove(preview_handle, "WINDOW")
         preview_handle = None
+    clear_caches()
+    stop_osc()
+    for timer in (_recompile_cues, _read_pending_weights, _sync_native_curves):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    cue_state["dirty"] = False
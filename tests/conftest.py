@@ -10,7 +10,13 @@ bpy_stub = types.ModuleType('bpy')
 bpy_stub.app = types.SimpleNamespace(
     version=(3, 6, 0),
     translations=types.SimpleNamespace(register=lambda *a, **k: None, unregister=lambda *a, **k: None),
-    handlers=types.SimpleNamespace(frame_change_pre=[], depsgraph_update_post=[]),
+    handlers=types.SimpleNamespace(
+        frame_change_pre=[], depsgraph_update_post=[], undo_post=[], redo_post=[], load_post=[],
+        persistent=lambda fn: fn,
+    ),
+    timers=types.SimpleNamespace(
+        register=lambda *a, **k: None, unregister=lambda *a, **k: None, is_registered=lambda *a: False
+    ),
 )
 context_stub = types.SimpleNamespace(
     preferences=types.SimpleNamespace(addons={}),
@@ -51,6 +57,7 @@ sys.modules.setdefault('bpy', bpy_stub)
 sys.modules.setdefault('bpy.props', props_mod)
 mathutils_stub = types.ModuleType('mathutils')
 mathutils_stub.Vector = lambda *a, **kw: None
+mathutils_stub.Matrix = types.SimpleNamespace(Translation=lambda *a, **kw: None)
 sys.modules.setdefault('mathutils', mathutils_stub)
 bx = types.ModuleType('bpy_extras')
 bx.view3d_utils = types.SimpleNamespace(location_3d_to_region_2d=lambda *a, **k: None)
@@ -59,3 +66,8 @@ sys.modules.setdefault('bpy_extras', bx)
 sys.modules.setdefault('bpy_extras.view3d_utils', bx.view3d_utils)
 sys.modules.setdefault('bpy_extras.io_utils', bx.io_utils)
 sys.modules.setdefault('blf', types.ModuleType('blf'))
+sys.modules.setdefault('gpu', types.ModuleType('gpu'))
+gpu_extras = types.ModuleType('gpu_extras')
+gpu_extras.batch = types.SimpleNamespace(batch_for_shader=lambda *a, **k: None)
+sys.modules.setdefault('gpu_extras', gpu_extras)
+sys.modules.setdefault('gpu_extras.batch', gpu_extras.batch)
@@ -0,0 +1,66 @@
+import math
+import os
+import sys
+import wave
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import audio, instances
+from core import signals as core_signals
+
+
+def _write_tone(path, freq, seconds=1.0, rate=8000, width=2, channels=2):
+    t = np.arange(int(rate * seconds)) / rate
+    tone = 0.5 * np.sin(2 * np.pi * freq * t)
+    tone[: rate // 2] = 0.0  # silent first half
+    ints = (tone * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(width)
+        wf.setframerate(rate)
+        wf.writeframes(np.repeat(ints, channels).tobytes())
+
+
+def test_read_and_analyze(tmp_path):
+    path = tmp_path / "tone.wav"
+    _write_tone(path, 100.0)
+    samples, rate = audio.read_wav(path)
+    assert rate == 8000 and len(samples) == 8000
+    data = audio.analyze(samples, rate, 25)
+    assert data.shape == (25, len(audio.BANDS))
+    low, high = audio.BANDS.index("LOW"), audio.BANDS.index("HIGH")
+    assert data[:12, 0].max() == 0.0 and math.isclose(data[20, 0], 1.0, rel_tol=1e-3)
+    assert data[20, low] > 10 * data[20, high]
+
+
+def test_follow_attack_release():
+    env = audio.follow(np.array([0.0, 1.0, 1.0, 0.0, 0.0]), attack=0.0, release=2.0)
+    assert env[1] == 1.0 and env[2] == 1.0
+    assert 0.0 < env[4] < env[3] < 1.0
+
+
+def test_cache_persists_memory_mapped(tmp_path):
+    path = tmp_path / "tone.wav"
+    _write_tone(path, 440.0)
+    cache = audio.AudioCache(tmp_path / "cache")
+    data = cache.wait(str(path), 24.0, timeout=10)
+    assert isinstance(data, np.memmap)
+    files = list((tmp_path / "cache").glob("*.npy"))
+    assert len(files) == 1 and files[0].name == audio.file_key(path, 24.0) + ".npy"
+    fresh = audio.AudioCache(tmp_path / "cache")
+    assert np.array_equal(fresh.wait(str(path), 24.0, timeout=10), data)
+    assert fresh.envelope(str(path), 24.0, "RMS") is not None
+
+
+def test_audio_signal_indexes_envelope():
+    env = np.array([0.0, 0.5, 1.0])
+    params = core_signals.SignalParams(
+        signal_type="AUDIO", start_frame=10, amplitude=2.0, base_value=1.0, envelope=env, audio_key="x"
+    )
+    assert [core_signals.calc_signal(params, f) for f in (9, 10, 11, 12, 13)] == [1.0, 1.0, 2.0, 3.0, 1.0]
+    frames = np.arange(8, 15)
+    assert instances.calc_signal_batch(params, frames).tolist() == [
+        core_signals.calc_signal(params, int(f)) for f in frames
+    ]
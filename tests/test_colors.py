@@ -0,0 +1,40 @@
+import colorsys
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import colors
+
+
+def test_hsv_roundtrip_matches_colorsys():
+    rgb = np.random.default_rng(1).random((64, 3))
+    rgb[0] = (0.5, 0.5, 0.5)
+    hsv = colors.rgb_to_hsv(rgb)
+    for row, expected in zip(hsv, rgb):
+        assert np.allclose(row, colorsys.rgb_to_hsv(*expected))
+    assert np.allclose(colors.hsv_to_rgb(hsv), rgb)
+
+
+def test_palette_is_repeatable_with_seed():
+    a = colors.palette((0.8, 0.2, 0.1), 1000, colors.make_rng(7), "TRIAD")
+    b = colors.palette((0.8, 0.2, 0.1), 1000, colors.make_rng(7), "TRIAD")
+    assert a.shape == (1000, 3)
+    assert np.array_equal(a, b)
+
+
+def test_triad_uses_harmony_hues():
+    base = (0.8, 0.2, 0.1)
+    h = colorsys.rgb_to_hsv(*base)[0]
+    out = colors.palette(base, 200, colors.make_rng(3), "TRIAD", sat_range=0, val_range=0)
+    hues = colors.rgb_to_hsv(out)[:, 0]
+    options = np.array([h, (h + 1 / 3) % 1.0, (h + 2 / 3) % 1.0])
+    assert np.allclose(np.abs(hues[:, None] - options).min(axis=1), 0, atol=1e-9)
+
+
+def test_hue_shift_keeps_saturation_and_value():
+    rgb = np.random.default_rng(2).random((32, 3))
+    out = colors.hue_shift(rgb, 0.2, colors.make_rng(5))
+    assert np.allclose(colors.rgb_to_hsv(out)[:, 1:], colors.rgb_to_hsv(rgb)[:, 1:])
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import cues
+from core import signals as core_signals
+from core.signals import SignalParams
+
+
+def _cue(frame, names, signal_type="SINE", **kw):
+    stacks = {
+        name: [(("LOC_X", ""), SignalParams(signal_type, start_frame=frame + i, **kw), False)]
+        for i, name in enumerate(names)
+    }
+    return cues.CompiledCue(frame, stacks)
+
+
+def test_cue_list_ownership():
+    cl = cues.CueList([_cue(50, ["b"]), _cue(10, ["a", "b"]), _cue(90, [])])
+    assert cl.frames == [10, 50, 90]
+    assert cl.owners_at(0) == {} and cl.active_at(0) == []
+    assert cl.owners_at(10) == {"a": 0, "b": 0}
+    assert cl.owners_at(70) == {"a": 0, "b": 1} and cl.active_at(70) == [0, 1]
+    # an empty cue keeps earlier stacks playing
+    assert cl.owners_at(1000) == {"a": 0, "b": 1}
+    # scrubbing back restores the earlier state
+    assert cl.owners_at(49) == {"a": 0, "b": 0}
+
+
+def test_compiled_cue_evaluate():
+    cue = _cue(10, ["a", "b"], amplitude=2.0, duration=12)
+    noise = cues.CompiledCue(0, {"n": [(("ROT_Z", ""), SignalParams("NOISE", noise_seed=4), False)]})
+    for frame in range(5, 40, 4):
+        expected = [core_signals.calc_signal(p, frame) for p in cue.params]
+        assert np.allclose(cue.evaluate(frame), expected)
+        assert np.isclose(noise.evaluate(frame)[0], core_signals.calc_signal(noise.params[0], frame))
+    beat = cues.CompiledCue(
+        0, {"a": [(("LOC_X", ""), SignalParams("SAWTOOTH", duration=96), True)],
+            "b": [(("LOC_X", ""), SignalParams("SAWTOOTH", duration=96), False)]}
+    )
+    v = beat.evaluate(24, tick=48)
+    assert np.allclose(v, [0.0, -0.5])
+    assert cues.CompiledCue(0, {"a": []}).evaluate(3).size == 0
+
+
+def test_cue_live_rows_follow_set_live():
+    stacks = {"a": [(("LOC_X", ""), SignalParams("LIVE", amplitude=2.0, base_value=1.0), False)]}
+    cue = cues.CompiledCue(0, stacks)
+    assert cue.live_rows == [0]
+    assert cue.evaluate(5).tolist() == [1.0]
+    cue.set_live(0, 0.25)
+    assert cue.evaluate(6).tolist() == [1.5]
@@ -0,0 +1,67 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import deform
+
+
+def test_phase_offsets():
+    co = np.array([[1.0, 2.0, 0.0], [3.0, 4.0, 0.0]])
+    assert deform.phase_offsets("X", co, 2.0).tolist() == [2.0, 6.0]
+    assert deform.phase_offsets("RADIAL", co, 1.0).tolist() == [np.hypot(1, 2), 5.0]
+    assert deform.phase_offsets("GROUP", co, 10.0, np.array([0.5, 1.0])).tolist() == [5.0, 10.0]
+    assert deform.phase_offsets("NONE", co, 10.0).tolist() == [0.0, 0.0]
+
+
+def test_displacement_sums_channels():
+    normals = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 0.0]])
+    out = deform.displacement(normals, [("VTX_NORMAL", np.array([2.0, 3.0])), ("VTX_Y", 1.0)])
+    assert out.tolist() == [[0.0, 1.0, 2.0], [3.0, 1.0, 0.0]]
+
+
+class _KeyBlocks(list):
+    def get(self, name):
+        return next((k for k in self if k.name == name), None)
+
+
+class _Mesh(dict):
+    def __init__(self, names):
+        super().__init__()
+        self.shape_keys = SimpleNamespace(key_blocks=_KeyBlocks(SimpleNamespace(name=n) for n in names))
+
+    def update_tag(self):
+        pass
+
+
+def _clear(mesh):
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    def remove(key):
+        mesh.shape_keys.key_blocks.remove(key)
+        if not mesh.shape_keys.key_blocks:
+            mesh.shape_keys = None
+
+    obj = SimpleNamespace(name="Wave", type='MESH', data=mesh, shape_key_remove=remove)
+    vjlooper.signals.clear_deformer("Wave", SimpleNamespace(objects={"Wave": obj}))
+
+
+def test_clear_deformer_removes_the_basis_it_added():
+    mesh = _Mesh(["Basis", "VJ Wave"])
+    mesh["vj_basis"] = True
+    _clear(mesh)
+    assert mesh.shape_keys is None and "vj_basis" not in mesh
+
+
+def test_clear_deformer_keeps_user_shape_keys():
+    mesh = _Mesh(["Basis", "Smile", "VJ Wave"])
+    mesh["vj_basis"] = True
+    _clear(mesh)
+    assert [k.name for k in mesh.shape_keys.key_blocks] == ["Basis", "Smile"]
+    mesh = _Mesh(["Basis", "VJ Wave"])
+    _clear(mesh)
+    assert [k.name for k in mesh.shape_keys.key_blocks] == ["Basis"]
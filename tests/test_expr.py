@@ -0,0 +1,63 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import expr, instances
+from core import signals as core_signals
+
+
+def test_expression_matches_builtin_wave():
+    frames = np.arange(0, 30)
+    sine = core_signals.SignalParams(signal_type="SINE", duration=12, frequency=2.0, amplitude=1.5)
+    custom = core_signals.SignalParams(
+        signal_type="EXPR", duration=12, frequency=2.0, amplitude=1.5, expression="sin(tau*t)"
+    )
+    for f in frames:
+        assert math.isclose(
+            core_signals.calc_signal(custom, int(f)), core_signals.calc_signal(sine, int(f)), abs_tol=1e-9
+        )
+    assert np.allclose(instances.calc_signal_batch(custom, frames), instances.calc_signal_batch(sine, frames))
+
+
+def test_scalar_and_array_agree():
+    source = "sin(t)*0.5 + noise(t*4, seed)^2 - clamp(cycle/10) + step(5, frame)"
+    t = np.linspace(0, 3, 17)
+    batch = expr.evaluate(source, t, np.arange(17.0), np.arange(17.0) % 4, 3)
+    for i, v in enumerate(batch):
+        assert math.isclose(expr.evaluate(source, float(t[i]), float(i), float(i % 4), 3), v, abs_tol=1e-12)
+
+
+def test_compiled_once_per_source():
+    assert expr.compile_expr("saw(t) * 2") is expr.compile_expr("saw(t) * 2")
+
+
+@pytest.mark.parametrize("source", [
+    '__import__("os")', "t.real", "(lambda: 1)()", "x", "[1]", "1 if t else 2", "'a'", "sin(t, out=t)",
+])
+def test_unsafe_expressions_are_rejected(source):
+    with pytest.raises(expr.ExpressionError):
+        expr.compile_expr(source)
+    assert expr.evaluate(source, 0.5, 1, 1) == 0.0
+
+
+def test_bad_math_evaluates_to_zero():
+    assert expr.evaluate("1/(t-t)", 0.5, 0, 0) == 0.0
+    assert expr.evaluate("9^9^9^9", 0.5, 0, 0) == 0.0
+
+
+def test_complex_result_evaluates_to_zero():
+    assert expr.evaluate("(t-1)^0.5", 0.25, 0, 0) == 0.0
+    params = core_signals.SignalParams(signal_type="EXPR", duration=12, expression="(t-1)^0.5")
+    assert core_signals.calc_signal(params, 3) == 0.0
+    assert np.array_equal(expr.evaluate("(t-1)^0.5", np.array([0.25, 2.0]), 0, 0), [0.0, 1.0])
+
+
+def test_non_finite_result_evaluates_to_zero():
+    assert expr.evaluate("exp(1000*t)", 2.0, 0, 0) == 0.0
+    assert expr.evaluate("log(t-t)", 0.5, 0, 0) == 0.0
+    assert np.array_equal(expr.evaluate("log(t)", np.array([0.0, 1.0]), 0, 0), [0.0, 0.0])
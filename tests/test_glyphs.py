@@ -0,0 +1,78 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import glyphs
+
+
+def test_connected_components_ordered_by_lowest_vertex():
+    # 0-4-2 and 1-3, vertex 5 isolated
+    labels = glyphs.connected_components(6, [(4, 2), (0, 4), (3, 1)])
+    assert labels.tolist() == [0, 1, 0, 1, 0, 2]
+
+
+def test_connected_components_long_chain():
+    n = 5000
+    edges = np.stack([np.arange(n - 1), np.arange(1, n)], axis=1)[::-1]
+    assert glyphs.connected_components(n, edges).max() == 0
+
+
+def test_split_indices_and_loop_ranges():
+    groups = glyphs.split_indices(np.array([1, 0, 1, 2]), 4)
+    assert [g.tolist() for g in groups] == [[1], [0, 2], [3], []]
+    loops = glyphs.loop_ranges(np.array([4, 0]), np.array([3, 4]))
+    assert loops.tolist() == [4, 5, 6, 0, 1, 2, 3]
+
+
+def test_component_centers_and_bounds():
+    co = np.array([[0, 0, 0], [2, 0, 0], [10, 10, 0], [10, 12, 0]], dtype=float)
+    labels = np.array([0, 0, 1, 1])
+    centers = glyphs.component_centers(co, labels, 2)
+    lo, hi = glyphs.component_bounds(co, labels, 2)
+    assert np.allclose(centers, [[1, 0, 0], [10, 11, 0]])
+    assert np.allclose(hi - lo, [[2, 0, 0], [0, 2, 0]])
+
+
+def test_bounds_centers_ignore_vertex_density():
+    co = np.array([[0, 0, 0], [0, 0, 0], [0, 0, 0], [4, 2, 0], [5, 5, 5]], dtype=float)
+    labels = np.array([0, 0, 0, 0, 1])
+    assert np.allclose(glyphs.bounds_centers(co, labels, 2), [[2, 1, 0], [5, 5, 5]])
+
+
+def test_group_pairs_is_transitive_and_order_independent():
+    pairs = [(3, 4), (0, 2), (2, 4)]
+    assert glyphs.group_pairs(6, pairs) == [[0, 2, 3, 4], [1], [5]]
+    assert glyphs.group_pairs(6, reversed(pairs)) == [[0, 2, 3, 4], [1], [5]]
+
+
+def test_range_pairs_matches_brute_force():
+    pts = np.random.default_rng(0).random((200, 3)) * 10
+    found = set(glyphs.range_pairs(pts, 0.8))
+    d = np.linalg.norm(pts[:, None] - pts[None], axis=2)
+    expected = {(i, j) for i, j in zip(*np.nonzero(d <= 0.8)) if i < j}
+    assert found == expected
+
+
+def test_mesh_fingerprint_ignores_tiny_noise():
+    co = np.random.default_rng(3).random((10, 3))
+    edges = np.array([[0, 1], [1, 2]])
+    loops = np.array([0, 1, 2])
+    a = glyphs.mesh_fingerprint(co, edges, loops, [3], [0])
+    b = glyphs.mesh_fingerprint(co + 1e-8, edges, loops, [3], [0])
+    c = glyphs.mesh_fingerprint(co, edges, loops, [3], [1])
+    assert a == b
+    assert a != c
+
+
+def test_mesh_fingerprint_tells_shading_and_uvs_apart():
+    co = np.random.default_rng(4).random((3, 3))
+    args = (co, np.empty((0, 2)), np.array([0, 1, 2]), [3], [0])
+    uv = np.array([[0, 0], [1, 0], [0, 1]], dtype=float)
+    flat = glyphs.mesh_fingerprint(*args, [False], {"UVMap": uv})
+    assert flat == glyphs.mesh_fingerprint(*args, [False], {"UVMap": uv + 1e-8})
+    assert flat != glyphs.mesh_fingerprint(*args, [True], {"UVMap": uv})
+    assert flat != glyphs.mesh_fingerprint(*args, [False], {"UVMap": uv[::-1]})
+    assert flat != glyphs.mesh_fingerprint(*args, [False])
@@ -0,0 +1,53 @@
+import math
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import instances
+from core import signals as core_signals
+
+
+def test_batch_matches_calc_signal():
+    frames = np.arange(-5, 80)
+    for kind in ("SINE", "COSINE", "SQUARE", "TRIANGLE", "SAWTOOTH", "NOISE", "RAMP"):
+        params = core_signals.SignalParams(
+            signal_type=kind, duration=16, frequency=1.5, amplitude=2.0, start_frame=3,
+            base_value=0.5, loop_count=3, use_clamp=True, clamp_min=-1.0, clamp_max=2.0,
+        )
+        batch = instances.calc_signal_batch(params, frames)
+        for f, v in zip(frames, batch):
+            assert math.isclose(v, core_signals.calc_signal(params, int(f)), abs_tol=1e-9), (kind, f)
+
+
+def test_noise_batch_is_vectorized():
+    from core import noise
+
+    seeds = np.arange(-50000, 50000, dtype=np.int64)
+    values = noise.noise_value(seeds)
+    assert values.shape == seeds.shape and values.min() >= -1.0 and values.max() < 1.0
+    assert abs(values.mean()) < 0.02 and len(np.unique(values)) > 99000
+    assert all(values[i] == noise.noise_value(int(seeds[i])) for i in (0, 777, 50000, 99999))
+
+
+def test_batch_loop_lock_blend():
+    params = core_signals.SignalParams(signal_type="NOISE", duration=12, blend_frames=4, noise_seed=7)
+    frames = np.arange(0, 40)
+    batch = instances.calc_signal_batch(params, frames, loop_lock=True)
+    expected = [core_signals.calc_signal(params, int(f), loop_lock=True) for f in frames]
+    assert np.allclose(batch, expected)
+
+
+def test_offsets_and_compose():
+    rest = instances.grid_positions(4, 2, 2.0)
+    assert rest.tolist()[3] == [2.0, 2.0, 0.0]
+    assert instances.instance_offsets("LINEAR", rest, step=3).tolist() == [0, 3, 6, 9]
+    assert instances.instance_offsets("RADIAL", rest, radial_factor=1.0).tolist() == [0, 2, 2, 2]
+    loc, rot, scl = instances.compose_transforms(
+        rest, [("LOC_Z", np.ones(4)), ("SCL_ALL", np.full(4, 2.0)), ("SCL_X", np.full(4, 3.0))]
+    )
+    assert loc[:, 2].tolist() == [1.0] * 4 and loc[1, 0] == 2.0
+    assert scl[0].tolist() == [3.0, 2.0, 2.0]
+    assert not rot.any()
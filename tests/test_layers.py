@@ -0,0 +1,77 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import layers
+
+
+def test_mute_hides_layer():
+    flt = layers.LayerFilter([("drums", True, False), ("ambient", False, False)])
+    assert not flt.plays("drums")
+    assert flt.plays("ambient")
+    assert flt.plays("")
+    # layers that were never defined behave like unassigned items
+    assert flt.plays("other")
+
+
+def test_solo_overrides_mute():
+    flt = layers.LayerFilter([("drums", True, True), ("ambient", False, False), ("bass", False, True)])
+    assert flt.plays("drums") and flt.plays("bass")
+    assert not flt.plays("ambient")
+    assert not flt.plays("")
+
+
+def test_active_indices():
+    flt = layers.LayerFilter([("drums", True, False)])
+    items = [
+        (True, False, ""),
+        (False, False, ""),
+        (True, True, ""),
+        (True, False, "drums"),
+        (True, False, "ambient"),
+    ]
+    assert layers.active_indices(items, flt) == [0, 4]
+    assert layers.active_indices(items, layers.LayerFilter()) == [0, 3, 4]
+    assert layers.active_indices([], flt) == []
+
+
+class _Layer(dict):
+    def __init__(self, scene, name):
+        super().__init__(name=name, vj_name=name)
+        self.id_data = scene
+
+    def __getattr__(self, key):
+        return self[key]
+
+    def as_pointer(self):
+        return id(self)
+
+
+def _rename(layer, name):
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    layer["name"] = name
+    vjlooper.signals.rename_layer(layer)
+
+
+def test_renaming_a_layer_moves_its_items():
+    from types import SimpleNamespace
+
+    item = _Layer(None, "")
+    item["layer"] = "drums"
+    stack_item = _Layer(None, "")
+    stack_item["layer"] = "drums"
+    scene = SimpleNamespace(
+        objects=[SimpleNamespace(signal_items=[item])],
+        vj_stacks=[SimpleNamespace(items=[stack_item])],
+    )
+    drums, bass = _Layer(scene, "drums"), _Layer(scene, "bass")
+    scene.vj_layers = [drums, bass]
+    _rename(drums, "beats")
+    assert item.layer == stack_item.layer == "beats"
+    _rename(drums, "bass")
+    assert drums.name == "beats" and item.layer == "beats"
+    _rename(drums, "")
+    assert drums.name == "beats"
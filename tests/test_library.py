@@ -0,0 +1,47 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import library
+
+
+def test_index_lookup_and_find(tmp_path):
+    path = tmp_path / "fx.blend"
+    path.write_bytes(b"x")
+    index = library.AssetIndex()
+    assert index.lookup(path) is None
+    index.store(path, ["TunnelFX_CYL"])
+    assert index.lookup(path) == ["TunnelFX_CYL"]
+    assert index.find("TunnelFX_CYL") == path
+    assert index.find("Other") is None
+
+
+def test_index_goes_stale_when_file_changes(tmp_path):
+    path = tmp_path / "fx.blend"
+    path.write_bytes(b"x")
+    index = library.AssetIndex()
+    index.store(path, ["TunnelFX_CYL"])
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert index.lookup(path) is None
+    assert index.find("TunnelFX_CYL") is None
+
+
+def test_index_persists_to_json(tmp_path):
+    path = tmp_path / "fx.blend"
+    path.write_bytes(b"x")
+    store = tmp_path / "data" / "asset_index.json"
+    library.AssetIndex(store).store(path, ["TunnelFX_CYL"])
+    assert store.exists()
+    index = library.AssetIndex(store)
+    assert index.lookup(path) == ["TunnelFX_CYL"]
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert library.AssetIndex(store).find("TunnelFX_CYL") is None
+
+
+def test_index_ignores_corrupt_json(tmp_path):
+    store = tmp_path / "asset_index.json"
+    store.write_text("{not json")
+    assert library.AssetIndex(store).find("TunnelFX_CYL") is None
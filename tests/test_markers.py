@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import instances, markers
+from core import signals as core_signals
+
+
+MARKERS = [("kick.001", 40), ("snare", 12), ("kick", 10), ("Kick.002", 70), ("kick.003", 40)]
+
+
+def test_matching_frames():
+    assert markers.matching_frames(MARKERS, "kick*") == [10.0, 40.0]
+    assert markers.matching_frames(MARKERS, "kick*, snare") == [10.0, 12.0, 40.0]
+    assert markers.matching_frames(MARKERS, "") == [10.0, 12.0, 40.0, 70.0]
+    assert markers.matching_frames(MARKERS, "hat") == []
+
+
+def test_shapes_keep_endpoints():
+    for shape in core_signals.ADSR_SHAPES:
+        assert core_signals.shape_progress(0.0, shape) == 0.0
+        assert core_signals.shape_progress(1.0, shape) == 1.0
+    assert core_signals.shape_progress(0.5, "EASE_IN") < 0.5 < core_signals.shape_progress(0.5, "EASE_OUT")
+
+
+def test_marker_triggered_adsr_matches_batch():
+    on = markers.matching_frames(MARKERS, "kick*")
+    frames = np.arange(0, 90)
+    for shape in core_signals.ADSR_SHAPES:
+        params = core_signals.SignalParams(
+            "ADSR", duration=8, adsr=(3.0, 5.0, 0.4, 6.0), adsr_shape=shape, triggers=(on, None, None)
+        )
+        scalar = [core_signals.calc_signal(params, int(f)) for f in frames]
+        assert np.allclose(instances.calc_signal_batch(params, frames), scalar), shape
+        # gate lasts duration frames after each hit, then releases to silence
+        assert scalar[9] == 0.0 and scalar[13] == 1.0 and np.isclose(scalar[18], 0.4)
+        assert scalar[24] == 0.0 and scalar[43] == 1.0
+    empty = core_signals.SignalParams("ADSR", base_value=2.0, triggers=([], None, None))
+    assert core_signals.calc_signal(empty, 50) == 2.0
+    assert instances.calc_signal_batch(empty, frames).tolist() == [2.0] * len(frames)
@@ -0,0 +1,117 @@
+import math
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import instances, midi
+from core import signals as core_signals
+
+
+def _track(events):
+    body = b"".join(events) + b"\x00\xff\x2f\x00"
+    return b"MTrk" + len(body).to_bytes(4, "big") + body
+
+
+def _smf(*tracks, division=96):
+    header = b"MThd" + (6).to_bytes(4, "big") + (1).to_bytes(2, "big")
+    header += len(tracks).to_bytes(2, "big") + division.to_bytes(2, "big")
+    return header + b"".join(_track(t) for t in tracks)
+
+
+def _song():
+    tempo = [
+        b"\x00\xff\x51\x03" + (500000).to_bytes(3, "big"),
+        b"\x81\x40\xff\x51\x03" + (250000).to_bytes(3, "big"),  # 240 bpm at tick 192
+    ]
+    notes = [
+        b"\x00\x90\x3c\x7f",  # C4 on
+        b"\x60\x3c\x00",  # running status note-on with velocity 0 = off
+        b"\x00\xb0\x40\x7f",  # sustain pedal down
+        b"\x60\x90\x3e\x40",  # D4 on at tick 192
+        b"\x00\xb0\x40\x00",
+        b"\x60\x80\x3e\x00",  # D4 off at tick 288
+        b"\x00\xf0\x02\x7e\xf7",  # sysex is skipped
+    ]
+    return _smf(tempo, notes)
+
+
+def test_parse_running_status_and_tempo():
+    song = midi.parse_midi(_song())
+    kinds = [(e[0], e[1]) for e in song.events]
+    assert (96, "NOTE_OFF") in kinds and (192, "NOTE_ON") in kinds
+    secs = midi.ticks_to_seconds(song, [0, 96, 192, 288])
+    # 120 bpm until tick 192, then 240 bpm
+    assert np.allclose(secs, [0.0, 0.5, 1.0, 1.25])
+
+
+def test_build_lanes():
+    lanes = midi.build_lanes(midi.parse_midi(_song()), 24)
+    assert set(lanes) == {"NOTE 1:60", "NOTE 1:62", "NOTE 1:ALL", "CC 1:64"}
+    c4 = lanes["NOTE 1:60"]
+    assert c4.on.tolist() == [0.0] and c4.off.tolist() == [12.0] and c4.velocity[0] == 1.0
+    assert lanes["NOTE 1:62"].off.tolist() == [30.0]
+    assert lanes["NOTE 1:ALL"].on.tolist() == [0.0, 24.0]
+    assert lanes["CC 1:64"].on.tolist() == [12.0] and lanes["CC 1:64"].off.tolist() == [24.0]
+    assert lanes["NOTE 1:ALL"].last(23.9) == 0 and lanes["NOTE 1:ALL"].last(-1) == -1
+    assert midi.lane_label("NOTE 1:60") == "Ch 1 C4"
+
+
+def test_lane_number_is_stable():
+    keys = ["NOTE 1:60", "NOTE 1:ALL", "CC 2:64", "NOTE 10:36"]
+    numbers = [midi.lane_number(k) for k in keys]
+    assert numbers == [midi.lane_number(k) for k in reversed(keys)][::-1]
+    assert len(set(numbers)) == len(keys)
+    assert all(2 <= n < 2 ** 31 for n in numbers)
+
+
+def test_parse_rejects_garbage():
+    for data in (b"RIFF0000", _song()[:30]):
+        try:
+            midi.parse_midi(data)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_adsr_level():
+    a, d, s, r = 2.0, 4.0, 0.5, 10.0
+    assert core_signals.adsr_level(-1, 20, a, d, s, r) == 0.0
+    assert core_signals.adsr_level(1, 20, a, d, s, r) == 0.5
+    assert core_signals.adsr_level(4, 20, a, d, s, r) == 0.75
+    assert core_signals.adsr_level(20, 20, a, d, s, r) == 0.5
+    assert core_signals.adsr_level(25, 20, a, d, s, r) == 0.25
+    assert core_signals.adsr_level(40, 20, a, d, s, r) == 0.0
+    # released during the attack fades from the level reached
+    assert core_signals.adsr_level(6, 1, a, d, s, r) == 0.5 * 0.5
+    assert core_signals.adsr_level(1, 10, 0.0, 0.0, 0.3, 0.0) == 0.3
+
+
+def test_triggered_signals_match_batch():
+    lane = midi.build_lanes(midi.parse_midi(_song()), 24)["NOTE 1:ALL"]
+    frames = np.arange(-5, 60)
+    for kind in ("ADSR", "SINE", "RAMP", "NOISE"):
+        params = core_signals.SignalParams(
+            kind, amplitude=2.0, base_value=1.0, duration=10, offset=3, triggers=lane.as_tuple()
+        )
+        scalar = [core_signals.calc_signal(params, int(f)) for f in frames]
+        assert np.allclose(instances.calc_signal_batch(params, frames), scalar), kind
+        assert scalar[0] == 1.0
+    adsr = core_signals.SignalParams("ADSR", triggers=lane.as_tuple(), adsr=(2.0, 4.0, 0.5, 10.0))
+    # the second note has half velocity and restarts the envelope
+    assert math.isclose(core_signals.calc_signal(adsr, 26), 64 / 127)
+    assert core_signals.calc_signal(adsr, 23) < core_signals.calc_signal(adsr, 26)
+    ramp = core_signals.SignalParams("RAMP", duration=4, triggers=lane.as_tuple())
+    assert core_signals.calc_signal(ramp, 24) == 0.0 and core_signals.calc_signal(ramp, 28) == 1.0
+
+
+def test_adsr_without_triggers_is_one_shot():
+    params = core_signals.SignalParams("ADSR", duration=10, start_frame=5, adsr=(2.0, 2.0, 0.5, 4.0))
+    values = [core_signals.calc_signal(params, f) for f in range(0, 25)]
+    assert values[5] == 0.0 and values[7] == 1.0 and values[15] == 0.5 and values[19] == 0.0
+    assert np.allclose(instances.calc_signal_batch(params, np.arange(25)), values)
+    cycle = core_signals.sample_cycle(params, 15)
+    assert cycle[0] == 0.0 and max(cycle) == 1.0 and cycle[-1] == 0.0
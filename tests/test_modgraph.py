@@ -0,0 +1,70 @@
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import modgraph
+from core import signals as core_signals
+from core.modgraph import ModGraph, Route
+
+
+def test_order_puts_sources_first():
+    routes = [Route("b", "c", "amplitude"), Route("a", "b", "frequency"), Route("lfo", "c", "base_value")]
+    order = modgraph.topological_order(routes)
+    assert order.index("a") < order.index("b") < order.index("c")
+    assert order.index("lfo") < order.index("c")
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(modgraph.CycleError):
+        ModGraph([Route("a", "b", "amplitude"), Route("b", "a", "amplitude")])
+
+
+def test_shared_source_is_evaluated_once_per_frame():
+    lfo = core_signals.SignalParams(signal_type="SINE", duration=8)
+    target = core_signals.SignalParams(signal_type="SQUARE", duration=4, amplitude=1.0)
+    calls = []
+
+    def params_for(key):
+        calls.append(key)
+        return lfo if key == "lfo" else target
+
+    graph = ModGraph([Route("lfo", f"obj{i}", "amplitude", 0.5) for i in range(200)])
+    values = graph.evaluate(2, params_for)
+    assert calls.count("lfo") == 1 and len(calls) == 201
+    expected = core_signals.calc_signal(
+        modgraph.modulate(target, [("amplitude", 0.5 * core_signals.calc_signal(lfo, 2))]), 2
+    )
+    assert math.isclose(values["obj7"], expected)
+    assert graph.evaluate(2, params_for) is values and len(calls) == 201
+    graph.evaluate(3, params_for)
+    assert len(calls) == 402
+
+
+def test_modulate_ignores_unknown_params():
+    params = core_signals.SignalParams(signal_type="SINE", amplitude=1.0)
+    out = modgraph.modulate(params, [("amplitude", 0.5), ("amplitude", 0.25), ("duration", 9)])
+    assert out.amplitude == 1.75 and out.duration == params.duration
+
+
+def test_item_edits_clear_the_frame_memo():
+    from types import SimpleNamespace
+
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    lfo = core_signals.SignalParams(signal_type="SINE", duration=8, amplitude=1.0)
+    params = {"lfo": lfo, "obj": core_signals.SignalParams(signal_type="SQUARE", duration=4)}
+    graph = ModGraph([Route("lfo", "obj", "amplitude")])
+    first = graph.evaluate(2, params.get)["obj"]
+    params["lfo"] = core_signals.SignalParams(signal_type="SINE", duration=8, amplitude=3.0)
+    assert graph.evaluate(2, params.get)["obj"] == first
+    vjlooper.signals.mod_state["graph"] = graph
+    try:
+        vjlooper.signals.update_item(SimpleNamespace())
+    finally:
+        vjlooper.signals.mod_state["graph"] = None
+    assert graph.evaluate(2, params.get)["obj"] != first
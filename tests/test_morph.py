@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import morph
+from core import signals as core_signals
+from core.signals import SignalParams
+
+
+def test_evaluate_rows_matches_calc_signal():
+    rows = [
+        SignalParams("SINE", amplitude=2.0, frequency=1.5, duration=20, start_frame=3, phase_offset=30),
+        SignalParams("SQUARE", base_value=1.0, loop_count=2, duration=10),
+        SignalParams("TRIANGLE", use_clamp=True, clamp_min=-0.5, clamp_max=0.5),
+        SignalParams("SAWTOOTH", frequency=2.0, offset=5),
+        SignalParams("RAMP", amplitude=3.0, duration=12, start_frame=4),
+        SignalParams("COSINE", frequency=1.3, duration=16),
+    ]
+    table = morph.ParamTable.from_params(rows)
+    for loop_lock in (False, True):
+        for frame in range(-2, 50, 3):
+            expected = [core_signals.calc_signal(p, frame, loop_lock=loop_lock) for p in rows]
+            got = morph.evaluate_rows(table, np.full(len(rows), frame), loop_lock)
+            assert np.allclose(got, expected), (frame, loop_lock)
+
+
+def test_morph_interpolates_and_crossfades():
+    sources = [
+        SignalParams("SINE", amplitude=1.0, frequency=1.0),
+        SignalParams("SINE", amplitude=1.0),
+        SignalParams("NOISE", noise_seed=3),
+        None,
+    ]
+    targets = [
+        SignalParams("SINE", amplitude=3.0, frequency=2.0),
+        SignalParams("SQUARE", amplitude=2.0),
+        None,
+        SignalParams("COSINE", base_value=5.0),
+    ]
+    m = morph.Morph(sources, targets, rest=[0.0, 0.0, 0.0, 1.0], start=10, length=20)
+    assert m.interpolated.tolist() == [True, False, False, False]
+    start = m.evaluate(10)
+    assert np.allclose(start, [core_signals.calc_signal(sources[0], 10), core_signals.calc_signal(sources[1], 10),
+                               core_signals.calc_signal(sources[2], 10), 1.0])
+    end = m.evaluate(30)
+    assert np.allclose(end, [core_signals.calc_signal(targets[0], 30), core_signals.calc_signal(targets[1], 30),
+                             0.0, core_signals.calc_signal(targets[3], 30)])
+    assert m.done(30) and not m.done(29)
+    halfway = m.evaluate(20)
+    mixed = SignalParams("SINE", amplitude=2.0, frequency=1.5)
+    assert np.isclose(halfway[0], core_signals.calc_signal(mixed, 20))
+    a, b = core_signals.calc_signal(sources[1], 20), core_signals.calc_signal(targets[1], 20)
+    assert np.isclose(halfway[1], (a + b) / 2)
+
+
+def test_morph_keeps_separate_clocks():
+    src = SignalParams("SAWTOOTH", duration=10)
+    m = morph.Morph([src], [src], [0.0], start=0, length=10, same_clock=[False])
+    assert not m.interpolated.any()
+    v = m.evaluate(5, times_a=[5.0], times_b=[7.0])
+    expected = (core_signals.calc_signal(src, 5) + core_signals.calc_signal(src, 7)) / 2
+    assert np.isclose(v[0], expected)
+
+
+def test_pair_rows():
+    pairs = morph.pair_rows(["LOC_X", "ROT_Z", "LOC_X"], ["SCL_ALL", "LOC_X"])
+    assert pairs == [("LOC_X", 2, 1), ("ROT_Z", 1, None), ("SCL_ALL", None, 0)]
@@ -0,0 +1,145 @@
+import math
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import native
+from core import signals as core_signals
+
+
+def test_lut_matches_calc_signal_on_frames():
+    params = core_signals.SignalParams(
+        signal_type="SINE", duration=24, amplitude=2.0, frequency=2.0,
+        start_frame=5, offset=1, base_value=0.5, loop_count=2,
+    )
+    lut = native.bake_lut(params)
+    assert lut is not None and len(lut.values) == 25
+    for frame in range(0, 70):
+        assert math.isclose(lut.value(frame), core_signals.calc_signal(params, frame), abs_tol=1e-9)
+
+
+def test_lut_downsamples_long_cycles():
+    params = core_signals.SignalParams(signal_type="TRIANGLE", duration=128)
+    lut = native.bake_lut(params, samples=65)
+    assert len(lut.values) == 65
+    assert math.isclose(lut.value(64), core_signals.calc_signal(params, 64), abs_tol=1e-9)
+
+
+def test_unsupported_signals_are_not_baked():
+    assert native.bake_lut(core_signals.SignalParams(signal_type="NOISE")) is None
+    assert native.bake_lut(core_signals.SignalParams(signal_type="SINE", smoothing=0.5)) is None
+    assert native.bake_lut(core_signals.SignalParams(signal_type="NOISE"), loop_lock=True) is not None
+
+
+def _check_plan(params, loop_lock=False):
+    plan = native.plan_curve(params, loop_lock=loop_lock)
+    assert plan is not None and plan.exact
+    for frame in range(-10, 130):
+        expected = core_signals.calc_signal(params, frame, loop_lock=loop_lock)
+        assert math.isclose(plan.value(frame), expected, abs_tol=1e-9), frame
+    return plan
+
+
+def test_whole_cycle_sine_uses_function_modifier():
+    plan = _check_plan(core_signals.SignalParams(
+        signal_type="SINE", duration=20, frequency=3.0, amplitude=1.5, phase_offset=30.0,
+        start_frame=4, base_value=1.0, loop_count=3, use_clamp=True, clamp_min=0.0, clamp_max=2.0,
+    ))
+    assert [m.type for m in plan.modifiers] == ["FNGENERATOR", "LIMITS", "GENERATOR", "GENERATOR"]
+    assert len(plan.keys) == 1
+
+
+def test_other_waves_are_keyed_and_cycled():
+    for kind in ("SQUARE", "TRIANGLE", "SAWTOOTH", "COSINE"):
+        plan = _check_plan(core_signals.SignalParams(
+            signal_type=kind, duration=12, frequency=1.5, start_frame=3, offset=2, base_value=0.2,
+        ))
+        assert plan.modifiers[0].type == "CYCLES"
+        assert len(plan.keys) == 13
+    _check_plan(core_signals.SignalParams(signal_type="NOISE", duration=8, noise_seed=4), loop_lock=True)
+    _check_plan(core_signals.SignalParams(
+        signal_type="SINE", duration=10, blend_frames=3, loop_count=2,
+    ), loop_lock=True)
+
+
+def test_planning_leaves_smoothing_cache_alone():
+    core_signals.smoothing_cache.clear()
+    native.plan_curve(core_signals.SignalParams(signal_type="SQUARE", duration=12))
+    assert core_signals.smoothing_cache == {}
+
+
+def test_ramp_and_fallbacks():
+    plan = _check_plan(core_signals.SignalParams(signal_type="RAMP", duration=10, start_frame=5, amplitude=2.0))
+    assert plan.modifiers == []
+    assert native.plan_curve(core_signals.SignalParams(signal_type="SINE", smoothing=0.3)) is None
+    noise = core_signals.SignalParams(signal_type="NOISE")
+    assert native.plan_curve(noise) is None
+    approx = native.plan_curve(noise, approximate=True)
+    assert not approx.exact and approx.modifiers[1].type == "NOISE"
+
+
+def test_modulated_items_stay_on_the_handler():
+    from types import SimpleNamespace
+
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    def item(name, channel, routes=()):
+        return SimpleNamespace(
+            name=name, channel=channel, enabled=True, native=False, layer="", signal_type="SINE",
+            trigger_source="NONE", mod_routes=list(routes), time_unit="FRAMES",
+        )
+
+    route = SimpleNamespace(source_kind="ITEM", source_name="Lfo", param="amplitude", depth=1.0)
+    obj = SimpleNamespace(
+        name="Cube", modifiers=[], animation_data=None,
+        signal_items=[item("Wobble", "LOC_X", [route]), item("Lfo", "LOC_Y")],
+    )
+    obj.animation_data_create = lambda: SimpleNamespace(action=None)
+    compiled, approximated, skipped = vjlooper.operators.compile_native(
+        obj, mod_sources={("Cube", "Lfo")}
+    )
+    assert compiled == approximated == []
+    assert skipped == ["Wobble", "Lfo"]
+    assert not any(it.native for it in obj.signal_items)
+
+
+def test_native_curves_follow_layers_and_shadowed_items_are_skipped(monkeypatch):
+    from types import SimpleNamespace
+
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    signals = vjlooper.signals
+
+    def item(name, channel, layer="", native=False):
+        return SimpleNamespace(
+            name=name, channel=channel, enabled=True, native=native, layer=layer, signal_type="EXPR",
+            trigger_source="NONE", mod_routes=[], time_unit="FRAMES",
+        )
+
+    obj = SimpleNamespace(
+        name="Cube", modifiers=[], animation_data=None,
+        signal_items=[item("Under", "LOC_X"), item("Over", "LOC_X")],
+    )
+    obj.animation_data_create = lambda: SimpleNamespace(action=None)
+    _, _, skipped = vjlooper.operators.compile_native(obj)
+    assert skipped == ["Under", "Over"] and not any(it.native for it in obj.signal_items)
+
+    group = SimpleNamespace(name=signals.NATIVE_GROUP)
+    curves = [
+        SimpleNamespace(data_path="location", array_index=0, group=group, mute=False),
+        SimpleNamespace(data_path="rotation_euler", array_index=2, group=group, mute=False),
+    ]
+    obj.signal_items = [item("Move", "LOC_X", "drums", True), item("Spin", "ROT_Z", "", True)]
+    obj.animation_data = SimpleNamespace(action=SimpleNamespace(fcurves=curves))
+    scene = SimpleNamespace(
+        objects=[obj], vj_layers=[SimpleNamespace(name="drums", mute=True, solo=False)]
+    )
+    monkeypatch.setattr(signals.bpy.context, "scene", scene)
+    signals._sync_native_curves()
+    assert [fc.mute for fc in curves] == [True, False]
+    scene.vj_layers[0].mute = False
+    signals._sync_native_curves()
+    assert [fc.mute for fc in curves] == [False, False]
@@ -0,0 +1,123 @@
+import math
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import instances, osc
+from core import signals as core_signals
+
+
+def test_encode_decode_roundtrip():
+    data = osc.encode_message("/fader/1", 0.5, 3, True, "go")
+    assert len(data) % 4 == 0
+    assert osc.decode_message(data) == ("/fader/1", [0.5, 3, True, "go"])
+    bundle = osc.encode_bundle(osc.encode_message("/a", 1.0), osc.encode_bundle(osc.encode_message("/b", 2)))
+    assert list(osc.decode_packet(bundle)) == [("/a", [1.0]), ("/b", [2])]
+
+
+def test_decode_rejects_garbage():
+    for data in (b"no slash\x00\x00\x00\x00", osc.encode_message("/x", 1.0)[:-2]):
+        try:
+            osc.decode_message(data)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_deeply_nested_bundles_are_dropped():
+    packet = osc.encode_message("/deep", 1.0)
+    for _ in range(osc.MAX_BUNDLE_DEPTH):
+        packet = osc.encode_bundle(packet)
+    assert list(osc.decode_packet(packet)) == [("/deep", [1.0])]
+    packet = osc.encode_bundle(packet)
+    try:
+        list(osc.decode_packet(packet))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    for _ in range(2000):
+        packet = osc.encode_bundle(packet)
+    listener = osc.OscListener()
+    listener.feed(packet)
+    assert listener.stats()["dropped"] == 1 and not listener.buffers
+
+
+def test_ring_buffer_wraps():
+    buf = osc.RingBuffer(size=3, width=2)
+    assert buf.latest(default=-1.0) == -1.0
+    for i in range(5):
+        buf.push([float(i)])
+    assert len(buf) == 3 and buf.latest() == 4.0
+    assert math.isnan(buf.rows[0, 1]) and buf.latest(1, default=7.0) == 7.0
+    assert buf.history().tolist() == [2.0, 3.0, 4.0]
+
+
+def test_listener_counts_drops():
+    listener = osc.OscListener(max_addresses=1)
+    listener.feed(osc.encode_message("/a", 0.25))
+    listener.feed(osc.encode_message("/b", 1.0))  # over the address limit
+    listener.feed(osc.encode_message("/a", "text"))  # nothing numeric
+    listener.feed(b"\x00garbage")
+    st = listener.stats()
+    assert st["packets"] == 4 and st["messages"] == 1 and st["dropped"] == 3
+    assert listener.latest("/a") == 0.25 and listener.latest("/b", default=-1.0) == -1.0
+
+
+def test_listener_receives_udp():
+    listener = osc.OscListener(host="127.0.0.1", port=0)
+    listener.start()
+    try:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for v in (0.1, 0.2, 0.75):
+            sender.sendto(osc.encode_message("/vj/1", v, 2.0), ("127.0.0.1", listener.port))
+        sender.close()
+        deadline = time.monotonic() + 2.0
+        while listener.messages < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert listener.messages == 3
+        assert np.isclose(listener.latest("/vj/1"), 0.75) and listener.latest("/vj/1", 1) == 2.0
+        assert listener.stats()["us_per_packet"] > 0
+    finally:
+        listener.stop()
+    assert not listener.running
+
+
+def test_listener_survives_unexpected_errors(monkeypatch):
+    listener = osc.OscListener(host="127.0.0.1", port=0)
+    real_feed = listener.feed
+
+    def feed(data):
+        if b"/boom" in data:
+            raise RuntimeError("boom")
+        real_feed(data)
+
+    monkeypatch.setattr(listener, "feed", feed)
+    listener.start()
+    try:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.sendto(osc.encode_message("/boom", 1.0), ("127.0.0.1", listener.port))
+        sender.sendto(osc.encode_message("/ok", 1.0), ("127.0.0.1", listener.port))
+        sender.close()
+        deadline = time.monotonic() + 2.0
+        while listener.messages < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert listener.running and listener.messages == 1
+        assert listener.dropped == 1 and listener.error == "boom"
+    finally:
+        listener.stop()
+
+
+def test_live_signal_value():
+    params = core_signals.SignalParams("LIVE", amplitude=2.0, base_value=1.0, live_value=0.5)
+    assert core_signals.calc_signal(params, 10) == 2.0
+    assert instances.calc_signal_batch(params, [0, 5]).tolist() == [2.0, 2.0]
+    assert core_signals.sample_cycle(params, 4) == [2.0] * 4
+    # new values do not invalidate cached previews
+    assert params == core_signals.SignalParams("LIVE", amplitude=2.0, base_value=1.0)
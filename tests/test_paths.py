@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core.paths import PathTarget, split_data_path
+
+
+def test_split_attribute_paths():
+    assert split_data_path("data.energy") == PathTarget("data", "energy", None, None)
+    assert split_data_path("hide_render") == PathTarget("", "hide_render", None, None)
+    assert split_data_path("data.color[2]") == PathTarget("data", "color", None, 2)
+
+
+def test_split_nested_and_keyed_paths():
+    path = 'material_slots[0].material.node_tree.nodes["Emission"].inputs[1].default_value'
+    assert split_data_path(path) == PathTarget(
+        'material_slots[0].material.node_tree.nodes["Emission"].inputs[1]', "default_value", None, None
+    )
+    assert split_data_path('modifiers["GN"]["Socket_2"]') == PathTarget('modifiers["GN"]', None, "Socket_2", None)
+
+
+def test_invalid_paths():
+    for bad in ("", "data.", "[0]"):
+        with pytest.raises(ValueError):
+            split_data_path(bad)
+
+
+class _Struct:
+    def __init__(self, **props):
+        self.__dict__.update(props)
+
+    def as_pointer(self):
+        return id(self)
+
+    def path_resolve(self, path):
+        value = self
+        for step in path.split("."):
+            value = getattr(value, step)
+        return value
+
+
+def test_cached_path_follows_swapped_owner_after_update():
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import vjlooper
+
+    signals = vjlooper.signals
+    old, new = _Struct(energy=1.0), _Struct(energy=1.0)
+    obj = _Struct(name="Lamp", data=old)
+    signals.invalidate_paths()
+    signals.set_channel(obj, "DATA_PATH", 5.0, "data.energy")
+    obj.data = new
+    # resolved once, so the swap only shows after the depsgraph reports it
+    signals.set_channel(obj, "DATA_PATH", 6.0, "data.energy")
+    assert old.energy == 6.0
+    depsgraph = _Struct(id_type_updated=lambda t: t == 'OBJECT')
+    signals.watch_path_owners(None, depsgraph)
+    signals.set_channel(obj, "DATA_PATH", 7.0, "data.energy")
+    assert old.energy == 6.0 and new.energy == 7.0
+    signals.invalidate_paths()
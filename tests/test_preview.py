@@ -0,0 +1,55 @@
+import math
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import preview
+from core import signals as core_signals
+
+
+def test_cache_reuses_until_params_change():
+    cache = preview.PreviewCache(samples=16)
+    params = core_signals.SignalParams(signal_type="SINE", duration=24)
+    first = cache.get("a", params, "Anim")
+    assert cache.get("a", core_signals.SignalParams(signal_type="SINE", duration=24), "Anim") is first
+    changed = cache.get("a", core_signals.SignalParams(signal_type="SINE", duration=12), "Anim")
+    assert changed is not first
+    assert len(changed.points) == 16
+    assert changed.summary.startswith("Anim: SINE")
+
+
+def test_sample_cycle_matches_calc_signal():
+    params = core_signals.SignalParams(signal_type="TRIANGLE", duration=4, amplitude=2.0)
+    values = core_signals.sample_cycle(params, 5)
+    for frame, v in enumerate(values[:-1]):
+        assert math.isclose(v, core_signals.calc_signal(params, frame), abs_tol=1e-9)
+
+
+def test_cursor_follows_frame_and_prune():
+    cache = preview.PreviewCache(samples=8, width=70.0)
+    params = core_signals.SignalParams(signal_type="SAWTOOTH", duration=10, start_frame=5)
+    line = cache.get("a", params)
+    assert line.cursor(0) == line.cursor(5)
+    assert math.isclose(line.cursor(10)[0], 35.0)
+    cache.get("b", params)
+    cache.prune(["b"])
+    assert len(cache) == 1
+
+
+def test_layout_stacks_rows_and_cursors():
+    cache = preview.PreviewCache(samples=8, width=70.0, height=10.0)
+    lines = [
+        cache.get(0, core_signals.SignalParams(signal_type="SAWTOOTH", duration=10)),
+        cache.get(1, core_signals.SignalParams(signal_type="SINE", duration=20)),
+    ]
+    ov = preview.layout(lines, 18.0, beats=[False, True])
+    assert len(ov) == 2
+    assert len(ov.coords) == 2 * 2 * 7
+    assert ov.coords[14] == (lines[1].points[0][0], lines[1].points[0][1] - 18.0)
+    assert ov.labels[1] == (76.0, -18.0, lines[1].summary)
+    cur = ov.cursors(5, tick=10)
+    assert len(cur) == 4
+    assert cur[0][0] == lines[0].cursor(5)[0]
+    assert cur[2][0] == lines[1].cursor(10)[0]
+    assert cur[3][1] - cur[2][1] == 8
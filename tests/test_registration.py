@@ -38,3 +38,28 @@ def test_unregister_props_no_error():
     importlib.reload(vjlooper.ui)
     vjlooper.ui.unregister_props()
 
+
+
+def test_file_load_clears_caches():
+    import bpy
+
+    sig = vjlooper.signals
+    sig.register()
+    try:
+        assert sig.clear_caches in bpy.app.handlers.load_post
+        assert sig.invalidate_tempo in bpy.app.handlers.undo_post
+        assert sig.invalidate_tempo in bpy.app.handlers.redo_post
+        assert sig.invalidate_preview in bpy.app.handlers.undo_post
+        sig.tempo_state.update(map=object(), key=("Scene", 24.0))
+        sig.overlay_cache["Cube"] = object()
+        sig.morphs.append({"objects": {"Cube"}})
+        sig.layer_state["active"] = {}
+        sig.cue_state["list"] = object()
+        for fn in bpy.app.handlers.load_post:
+            fn(None)
+        assert sig.tempo_state["map"] is None and not sig.overlay_cache and not sig.morphs
+        assert sig.layer_state["active"] is None and sig.cue_state["list"] is None
+    finally:
+        sig.unregister()
+    assert sig.clear_caches not in bpy.app.handlers.load_post
+    assert sig.invalidate_tempo not in bpy.app.handlers.undo_post
@@ -63,3 +63,13 @@ def test_smoothing_persistent():
     smooth1 = core_signals.calc_signal(params, 1, cache_key="x")
     assert math.isclose(raw0, smooth0, abs_tol=1e-6)
     assert not math.isclose(raw1, smooth1, abs_tol=1e-6)
+
+
+def test_ramp_holds_before_and_after():
+    params = core_signals.SignalParams(
+        signal_type="RAMP", duration=10, start_frame=5, base_value=0.0, amplitude=2.0
+    )
+    assert core_signals.calc_signal(params, 0) == 0.0
+    assert math.isclose(core_signals.calc_signal(params, 10), 1.0)
+    assert core_signals.calc_signal(params, 15) == 2.0
+    assert core_signals.calc_signal(params, 100) == 2.0
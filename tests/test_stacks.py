@@ -0,0 +1,69 @@
+import os
+import sys
+from dataclasses import replace
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core import stacks
+from core import signals as core_signals
+from core.signals import SignalParams
+
+
+def _stack():
+    params = [
+        SignalParams("SINE", amplitude=2.0, frequency=1.5, duration=40, base_value=1.0),
+        SignalParams("TRIANGLE", amplitude=0.5, duration=24, start_frame=5, loop_count=3),
+        SignalParams("NOISE", amplitude=1.0, duration=30, noise_seed=4),
+    ]
+    keys = [("LOC_X", ""), ("ROT_Z", ""), ("SCALE_ALL", "")]
+    return stacks.SharedStack(keys, params), params
+
+
+def test_shared_stack_matches_calc_signal():
+    stack, params = _stack()
+    offsets = [0, 7, 7, 0]
+    phases = [0.0, 90.0, 90.0, 45.0]
+    for frame in (0, 13, 61, 120):
+        out = stack.evaluate(frame, offsets, phases, np.ones(4))
+        assert out.shape == (4, 3)
+        for o, (off, ph) in enumerate(zip(offsets, phases)):
+            for r, p in enumerate(params):
+                ref = core_signals.calc_signal(replace(p, phase_offset=p.phase_offset + ph), frame - off)
+                assert abs(out[o, r] - ref) < 1e-9
+
+
+def test_shared_stack_amplitude_scales_around_base():
+    stack, params = _stack()
+    out = stack.evaluate(17, [0, 0], [0.0, 0.0], [1.0, 0.5])
+    base = np.array([p.base_value for p in params])
+    assert np.allclose(out[1] - base, (out[0] - base) * 0.5)
+    assert np.allclose(stack.evaluate(17, [3], [0.0], [0.0])[0], base)
+
+
+def test_shared_stack_beat_clock():
+    params = [SignalParams("SAWTOOTH", duration=96)]
+    stack = stacks.SharedStack([("LOC_Z", "")], params, beats=[True])
+    out = stack.evaluate(30, [0, 10], [0, 0], [1, 1], clock=lambda frames: np.floor(frames * 4))
+    assert abs(out[0, 0] - core_signals.calc_signal(params[0], 120)) < 1e-9
+    assert abs(out[1, 0] - core_signals.calc_signal(params[0], 80)) < 1e-9
+
+
+def test_shared_stack_empty():
+    stack = stacks.SharedStack([], [])
+    assert stack.evaluate(5, [0, 1], [0, 0], [1, 1]).shape == (2, 0)
+
+
+def test_shared_stack_live_rows_read_fresh_values():
+    params = [SignalParams("LIVE", amplitude=2.0, base_value=1.0), SignalParams("SINE", duration=24)]
+    stack = stacks.SharedStack([("LOC_X", ""), ("LOC_Y", "")], params)
+    assert stack.live_rows == [0]
+    assert stack.evaluate(3, [0, 5], [0.0, 90.0], [1, 1])[:, 0].tolist() == [1.0, 1.0]
+    stack.set_live(0, 0.5)
+    assert stack.evaluate(4, [0, 5], [0.0, 90.0], [1, 1])[:, 0].tolist() == [2.0, 2.0]
+
+
+def test_group_links():
+    links = [("a", "S"), ("b", ""), ("c", "T"), ("d", "S")]
+    assert stacks.group_links(links) == {"S": ["a", "d"], "T": ["c"]}
@@ -0,0 +1,45 @@
+import math
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+from core.tempo import TempoMap, tap_tempo
+
+
+def test_constant_tempo():
+    tm = TempoMap(fps=24, base_bpm=120)
+    assert tm.frames_per_beat(0) == 12.0
+    assert tm.beat_at(36) == 3.0
+    assert tm.frame_at(3.0) == 36.0
+    assert tm.beat_at(-12) == -1.0
+
+
+def test_tempo_changes_round_trip():
+    tm = TempoMap([(48, 60), (96, 240), (0, 90)], fps=24, base_bpm=120)
+    assert tm.bpms[0] == 90  # a change at frame 0 replaces the base tempo
+    assert math.isclose(tm.beat_at(48), 3.0)
+    assert math.isclose(tm.beat_at(96), 5.0)
+    assert math.isclose(tm.beat_at(102), 6.0)
+    for frame in (-5.0, 0.0, 30.5, 48.0, 70.0, 96.0, 200.0):
+        assert math.isclose(tm.frame_at(tm.beat_at(frame)), frame)
+    frames = np.array([-5.0, 30.5, 70.0, 200.0])
+    assert np.allclose(tm.beat_at_array(frames), [tm.beat_at(f) for f in frames])
+    assert math.isclose(tm.span_frames(40, 1.0), 8 + 24 * 0.5)
+
+
+def test_many_changes_and_bar_snapping():
+    changes = [(i * 10, 100 + i % 7) for i in range(1, 500)]
+    tm = TempoMap(changes, fps=30, base_bpm=100, beats_per_bar=4)
+    assert math.isclose(tm.frame_at(tm.beat_at(2345.5)), 2345.5)
+    assert tm.snap_beats(5) == 4 and tm.snap_beats(1) == 4 and tm.snap_beats(7) == 8
+    bar = tm.snap_frame_to_bar(tm.frame_at(7.9))
+    assert math.isclose(tm.beat_at(bar), 8.0)
+
+
+def test_tap_tempo():
+    assert tap_tempo([0.0, 0.5, 1.0, 1.5]) == 120.0
+    assert tap_tempo([0.0, 0.4, 5.0, 6.0, 7.0]) == 60.0
+    assert tap_tempo([3.0]) == 0.0
@@ -3,12 +3,61 @@
 import bpy
 from pathlib import Path
 
+from . import signals
+from .core import library as core_library
+from .core import native as core_native
+
 _GROUP = "TunnelFX_CYL"
-_PATH = Path(__file__).parent / "assets" / "gn" / "TunnelFX_CYL.blend"
+SCROLL_INPUT = "Scroll Speed"
+_ASSET_DIR = Path(__file__).parent / "assets" / "gn"
+
+_asset_index = None
+
+
+def asset_index():
+    """Return the shared AssetIndex, stored in the user data directory."""
+    global _asset_index
+    if _asset_index is None:
+        directory = bpy.utils.user_resource('DATAFILES', path="vjlooper")
+        _asset_index = core_library.AssetIndex(Path(directory) / "asset_index.json")
+    return _asset_index
+
+
+def asset_files():
+    """Return the .blend files shipped in the asset directory."""
+    return sorted(_ASSET_DIR.glob("*.blend"))
+
+
+def scan_library(path):
+    """Return node group names in path, opening it only when not indexed."""
+    groups = asset_index().lookup(path)
+    if groups is None:
+        with bpy.data.libraries.load(str(path), link=False) as (data_from, _):
+            groups = list(data_from.node_groups)
+        asset_index().store(path, groups)
+    return groups
 
 
-def load_group():
-    """Load and return the geometry node group for the tunnel effect."""
+def find_group_file(name):
+    """Return the asset file providing node group name, if any."""
+    path = asset_index().find(name)
+    if path is not None:
+        return path
+    for path in asset_files():
+        if name in scan_library(path):
+            return path
+    return None
+
+
+def _existing_group(node_groups, name, link):
+    for group in node_groups:
+        if group.name == name and (group.library is not None) == link:
+            return group
+    return None
+
+
+def load_group(name=_GROUP, link=False):
+    """Return node group name, appending or linking it on first use."""
     data = getattr(bpy, "data", None)
     node_groups = None
     if data is not None:
@@ -19,16 +68,87 @@ def load_group():
             node_groups = None
     if node_groups is None:
         return None
-    if _GROUP in node_groups:
-        return node_groups[_GROUP]
-    if _PATH.exists():
-        with bpy.data.libraries.load(str(_PATH), link=False) as (
-            data_from,
-            data_to,
-        ):
-            if _GROUP in data_from.node_groups:
-                data_to.node_groups.append(_GROUP)
-    return node_groups.get(_GROUP)
+    group = _existing_group(node_groups, name, link)
+    if group is not None:
+        return group
+    path = find_group_file(name)
+    if path is None:
+        return None
+    with bpy.data.libraries.load(str(path), link=link) as (data_from, data_to):
+        if name in data_from.node_groups:
+            data_to.node_groups = [name]
+    loaded = [g for g in data_to.node_groups if g is not None]
+    return loaded[0] if loaded else None
+
+
+def _group_inputs(group):
+    iface = getattr(group, "interface", None)
+    if iface is not None:
+        return [
+            item for item in iface.items_tree
+            if item.item_type == 'SOCKET' and item.in_out == 'INPUT'
+        ]
+    return list(group.inputs)
+
+
+def tunnel_modifier(obj):
+    """Return the TunnelFX geometry nodes modifier of obj, if any."""
+    for mod in obj.modifiers:
+        if mod.type == 'NODES' and mod.node_group and mod.name.startswith("TunnelFX"):
+            return mod
+    return None
+
+
+def scroll_input_id(mod):
+    """Return the modifier input identifier of the scroll speed socket."""
+    for sock in _group_inputs(mod.node_group):
+        if sock.name == SCROLL_INPUT:
+            return sock.identifier
+    return None
+
+
+def scroll_compiled(obj):
+    """Return True if obj's scroll input is evaluated by compile_scroll."""
+    mod = tunnel_modifier(obj)
+    return mod is not None and "tfx_source" in mod.node_group
+
+
+# object name -> (modifier name, node group name, input identifier)
+scroll_inputs = {}
+
+
+def scroll_target(obj):
+    """Return (modifier, identifier) of obj's scroll input, cached per object.
+
+    The entry is reused while the modifier still holds the same node group;
+    watch_scroll_groups drops everything when a node tree is edited.
+    """
+    entry = scroll_inputs.get(obj.name)
+    if entry is not None:
+        mod = obj.modifiers.get(entry[0])
+        if mod is not None and mod.node_group is not None and mod.node_group.name == entry[1]:
+            return mod, entry[2]
+    mod = tunnel_modifier(obj)
+    ident = scroll_input_id(mod) if mod else None
+    if ident is None:
+        scroll_inputs.pop(obj.name, None)
+        return None, None
+    scroll_inputs[obj.name] = (mod.name, mod.node_group.name, ident)
+    return mod, ident
+
+
+def watch_scroll_groups(scene, depsgraph=None):
+    """Forget cached scroll inputs once a node tree was edited."""
+    if depsgraph is None or depsgraph.id_type_updated('NODETREE'):
+        scroll_inputs.clear()
+
+
+def write_scroll_input(obj, value):
+    """Forward value to the scroll speed input of the TunnelFX modifier."""
+    mod, ident = scroll_target(obj)
+    if ident and mod.get(ident) != value:
+        mod[ident] = value
+        obj.update_tag()
 
 
 def update_scroll(self, ctx):
@@ -38,6 +158,140 @@ def update_scroll(self, ctx):
         dur = sc.frame_end
         q = round(self.tfx_scroll_speed * dur) / dur
         self["tfx_scroll_speed"] = q
+    write_scroll_input(self, self.tfx_scroll_speed)
+
+
+def _fill_curve(mapping, values):
+    curve = mapping.curves[0]
+    while len(curve.points) < len(values):
+        curve.points.new(0.0, 0.0)
+    last = len(values) - 1
+    for i, (point, v) in enumerate(zip(curve.points, values)):
+        point.location = (i / last, v)
+        point.handle_type = 'VECTOR'
+    mapping.update()
+
+
+def build_lut_nodes(ng, lut):
+    """Add nodes to ng that evaluate lut from scene time; return the output."""
+    nodes, links = ng.nodes, ng.links
+
+    def math(op, *args):
+        node = nodes.new("ShaderNodeMath")
+        node.operation = op
+        for sock, v in zip(node.inputs, args):
+            if isinstance(v, (int, float)):
+                sock.default_value = v
+            else:
+                links.new(v, sock)
+        return node.outputs[0]
+
+    frame = nodes.new("GeometryNodeInputSceneTime").outputs["Frame"]
+    rel = math('SUBTRACT', frame, float(lut.start))
+    pos = math('DIVIDE', math('WRAP', rel, float(lut.duration), 0.0), float(lut.duration))
+    curve = nodes.new("ShaderNodeFloatCurve")
+    _fill_curve(curve.mapping, lut.values)
+    links.new(pos, curve.inputs["Value"])
+    remap = nodes.new("ShaderNodeMapRange")
+    links.new(curve.outputs[0], remap.inputs["Value"])
+    remap.inputs["To Min"].default_value = lut.low
+    remap.inputs["To Max"].default_value = lut.high
+    gate = math('GREATER_THAN', rel, -0.5)
+    if lut.loop_count:
+        end = float(lut.duration * lut.loop_count) - 0.5
+        gate = math('MULTIPLY', gate, math('LESS_THAN', rel, end))
+    delta = math('SUBTRACT', remap.outputs[0], lut.base_value)
+    return math('MULTIPLY_ADD', delta, gate, lut.base_value)
+
+
+def compile_scroll(obj, item, loop_lock=False):
+    """Drive the TunnelFX scroll input of obj from a baked copy of item.
+
+    The modifier gets a private copy of its node group in which the scroll
+    input is replaced by a lookup table sampled from scene time, so no
+    Python runs per frame.  Returns False when item cannot be baked.
+    """
+    mod = tunnel_modifier(obj)
+    if mod is None or item.time_unit != 'FRAMES':
+        return False
+    lut = core_native.bake_lut(signals.item_params(item, obj), loop_lock=loop_lock)
+    if lut is None:
+        return False
+    current = mod.node_group
+    source = bpy.data.node_groups.get(current.get("tfx_source", "")) or current
+    ng = source.copy()
+    ng.name = f"{source.name}_{obj.name}_Scroll"
+    ng["tfx_source"] = source.name
+    scroll_links = [
+        link for link in ng.links
+        if link.from_node.type == 'GROUP_INPUT' and link.from_socket.name == SCROLL_INPUT
+    ]
+    if not scroll_links:
+        bpy.data.node_groups.remove(ng)
+        return False
+    targets = [link.to_socket for link in scroll_links]
+    for link in scroll_links:
+        ng.links.remove(link)
+    out = build_lut_nodes(ng, lut)
+    for sock in targets:
+        ng.links.new(out, sock)
+    mod.node_group = ng
+    if current is not source and current.users == 0:
+        bpy.data.node_groups.remove(current)
+    item.native = True
+    return True
+
+
+def compile_scroll_items(obj, loop_lock=False):
+    """Compile the last enabled GN Scroll item of obj; None if there is none."""
+    items = [it for it in obj.signal_items if it.enabled and it.channel == "GN_SCROLL"]
+    if not items:
+        return None
+    if not compile_scroll(obj, items[-1], loop_lock):
+        return False
+    for it in items[:-1]:
+        # overwritten by the last item anyway
+        it.native = True
+    return True
+
+
+# names of objects whose baked scroll is rebaked by _rebake_scrolls
+pending_rebakes = set()
+
+
+def request_rebake(obj):
+    """Rebake obj's scroll lookup table on a timer after an item edit."""
+    pending_rebakes.add(obj.name)
+    if not bpy.app.timers.is_registered(_rebake_scrolls):
+        bpy.app.timers.register(_rebake_scrolls, first_interval=0.0)
+
+
+def _rebake_scrolls():
+    sc = signals._scene()
+    loop_lock = getattr(sc, "loop_lock", False)
+    while pending_rebakes:
+        obj = sc.objects.get(pending_rebakes.pop()) if sc is not None else None
+        if obj is None or not scroll_compiled(obj):
+            continue
+        if not compile_scroll_items(obj, loop_lock):
+            # the edited item cannot be baked, so Python scrolls it again
+            restore_scroll(obj)
+    return None
+
+
+def restore_scroll(obj):
+    """Return obj to Python-driven scrolling."""
+    mod = tunnel_modifier(obj)
+    if mod is not None:
+        current = mod.node_group
+        source = bpy.data.node_groups.get(current.get("tfx_source", ""))
+        if source is not None:
+            mod.node_group = source
+            if current.users == 0:
+                bpy.data.node_groups.remove(current)
+    for it in obj.signal_items:
+        if it.channel == "GN_SCROLL":
+            it.native = False
 
 
 class VJLOOPER_OT_add_tunnel(bpy.types.Operator):
@@ -47,9 +301,14 @@ class VJLOOPER_OT_add_tunnel(bpy.types.Operator):
     bl_label = "Add Tunnel"
 
     preset: bpy.props.EnumProperty(items=[("CYL", "Cylinder", "")], default="CYL")
+    link: bpy.props.BoolProperty(
+        name="Link",
+        default=False,
+        description="Link the node group from the asset file instead of appending it",
+    )
 
     def execute(self, ctx):
-        group = load_group()
+        group = load_group(f"TunnelFX_{self.preset}", self.link)
         obj = ctx.object
         if not obj or not group:
             return {"CANCELLED"}
@@ -61,6 +320,33 @@ class VJLOOPER_OT_add_tunnel(bpy.types.Operator):
         it = obj.signal_items.add()
         it.name = "GN Scroll"
         it.channel = "GN_SCROLL"
+        signals.invalidate_layers()
+        return {"FINISHED"}
+
+
+class VJLOOPER_OT_tunnel_native(bpy.types.Operator):
+    """Evaluate the GN Scroll animation inside Geometry Nodes."""
+
+    bl_idname = "vjlooper.tunnel_native"
+    bl_label = "Native Scroll"
+    bl_options = {"REGISTER", "UNDO"}
+
+    enable: bpy.props.BoolProperty(default=True)
+
+    def execute(self, ctx):
+        obj = ctx.object
+        if not obj or tunnel_modifier(obj) is None:
+            return {"CANCELLED"}
+        if not self.enable:
+            restore_scroll(obj)
+            return {"FINISHED"}
+        done = compile_scroll_items(obj, getattr(ctx.scene, "loop_lock", False))
+        if done is None:
+            self.report({"WARNING"}, "No GN Scroll animation")
+            return {"CANCELLED"}
+        if not done:
+            self.report({"WARNING"}, "Scroll animation cannot be evaluated natively")
+            return {"CANCELLED"}
         return {"FINISHED"}
 
 
@@ -73,6 +359,9 @@ def draw_ui(layout, ctx):
         box.prop(obj, "tfx_radius")
         box.prop(obj, "tfx_length")
         box.prop(obj, "tfx_scroll_speed")
+        row = box.row(align=True)
+        row.operator("vjlooper.tunnel_native", text="Native Scroll").enable = True
+        row.operator("vjlooper.tunnel_native", text="Python Scroll").enable = False
 
 
 def register():
@@ -81,11 +370,20 @@ def register():
     bpy.types.Object.tfx_scroll_speed = bpy.props.FloatProperty(
         default=0.0, update=update_scroll
     )
-    load_group()
     bpy.utils.register_class(VJLOOPER_OT_add_tunnel)
+    bpy.utils.register_class(VJLOOPER_OT_tunnel_native)
+    if watch_scroll_groups not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(watch_scroll_groups)
 
 
 def unregister():
+    if watch_scroll_groups in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(watch_scroll_groups)
+    scroll_inputs.clear()
+    pending_rebakes.clear()
+    if bpy.app.timers.is_registered(_rebake_scrolls):
+        bpy.app.timers.unregister(_rebake_scrolls)
+    bpy.utils.unregister_class(VJLOOPER_OT_tunnel_native)
     bpy.utils.unregister_class(VJLOOPER_OT_add_tunnel)
     for attr in ("tfx_radius", "tfx_length", "tfx_scroll_speed"):
         if hasattr(bpy.types.Object, attr):
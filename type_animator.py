@@ -3,59 +3,224 @@
 import bpy
 import math
 import random
-from mathutils import Vector
+import time
+import numpy as np
+from mathutils import Matrix, Vector
 try:
     from mathutils.kdtree import KDTree  # type: ignore
 except Exception:  # pragma: no cover - absent when testing
-    class KDTree:  # minimal stub for tests
-        def __init__(self, size):
-            pass
-
-        def insert(self, co, index):
-            pass
-
-        def balance(self):
-            pass
-
-        def find_range(self, co, dist):
-            return []
+    KDTree = None
 
 import json
 
+from . import signals
+from .core import glyphs
+
 
 # -----------------------------------------------------------------------------
 # Utility functions
 # -----------------------------------------------------------------------------
 
-def geometry_center(obj):
-    """Return the geometric center of obj in world space."""
-    verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-    return sum(verts, Vector()) / len(verts) if verts else obj.location
-
-
-def set_origin_to_center(obj):
-    """Place the origin of obj at its geometry center."""
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+def mesh_arrays(mesh):
+    """Return vertex, edge, loop, polygon and UV arrays of mesh as a dict."""
+    nv, ne, nl, npoly = len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons)
+    co = np.empty(nv * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    edges = np.empty(ne * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    loop_verts = np.empty(nl, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_start = np.empty(npoly, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(npoly, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    mat_index = np.empty(npoly, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", mat_index)
+    smooth = np.empty(npoly, dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+    uvs = {}
+    for layer in mesh.uv_layers:
+        uv = np.empty(nl * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uv)
+        uvs[layer.name] = uv.reshape(-1, 2)
+    return {
+        "co": co.reshape(-1, 3).astype(np.float64),
+        "edges": edges.reshape(-1, 2),
+        "loop_verts": loop_verts,
+        "loop_start": loop_start,
+        "loop_total": loop_total,
+        "mat_index": mat_index,
+        "smooth": smooth,
+        "uvs": uvs,
+    }
+
+
+def build_mesh(name, co, edges, loop_verts, loop_total, mat_index, materials, smooth=(), uvs=None):
+    """Create a mesh datablock from flat arrays.
+
+    from_pydata only builds topology, so materials, face shading and UV
+    layers are copied back with foreach_set.
+    """
+    me = bpy.data.meshes.new(name)
+    faces = np.split(loop_verts, np.cumsum(loop_total)[:-1]) if len(loop_total) else []
+    me.from_pydata(co.tolist(), edges.tolist(), [f.tolist() for f in faces])
+    for mat in materials:
+        me.materials.append(mat)
+    if len(mat_index):
+        me.polygons.foreach_set("material_index", mat_index)
+    if len(smooth):
+        me.polygons.foreach_set("use_smooth", smooth)
+    for uv_name, uv in (uvs or {}).items():
+        layer = me.uv_layers.new(name=uv_name)
+        layer.data.foreach_set("uv", np.ascontiguousarray(uv, dtype=np.float32).ravel())
+    me.update()
+    return me
+
+
+def write_fcurve(action, data_path, index, frames, values, group="Object Transforms"):
+    """Add keyframes to an F-Curve of action in one bulk write."""
+    fc = action.fcurves.find(data_path, index=index)
+    if fc is None:
+        fc = action.fcurves.new(data_path, index=index, action_group=group)
+    points = fc.keyframe_points
+    first = len(points)
+    points.add(len(frames))
+    co = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    co[first * 2::2] = frames
+    co[first * 2 + 1::2] = values
+    points.foreach_set("co", co)
+    fc.update()
+    return fc
+
+
+def write_letter_keys(action, start, duration, o_s, o_r, rot_z, scale_start, direction_factor=1):
+    """Key the scale/rotation reveal of one letter into action."""
+    frames = (start, start + duration)
+    rot_start = o_r[2] + math.radians(rot_z * direction_factor)
+    for i in range(3):
+        write_fcurve(action, "scale", i, frames, (scale_start, o_s[i]))
+    for i in range(3):
+        write_fcurve(action, "rotation_euler", i, frames, (rot_start if i == 2 else o_r[i], o_r[i]))
 
 
 def animate_ctrl(ctrl, start, duration, rot_z, scale_start, direction_factor=1):
     """Animate ctrl with a rotation around Z and scaling."""
-    end = start + duration
-    o_s = ctrl.scale.copy()
-    o_r = ctrl.rotation_euler.copy()
+    ad = ctrl.animation_data or ctrl.animation_data_create()
+    if ad.action is None:
+        ad.action = bpy.data.actions.new(f"{ctrl.name}Action")
+    write_letter_keys(
+        ad.action, start, duration, ctrl.scale, ctrl.rotation_euler, rot_z, scale_start, direction_factor
+    )
 
-    ctrl.scale = (scale_start,) * 3
-    ctrl.rotation_euler.z = o_r.z + math.radians(rot_z * direction_factor)
-    ctrl.keyframe_insert("scale", frame=start)
-    ctrl.keyframe_insert("rotation_euler", frame=start)
 
-    ctrl.scale = o_s
-    ctrl.rotation_euler = o_r
-    ctrl.keyframe_insert("scale", frame=end)
-    ctrl.keyframe_insert("rotation_euler", frame=end)
+def animate_ctrl_shared(ctrl, start, duration, rot_z, scale_start, direction_factor=1, actions=None):
+    """Animate ctrl with an NLA strip of an action shared between letters.
+
+    actions caches one action per rest transform and direction so letters
+    with the same pose reuse a single set of F-Curves.
+    """
+    actions = {} if actions is None else actions
+    o_s = tuple(round(v, 6) for v in ctrl.scale)
+    o_r = tuple(round(v, 6) for v in ctrl.rotation_euler)
+    key = (o_s, o_r, direction_factor)
+    action = actions.get(key)
+    if action is None:
+        action = bpy.data.actions.new("TypeAnimator_Letter")
+        action.id_root = 'OBJECT'
+        write_letter_keys(action, 0, duration, o_s, o_r, rot_z, scale_start, direction_factor)
+        actions[key] = action
+    ad = ctrl.animation_data or ctrl.animation_data_create()
+    track = ad.nla_tracks.new()
+    track.name = "TypeAnimator"
+    strip = track.strips.new(action.name, int(start), action)
+    strip.extrapolation = 'HOLD'
+    return action
+
+
+def letter_order(count, direction):
+    """Return controller indices in animation order for direction."""
+    if direction == 'FORWARD':
+        return list(range(count))
+    if direction == 'REVERSE':
+        return list(range(count - 1, -1, -1))
+    order = list(range(count))
+    random.shuffle(order)
+    return order
+
+
+def set_letter_signals(ctrl, start, duration, rot_z, scale_start, direction_factor=1):
+    """Create or update the procedural reveal SignalItems of ctrl."""
+    items = {it.name: it for it in ctrl.signal_items}
+    scl = items.get("TA_Scale")
+    if scl is None:
+        scl = ctrl.signal_items.add()
+        scl.name = "TA_Scale"
+        scl.channel = 'SCL_ALL'
+        scl.signal_type = 'RAMP'
+        scl["rest"] = ctrl.scale.x
+        rot = ctrl.signal_items.add()
+        rot.name = "TA_Rotate"
+        rot.channel = 'ROT_Z'
+        rot.signal_type = 'RAMP'
+        rot["rest"] = ctrl.rotation_euler.z
+        signals.invalidate_layers()
+    else:
+        rot = items["TA_Rotate"]
+    turn = math.radians(rot_z * direction_factor)
+    scl.base_value = scale_start
+    scl.amplitude = scl["rest"] - scale_start
+    rot.base_value = rot["rest"] + turn
+    rot.amplitude = -turn
+    for it in (scl, rot):
+        it.start_frame = start
+        it.duration = duration
+
+
+def iter_animate_controllers(controllers, props):
+    """Animate controllers in the order of props.direction, one per step."""
+    actions = {}
+    order = letter_order(len(controllers), props.direction)
+    for anim_index, ctrl_index in enumerate(order):
+        ctrl = controllers[ctrl_index]
+        start = props.start_frame + anim_index * props.overlap
+        direction_factor = 1 if (ctrl_index % 2 == 0) else -1
+        if props.mode == 'PROCEDURAL':
+            ctrl["ta_index"] = ctrl_index
+            set_letter_signals(ctrl, start, props.duration, props.rot_z, props.scale_start, direction_factor)
+        elif props.share_action:
+            animate_ctrl_shared(
+                ctrl, start, props.duration, props.rot_z, props.scale_start, direction_factor, actions
+            )
+        else:
+            animate_ctrl(ctrl, start, props.duration, props.rot_z, props.scale_start, direction_factor)
+        yield anim_index + 1, len(order)
+
+
+def animate_controllers(controllers, props):
+    """Animate controllers in the order given by props.direction."""
+    run_job(iter_animate_controllers(controllers, props))
+
+
+def run_job(job):
+    """Exhaust a step generator and return its result."""
+    while True:
+        try:
+            next(job)
+        except StopIteration as stop:
+            return stop.value
+
+
+def procedural_controllers(objects):
+    """Return letter controllers with procedural signals below objects."""
+    found = {}
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if "ta_index" in obj:
+            found[obj.name] = obj
+        stack.extend(obj.children)
+    return sorted(found.values(), key=lambda o: o["ta_index"])
 
 
 def safe_parent_with_transform(child, parent):
@@ -87,6 +252,24 @@ class LetterAnimProperties(bpy.types.PropertyGroup):
         default='FORWARD',
     )
     grouping_tolerance: bpy.props.FloatProperty(name="Grouping Tolerance", default=0.5, min=0.1, max=2.0)
+    share_meshes: bpy.props.BoolProperty(
+        name="Share Glyph Meshes",
+        default=False,
+        description="Reuse one mesh for identical letters",
+    )
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('KEYFRAMES', "Keyframes", "Bake the reveal into keyframes"),
+            ('PROCEDURAL', "Procedural", "Drive the reveal with live signals"),
+        ],
+        default='KEYFRAMES',
+    )
+    share_action: bpy.props.BoolProperty(
+        name="Shared Action",
+        default=False,
+        description="Share one action between letters and offset it with NLA strips",
+    )
 
 
 class TextAnimPreset(bpy.types.PropertyGroup):
@@ -98,69 +281,138 @@ class TextAnimPreset(bpy.types.PropertyGroup):
 # Letter utilities
 # -----------------------------------------------------------------------------
 
-def separate_and_group(txt, tolerance=0.5):
-    """Separate text object into individual letters."""
+def group_pieces(centers, sizes, tolerance=0.5):
+    """Group piece indices whose centers are transitively within range.
+
+    Every pair closer than the average piece size times tolerance is
+    linked, so results do not depend on iteration order.
+    """
+    if not centers:
+        return []
+    grouping_distance = (sum(sizes) / len(sizes)) * tolerance if sizes else 0.0
+    if KDTree is None:
+        pairs = glyphs.range_pairs(centers, grouping_distance)
+    else:
+        tree = KDTree(len(centers))
+        for i, center in enumerate(centers):
+            tree.insert(center, i)
+        tree.balance()
+        pairs = [
+            (i, idx)
+            for i, center in enumerate(centers)
+            for (_, idx, _) in tree.find_range(center, grouping_distance)
+            if idx > i
+        ]
+    return glyphs.group_pairs(len(centers), pairs)
+
+
+def separate_and_group(txt, tolerance=0.5, share_meshes=False, stats=None):
+    """Separate text object into individual letter objects.
+
+    See iter_separate_and_group for details.
+    """
+    result = run_job(iter_separate_and_group(txt, tolerance, share_meshes, stats))
+    if result[0]:
+        bpy.data.objects.remove(txt)
+    return result
+
+
+def iter_separate_and_group(txt, tolerance=0.5, share_meshes=False, stats=None, created=None):
+    """Separate text object into letters, yielding (done, total) per letter.
+
+    Works on mesh data directly: the evaluated text mesh is split into
+    loose parts with NumPy, nearby parts are grouped into letters and each
+    letter gets its own mesh centered on its bounds.  The text object is
+    replaced by a hidden backup copy.
+
+    With share_meshes, identical glyphs reuse one mesh datablock.  If a
+    stats dict is given it receives the mesh count and the bytes saved.
+    Every new datablock is appended to created so callers can roll back;
+    the text object is left in place for the caller to remove.
+    """
+    created = [] if created is None else created
 
     original_matrix = txt.matrix_world.copy()
     original_name = txt.name
+    collections = list(txt.users_collection)
 
-    bpy.ops.object.select_all(action='DESELECT')
-    txt.select_set(True)
-    bpy.context.view_layer.objects.active = txt
-    bpy.ops.object.duplicate()
-    backup = bpy.context.active_object
+    backup = txt.copy()
+    backup.data = txt.data.copy()
+    created.extend((backup, backup.data))
     backup.name = original_name + "_original"
+    for coll in collections:
+        coll.objects.link(backup)
     backup.hide_viewport = True
     backup.hide_render = True
 
-    bpy.ops.object.select_all(action='DESELECT')
-    txt.select_set(True)
-    bpy.context.view_layer.objects.active = txt
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    source = bpy.data.meshes.new_from_object(txt.evaluated_get(depsgraph))
+    arrays = mesh_arrays(source)
+    materials = list(source.materials)
+    bpy.data.meshes.remove(source)
 
-    bpy.ops.object.convert(target='MESH', keep_original=False)
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.separate(type='LOOSE')
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    pieces = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
-    if not pieces:
+    co = arrays["co"]
+    if not len(co):
         return [], original_matrix
 
-    centers = [geometry_center(obj) for obj in pieces]
-    tree = KDTree(len(centers))
-    for i, center in enumerate(centers):
-        tree.insert(center, i)
-    tree.balance()
-
-    avg_size = sum(obj.dimensions.length for obj in pieces) / len(pieces)
-    grouping_distance = avg_size * tolerance
-
-    visited = set()
+    labels = glyphs.connected_components(len(co), arrays["edges"])
+    count = int(labels.max()) + 1
+    world = glyphs.transform_points(co, original_matrix)
+    centers = glyphs.component_centers(world, labels, count)
+    lo, hi = glyphs.component_bounds(co, labels, count)
+    scale = np.asarray(original_matrix.to_scale())
+    sizes = np.linalg.norm((hi - lo) * scale, axis=1)
+
+    groups = group_pieces(centers.tolist(), sizes.tolist(), tolerance)
+
+    letter_of_comp = np.empty(count, dtype=np.int64)
+    for i, group in enumerate(groups):
+        letter_of_comp[group] = i
+    vert_letter = letter_of_comp[labels]
+    origins = glyphs.bounds_centers(co, vert_letter, len(groups))
+    verts_by_letter = glyphs.split_indices(vert_letter, len(groups))
+    edge_letter = vert_letter[arrays["edges"][:, 0]] if len(arrays["edges"]) else np.empty(0)
+    edges_by_letter = glyphs.split_indices(edge_letter, len(groups))
+    poly_letter = vert_letter[arrays["loop_verts"][arrays["loop_start"]]]
+    polys_by_letter = glyphs.split_indices(poly_letter, len(groups))
+
+    remap = np.empty(len(co), dtype=np.int64)
     letters = []
-    for i, obj in enumerate(pieces):
-        if i in visited:
-            continue
-        group = [obj]
-        visited.add(i)
-        nearby = tree.find_range(centers[i], grouping_distance)
-        for (_, idx, _) in nearby:
-            if idx not in visited and idx != i:
-                group.append(pieces[idx])
-                visited.add(idx)
-        if len(group) > 1:
-            bpy.ops.object.select_all(action='DESELECT')
-            for part in group:
-                part.select_set(True)
-            bpy.context.view_layer.objects.active = group[0]
-            bpy.ops.object.join()
-            letters.append(bpy.context.active_object)
+    meshes = {}
+    saved = 0
+    for i, verts in enumerate(verts_by_letter):
+        remap[verts] = np.arange(len(verts))
+        center = origins[i]
+        polys = polys_by_letter[i]
+        loops = glyphs.loop_ranges(arrays["loop_start"][polys], arrays["loop_total"][polys])
+        data = (
+            co[verts] - center,
+            remap[arrays["edges"][edges_by_letter[i]]],
+            remap[arrays["loop_verts"][loops]],
+            arrays["loop_total"][polys],
+            arrays["mat_index"][polys],
+        )
+        smooth = arrays["smooth"][polys]
+        uvs = {name: uv[loops] for name, uv in arrays["uvs"].items()}
+        key = glyphs.mesh_fingerprint(*data, smooth, uvs) if share_meshes else i
+        me = meshes.get(key)
+        if me is None:
+            me = build_mesh(f"{original_name}_Letter_{i+1:02d}", *data, materials, smooth, uvs)
+            meshes[key] = me
+            created.append(me)
         else:
-            letters.append(obj)
-
-    for letter in letters:
-        set_origin_to_center(letter)
-
+            saved += glyphs.mesh_nbytes(len(verts), len(data[1]), len(loops), len(polys))
+        letter = bpy.data.objects.new(f"{original_name}_Letter_{i+1:02d}", me)
+        for coll in collections:
+            coll.objects.link(letter)
+        created.append(letter)
+        letter.matrix_world = original_matrix @ Matrix.Translation(Vector(center.tolist()))
+        letters.append(letter)
+        yield i + 1, len(verts_by_letter)
+
+    if stats is not None:
+        stats["meshes"] = len(meshes)
+        stats["bytes_saved"] = saved
     return letters, original_matrix
 
 
@@ -168,108 +420,231 @@ def separate_and_group(txt, tolerance=0.5):
 # Operators
 # -----------------------------------------------------------------------------
 
-class OBJECT_OT_separate_letters(bpy.types.Operator):
-    bl_idname = "type_animator.separate_letters"
-    bl_label = "Separate Letters"
-    bl_options = {'REGISTER', 'UNDO'}
+def _shared_note(stats):
+    saved = stats.get("bytes_saved", 0)
+    if not saved:
+        return ""
+    return f" ({stats['meshes']} meshes, {saved / 1024:.1f} KB saved)"
 
-    def execute(self, context):
+
+def letter_job(context, txt, props, animate, created):
+    """Separate txt into controlled letters, yielding (label, done, total).
+
+    Returns the report message, or None when nothing could be separated.
+    """
+    original_name = txt.name
+    stats = {}
+    job = iter_separate_and_group(txt, props.grouping_tolerance, props.share_meshes, stats, created)
+    while True:
+        try:
+            done, total = next(job)
+        except StopIteration as stop:
+            letters, original_matrix = stop.value
+            break
+        yield "Separating", done, total
+    if not letters:
+        return None
+
+    controllers = []
+    for i, letter in enumerate(letters):
+        ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Letter_{i+1:02d}", None)
+        created.append(ctrl)
+        context.collection.objects.link(ctrl)
+        ctrl.empty_display_type = 'PLAIN_AXES'
+        ctrl.empty_display_size = 0.5
+        ctrl.matrix_world = letter.matrix_world.copy()
+        safe_parent_with_transform(letter, ctrl)
+        controllers.append(ctrl)
+        yield "Rigging", i + 1, len(letters)
+
+    if animate:
+        for done, total in iter_animate_controllers(controllers, props):
+            yield "Animating", done, total
+
+    main_ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Main", None)
+    created.append(main_ctrl)
+    context.collection.objects.link(main_ctrl)
+    main_ctrl.empty_display_type = 'CUBE'
+    main_ctrl.empty_display_size = 1.0
+    main_ctrl.matrix_world = original_matrix
+
+    for ctrl in controllers:
+        safe_parent_with_transform(ctrl, main_ctrl)
+
+    bpy.data.objects.remove(txt)
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    main_ctrl.select_set(True)
+    context.view_layer.objects.active = main_ctrl
+
+    if animate:
+        total_frames = props.start_frame + len(controllers) * props.overlap + props.duration
+        context.scene.frame_end = max(context.scene.frame_end, total_frames)
+        return f"Animated {len(letters)} letters{_shared_note(stats)}"
+    return f"Separated into {len(letters)} letters{_shared_note(stats)}"
+
+
+def rollback(created):
+    """Remove datablocks created by an unfinished letter job."""
+    actions = set()
+    for id_data in reversed(created):
+        try:
+            if isinstance(id_data, bpy.types.Object):
+                ad = id_data.animation_data
+                if ad:
+                    if ad.action:
+                        actions.add(ad.action)
+                    for track in ad.nla_tracks:
+                        actions.update(strip.action for strip in track.strips if strip.action)
+                bpy.data.objects.remove(id_data)
+        except ReferenceError:
+            pass
+    for id_data in created:
+        try:
+            if isinstance(id_data, bpy.types.Mesh):
+                bpy.data.meshes.remove(id_data)
+            elif isinstance(id_data, bpy.types.Curve):
+                bpy.data.curves.remove(id_data)
+        except ReferenceError:
+            pass
+    for action in actions:
+        if action.users == 0:
+            bpy.data.actions.remove(action)
+    created.clear()
+
+
+class _LetterJobOperator:
+    """Runs letter_job synchronously in execute or in timer chunks when invoked."""
+
+    animate = False
+    time_budget = 0.05
+
+    _timer = None
+    _job = None
+    _created = None
+    _txt = None
+
+    # keys editing or replacing data the running job still references
+    _blocked = {'DEL', 'X', 'BACK_SPACE'}
+
+    def _start(self, context):
         txt = context.active_object
         if not txt or txt.type != 'FONT':
             self.report({'ERROR'}, "Select a text object")
-            return {'CANCELLED'}
-        props = context.scene.letter_anim_props
-        letters, original_matrix = separate_and_group(txt, props.grouping_tolerance)
-        if not letters:
+            return False
+        self._txt = txt
+        self._created = []
+        self._job = letter_job(context, txt, context.scene.letter_anim_props, self.animate, self._created)
+        return True
+
+    def _finish(self, message):
+        if message is None:
+            rollback(self._created)
             self.report({'ERROR'}, "Could not separate text")
             return {'CANCELLED'}
-
-        original_name = txt.name
-        controllers = []
-        for i, letter in enumerate(letters):
-            ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Letter_{i+1:02d}", None)
-            context.collection.objects.link(ctrl)
-            ctrl.empty_display_type = 'PLAIN_AXES'
-            ctrl.empty_display_size = 0.5
-            ctrl.matrix_world = letter.matrix_world.copy()
-            safe_parent_with_transform(letter, ctrl)
-            controllers.append(ctrl)
-
-        main_ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Main", None)
-        context.collection.objects.link(main_ctrl)
-        main_ctrl.empty_display_type = 'CUBE'
-        main_ctrl.empty_display_size = 1.0
-        main_ctrl.matrix_world = original_matrix
-
-        for ctrl in controllers:
-            safe_parent_with_transform(ctrl, main_ctrl)
-
-        bpy.ops.object.select_all(action='DESELECT')
-        main_ctrl.select_set(True)
-        context.view_layer.objects.active = main_ctrl
-        self.report({'INFO'}, f"Separated into {len(letters)} letters")
+        self.report({'INFO'}, message)
         return {'FINISHED'}
 
+    def execute(self, context):
+        if not self._start(context):
+            return {'CANCELLED'}
+        return self._finish(run_job(self._job))
+
+    def invoke(self, context, event):
+        if not self._start(context):
+            return {'CANCELLED'}
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def _alive(self):
+        """Return False once undo or a file load freed data the job holds."""
+        try:
+            self._txt.name
+            for id_data in self._created:
+                id_data.name
+        except ReferenceError:
+            return False
+        return True
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            rollback(self._created)
+            self._end(context)
+            self.report({'WARNING'}, "Cancelled")
+            return {'CANCELLED'}
+        if event.type in self._blocked or event.ctrl or event.oskey:
+            # undo, redo, delete and file operations would free the job's data,
+            # and the whole job has to stay a single undo step
+            return {'RUNNING_MODAL'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        if not self._alive():
+            # the data is already gone, so there is nothing left to roll back
+            self._created.clear()
+            self._end(context)
+            self.report({'WARNING'}, "Letter job cancelled: its objects were removed")
+            return {'CANCELLED'}
+        deadline = time.perf_counter() + self.time_budget
+        try:
+            while time.perf_counter() < deadline:
+                label, done, total = next(self._job)
+        except StopIteration as stop:
+            self._end(context)
+            return self._finish(stop.value)
+        except Exception:
+            rollback(self._created)
+            self._end(context)
+            raise
+        context.window_manager.progress_update(int(100 * done / max(total, 1)))
+        context.workspace.status_text_set(f"{label} letters {done}/{total} (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def _end(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+
+class OBJECT_OT_separate_letters(_LetterJobOperator, bpy.types.Operator):
+    bl_idname = "type_animator.separate_letters"
+    bl_label = "Separate Letters"
+    bl_options = {'REGISTER', 'UNDO'}
+
 
-class OBJECT_OT_animate_letters(bpy.types.Operator):
+class OBJECT_OT_animate_letters(_LetterJobOperator, bpy.types.Operator):
     bl_idname = "type_animator.animate_letters"
     bl_label = "Separate and Animate"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def execute(self, context):
-        props = context.scene.letter_anim_props
-        txt = context.active_object
-        if not txt or txt.type != 'FONT':
-            self.report({'ERROR'}, "Select a text object")
-            return {'CANCELLED'}
+    animate = True
 
-        letters, original_matrix = separate_and_group(txt, props.grouping_tolerance)
-        if not letters:
-            self.report({'ERROR'}, "Could not separate text")
-            return {'CANCELLED'}
 
-        original_name = txt.name
-        controllers = []
-        for i, letter in enumerate(letters):
-            ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Letter_{i+1:02d}", None)
-            context.collection.objects.link(ctrl)
-            ctrl.empty_display_type = 'PLAIN_AXES'
-            ctrl.empty_display_size = 0.5
-            ctrl.matrix_world = letter.matrix_world.copy()
-            safe_parent_with_transform(letter, ctrl)
-            controllers.append(ctrl)
-
-        if props.direction == 'FORWARD':
-            anim_order = list(range(len(controllers)))
-        elif props.direction == 'REVERSE':
-            anim_order = list(range(len(controllers) - 1, -1, -1))
-        else:
-            anim_order = list(range(len(controllers)))
-            random.shuffle(anim_order)
+class TYPE_ANIMATOR_OT_retime_letters(bpy.types.Operator):
+    """Apply the animation settings to procedurally animated letters."""
+    bl_idname = "type_animator.retime_letters"
+    bl_label = "Retime Letters"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        for anim_index, ctrl_index in enumerate(anim_order):
+    def execute(self, context):
+        props = context.scene.letter_anim_props
+        controllers = procedural_controllers(context.selected_objects)
+        if not controllers:
+            self.report({'ERROR'}, "Select a procedurally animated text")
+            return {'CANCELLED'}
+        for anim_index, ctrl_index in enumerate(letter_order(len(controllers), props.direction)):
             ctrl = controllers[ctrl_index]
             start = props.start_frame + anim_index * props.overlap
             direction_factor = 1 if (ctrl_index % 2 == 0) else -1
-            animate_ctrl(ctrl, start, props.duration, props.rot_z, props.scale_start, direction_factor)
-
-        main_ctrl = bpy.data.objects.new(f"CTRL_{original_name}_Main", None)
-        context.collection.objects.link(main_ctrl)
-        main_ctrl.empty_display_type = 'CUBE'
-        main_ctrl.empty_display_size = 1.0
-        main_ctrl.matrix_world = original_matrix
-
-        for ctrl in controllers:
-            safe_parent_with_transform(ctrl, main_ctrl)
-
-        bpy.ops.object.select_all(action='DESELECT')
-        main_ctrl.select_set(True)
-        context.view_layer.objects.active = main_ctrl
-
+            set_letter_signals(ctrl, start, props.duration, props.rot_z, props.scale_start, direction_factor)
         total_frames = props.start_frame + len(controllers) * props.overlap + props.duration
         context.scene.frame_end = max(context.scene.frame_end, total_frames)
-
-        self.report({'INFO'}, f"Animated {len(letters)} letters")
+        self.report({'INFO'}, f"Retimed {len(controllers)} letters")
         return {'FINISHED'}
 
 
@@ -365,6 +740,12 @@ class VIEW3D_PT_type_animator(bpy.types.Panel):
         col.prop(props, "scale_start")
         col.prop(props, "direction")
         col.prop(props, "grouping_tolerance")
+        col.prop(props, "share_meshes")
+        col.prop(props, "mode")
+        if props.mode == 'PROCEDURAL':
+            col.operator("type_animator.retime_letters", icon='TIME')
+        else:
+            col.prop(props, "share_action")
 
         layout.separator()
         box = layout.box()
@@ -386,6 +767,7 @@ classes = (
     TextAnimPreset,
     OBJECT_OT_separate_letters,
     OBJECT_OT_animate_letters,
+    TYPE_ANIMATOR_OT_retime_letters,
     TYPE_ANIMATOR_OT_save_preset,
     TYPE_ANIMATOR_OT_load_preset,
     TYPE_ANIMATOR_OT_remove_preset,
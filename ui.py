@@ -17,23 +17,77 @@ from bpy.types import PropertyGroup, UIList, AddonPreferences, Panel
 from . import signals
 from . import operators
 from . import tunnelfx
+from .core import expr as core_expr
+
+
+class TempoChange(PropertyGroup):
+    frame: IntProperty(default=0, description="Frame the tempo starts at", update=signals.update_tempo)
+    bpm: FloatProperty(default=120.0, min=1.0, description="Beats per minute", update=signals.update_tempo)
+
+
+class Cue(PropertyGroup):
+    name: StringProperty(default="Cue")
+    enabled: BoolProperty(default=True, update=signals.invalidate_cues)
+    marker: StringProperty(default="", description="Timeline marker firing the cue", update=signals.invalidate_cues)
+    preset: StringProperty(default="", description="Preset switched to", update=signals.invalidate_cues)
+    collection: PointerProperty(
+        type=bpy.types.Collection,
+        description="Objects switching to the preset",
+        update=signals.invalidate_cues,
+    )
+    offset_mode: EnumProperty(
+        items=[
+            ('LINEAR', 'Linear', ''),
+            ('RADIAL', 'Radial', ''),
+            ('BPM', 'Beat', ''),
+        ],
+        default='LINEAR',
+        update=signals.invalidate_cues,
+    )
+    step: IntProperty(default=0, description="Frames between objects in linear mode", update=signals.invalidate_cues)
+    radial_factor: FloatProperty(
+        default=1.0, description="Frames per unit from the collection offset", update=signals.invalidate_cues
+    )
+
+
+class SignalLayer(PropertyGroup):
+    name: StringProperty(default="Layer", update=signals.rename_layer)
+    mute: BoolProperty(default=False, description="Stop evaluating the layer", update=signals.invalidate_layers)
+    solo: BoolProperty(default=False, description="Evaluate only soloed layers", update=signals.invalidate_layers)
+
+
+class ModRoute(PropertyGroup):
+    source_kind: EnumProperty(
+        items=[
+            ('LFO', "Global LFO", "A scene level LFO"),
+            ('ITEM', "Animation", "An animation of any object"),
+        ],
+        default='LFO',
+        update=signals.update_mod_routes,
+    )
+    source_object: PointerProperty(type=bpy.types.Object, update=signals.update_mod_routes)
+    source_name: StringProperty(default="", update=signals.update_mod_routes)
+    param: EnumProperty(items=signals.MOD_PARAM_ITEMS, default='amplitude', update=signals.update_mod_routes)
+    depth: FloatProperty(default=1.0, description="Source value multiplier", update=signals.update_mod_routes)
 
 
 class SignalItem(PropertyGroup):
-    enabled: BoolProperty(default=True)
-    name: StringProperty(default="Animation")
-    channel: EnumProperty(items=signals.CHANNEL_ITEMS, default='LOC_X')
-    signal_type: EnumProperty(items=[
-        ('SINE','Sine',''),('COSINE','Cosine',''),('SQUARE','Square',''),
-        ('TRIANGLE','Triangle',''),('SAWTOOTH','Sawtooth',''),('NOISE','Noise','')
-    ], default='SINE')
-    amplitude: FloatProperty(default=1.0, description="Amplitude in Blender units")
+    enabled: BoolProperty(default=True, update=signals.invalidate_layers)
+    layer: StringProperty(
+        default="",
+        description="Layer muting or soloing this animation",
+        update=signals.invalidate_layers,
+    )
+    name: StringProperty(default="Animation", update=signals.update_mod_routes)
+    channel: EnumProperty(items=signals.CHANNEL_ITEMS, default='LOC_X', update=signals.update_item)
+    signal_type: EnumProperty(items=signals.SIGNAL_TYPES, default='SINE', update=signals.update_item)
+    amplitude: FloatProperty(default=1.0, description="Amplitude in Blender units", update=signals.update_item)
     frequency: FloatProperty(default=1.0, min=0.001, description="Cycles per animation length", update=signals.update_frequency)
     amplitude_min: FloatProperty(default=0.5, description="Minimum random amplitude")
     amplitude_max: FloatProperty(default=1.5, description="Maximum random amplitude")
     frequency_min: FloatProperty(default=0.5, min=0.001, description="Minimum random frequency")
     frequency_max: FloatProperty(default=2.0, min=0.001, description="Maximum random frequency")
-    phase_offset: FloatProperty(default=0.0, description="Phase offset in degrees")
+    phase_offset: FloatProperty(default=0.0, description="Phase offset in degrees", update=signals.update_item)
     duration: IntProperty(
         default=24,
         min=1,
@@ -41,21 +95,133 @@ class SignalItem(PropertyGroup):
         update=signals.update_duration,
     )
     offset: IntProperty(default=0, description="Start frame offset", update=signals.update_offset)
-    loop_count: IntProperty(default=0, description="Number of loops (0=inf)")
-    blend_frames: IntProperty(default=0, description="Blend frames at loop end")
-    use_clamp: BoolProperty(default=False, description="Clamp output range")
-    clamp_min: FloatProperty(default=-1.0)
-    clamp_max: FloatProperty(default=1.0)
-    noise_seed: IntProperty(default=0, description="Seed for noise signals")
-    smoothing: FloatProperty(default=0.0, min=0.0, max=1.0, description="Smoothing factor")
-    base_value: FloatProperty(default=0.0)
-    start_frame: IntProperty(default=0)
+    loop_count: IntProperty(default=0, description="Number of loops (0=inf)", update=signals.update_item)
+    blend_frames: IntProperty(default=0, description="Blend frames at loop end", update=signals.update_item)
+    use_clamp: BoolProperty(default=False, description="Clamp output range", update=signals.update_item)
+    clamp_min: FloatProperty(default=-1.0, update=signals.update_item)
+    clamp_max: FloatProperty(default=1.0, update=signals.update_item)
+    noise_seed: IntProperty(default=0, description="Seed for noise signals", update=signals.update_item)
+    smoothing: FloatProperty(
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        description="Smoothing factor",
+        update=signals.update_item,
+    )
+    base_value: FloatProperty(default=0.0, update=signals.update_item)
+    start_frame: IntProperty(default=0, update=signals.update_item)
     marker_name: StringProperty(default="")
+    vertex_phase: EnumProperty(
+        items=signals.VERTEX_PHASE_ITEMS,
+        default='NONE',
+        description="How vertex waves are delayed across the mesh",
+        update=signals.update_vertex_phase,
+    )
+    phase_scale: FloatProperty(default=4.0, description="Delay in frames per unit of the phase source")
+    vertex_group: StringProperty(
+        default="", description="Vertex group used as phase source", update=signals.update_vertex_phase
+    )
+    mod_routes: CollectionProperty(type=ModRoute)
+    audio_file: StringProperty(
+        default="",
+        subtype='FILE_PATH',
+        description="WAV file of Audio signals",
+        update=signals.update_audio,
+    )
+    audio_band: EnumProperty(items=signals.AUDIO_BAND_ITEMS, default='RMS', update=signals.update_audio)
+    audio_attack: FloatProperty(default=0.0, min=0.0, description="Rise time in frames", update=signals.update_audio)
+    audio_release: FloatProperty(default=4.0, min=0.0, description="Fall time in frames", update=signals.update_audio)
+    trigger_source: StringProperty(
+        default="NONE",
+        description="What restarts the signal: NONE, MARKERS or the key of a MIDI lane",
+        update=signals.update_item,
+    )
+    trigger_lane: EnumProperty(
+        items=signals.trigger_lane_items,
+        get=signals.get_trigger_lane,
+        set=signals.set_trigger_lane,
+        description="MIDI lane whose notes restart the signal",
+    )
+    live_address: StringProperty(
+        default="/vj/1",
+        description="OSC address read by Live signals",
+        update=signals.update_item,
+    )
+    live_index: IntProperty(
+        default=0,
+        min=0,
+        max=3,
+        description="Argument of the OSC message to read",
+        update=signals.update_item,
+    )
+    marker_pattern: StringProperty(
+        default="*",
+        description="Timeline markers that trigger the signal, as comma separated wildcards",
+        update=signals.invalidate_markers,
+    )
+    adsr_shape: EnumProperty(items=signals.ADSR_SHAPE_ITEMS, default='LINEAR', update=signals.update_item)
+    adsr_attack: FloatProperty(
+        default=2.0,
+        min=0.0,
+        description="Attack time in frames",
+        update=signals.update_item,
+    )
+    adsr_decay: FloatProperty(
+        default=6.0,
+        min=0.0,
+        description="Decay time in frames",
+        update=signals.update_item,
+    )
+    adsr_sustain: FloatProperty(
+        default=0.6,
+        min=0.0,
+        max=1.0,
+        description="Sustain level",
+        update=signals.update_item,
+    )
+    adsr_release: FloatProperty(
+        default=12.0,
+        min=0.0,
+        description="Release time in frames",
+        update=signals.update_item,
+    )
+    time_unit: EnumProperty(items=signals.TIME_UNIT_ITEMS, default='FRAMES', update=signals.update_item)
+    beat_duration: FloatProperty(
+        default=4.0,
+        min=0.01,
+        description="Cycle length in beats or bars",
+        update=signals.update_item,
+    )
+    beat_offset: FloatProperty(
+        default=0.0,
+        description="Start offset in beats or bars",
+        update=signals.update_item,
+    )
+    expression: StringProperty(
+        default="sine(t)",
+        description="Waveform of Expression signals, using t, frame, cycle, seed, waves and noise()",
+        update=signals.update_item,
+    )
+    data_path: StringProperty(
+        default="",
+        description="Property path relative to the object, e.g. data.energy",
+        update=signals.update_data_path,
+    )
+    native: BoolProperty(
+        default=False,
+        description="Evaluated by Blender instead of the frame handler",
+        update=signals.invalidate_layers,
+    )
+
+
+class SignalStack(PropertyGroup):
+    name: StringProperty(default="Stack", update=signals.invalidate_stacks)
+    items: CollectionProperty(type=SignalItem)
 
 
 class SignalPreset(PropertyGroup):
-    name: StringProperty(default="Preset")
-    data: StringProperty(default="")
+    name: StringProperty(default="Preset", update=signals.invalidate_cues)
+    data: StringProperty(default="", update=signals.invalidate_cues)
     preview_icon: StringProperty(default="")
     category: StringProperty(default="General")
 
@@ -70,6 +236,11 @@ class VJLOOPER_UL_presets(UIList):
             'SAWTOOTH': 'IPO_LIN',
             'COSINE': 'IPO_ELASTIC',
             'NOISE': 'RNDCURVE',
+            'RAMP': 'IPO_EASE_IN_OUT',
+            'EXPR': 'CONSOLE',
+            'AUDIO': 'SOUND',
+            'ADSR': 'IPO_EXPO',
+            'LIVE': 'LINKED',
         }
         presets = getattr(data, "signal_presets")
         order = getattr(self, "_cached_order", None)
@@ -166,6 +337,7 @@ class VJLOOPER_PT_panel(Panel):
         h.label(text="Animations")
         if sc.ui_show_items:
             self.draw_items_ui(col, ctx)
+            self.draw_lfos_ui(col, ctx)
 
         h = col.row()
         h.prop(sc, "ui_show_presets", text="", icon='TRIA_DOWN' if sc.ui_show_presets else 'TRIA_RIGHT', emboss=False)
@@ -192,6 +364,8 @@ class VJLOOPER_PT_panel(Panel):
         box = col.box()
         box.label(text="Create Animation")
         box.prop(sc, "signal_new_channel", text="Channel", expand=True)
+        if sc.signal_new_channel == 'DATA_PATH':
+            box.prop(sc, "signal_new_data_path", text="Path")
         box.template_icon_view(sc, "signal_new_type", show_labels=True, scale=5.0)
         row = box.row()
         col1, col2 = row.column(), row.column()
@@ -226,9 +400,43 @@ class VJLOOPER_PT_panel(Panel):
                 header = sub.row(align=True)
                 header.prop(it, "enabled", text="")
                 header.prop(it, "name", text="")
+                header.prop_search(it, "layer", ctx.scene, "vj_layers", text="", icon='RENDERLAYERS')
                 header.operator("vjlooper.remove_signal", icon='X', text="").index = i
                 sub.template_icon_view(it, "signal_type", scale=5.0)
+                if it.signal_type == 'AUDIO':
+                    self.draw_audio_ui(sub, ctx, it)
+                if it.signal_type == 'ADSR':
+                    r = sub.row(align=True)
+                    r.prop(it, "adsr_attack", text="A")
+                    r.prop(it, "adsr_decay", text="D")
+                    r.prop(it, "adsr_sustain", text="S")
+                    r.prop(it, "adsr_release", text="R")
+                    sub.prop(it, "adsr_shape", text="Shape")
+                if it.signal_type == 'LIVE':
+                    r = sub.row(align=True)
+                    r.prop(it, "live_address", text="", icon='LINKED')
+                    r.prop(it, "live_index", text="Arg")
+                r = sub.row(align=True)
+                r.prop(it, "trigger_lane", text="Trigger", icon='PLAY')
+                if it.trigger_source == 'MARKERS':
+                    r.prop(it, "marker_pattern", text="", icon='MARKER')
+                elif it.trigger_source != 'NONE' and it.trigger_source not in signals.midi_lanes(ctx.scene):
+                    sub.label(text=f"{it.trigger_source} is not in the MIDI file", icon='ERROR')
+                if it.signal_type == 'EXPR':
+                    sub.prop(it, "expression", text="", icon='CONSOLE')
+                    err = core_expr.error(it.expression)
+                    if err:
+                        sub.label(text=err, icon='ERROR')
                 sub.prop(it, "channel", expand=True)
+                if it.channel == 'DATA_PATH':
+                    sub.prop(it, "data_path", text="Path")
+                if it.channel.startswith("VTX_"):
+                    r = sub.row(align=True)
+                    r.prop(it, "vertex_phase", text="Phase")
+                    if it.vertex_phase == 'GROUP':
+                        r.prop_search(it, "vertex_group", obj, "vertex_groups", text="")
+                    if it.vertex_phase != 'NONE':
+                        r.prop(it, "phase_scale", text="Delay")
                 row = sub.row()
                 c1, c2 = row.column(), row.column()
                 c1.prop(it, "amplitude")
@@ -238,7 +446,10 @@ class VJLOOPER_PT_panel(Panel):
                 rowf.alert = not perfect
                 rowf.label(icon='CHECKMARK' if perfect else 'ERROR')
                 c2.prop(it, "phase_offset")
-                c2.prop(it, "duration")
+                if it.time_unit == 'FRAMES':
+                    c2.prop(it, "duration")
+                else:
+                    c2.prop(it, "beat_duration", text="Duration")
                 r = sub.row()
                 c3, c4 = r.column(), r.column()
                 c3.prop(it, "amplitude_min", text="Amp Min")
@@ -246,7 +457,12 @@ class VJLOOPER_PT_panel(Panel):
                 c4.prop(it, "amplitude_max", text="Amp Max")
                 c4.prop(it, "frequency_max", text="Freq Max")
                 sub.operator("vjlooper.randomize_signal", text="Randomize").index = i
-                sub.prop(it, "offset")
+                self.draw_routes_ui(sub, ctx, it, i)
+                sub.prop(it, "time_unit", expand=True)
+                if it.time_unit == 'FRAMES':
+                    sub.prop(it, "offset")
+                else:
+                    sub.prop(it, "beat_offset", text="Offset")
                 sub.prop(it, "loop_count")
                 sub.prop(it, "blend_frames")
                 sub.prop(it, "use_clamp")
@@ -255,12 +471,167 @@ class VJLOOPER_PT_panel(Panel):
                     r.prop(it, "clamp_min")
                     r.prop(it, "clamp_max")
 
+    def draw_audio_ui(self, L, ctx, it):
+        L.prop(it, "audio_file", text="")
+        row = L.row(align=True)
+        row.prop(it, "audio_band", expand=True)
+        row = L.row(align=True)
+        row.prop(it, "audio_attack", text="Attack")
+        row.prop(it, "audio_release", text="Release")
+        if it.audio_file:
+            source = bpy.path.abspath(it.audio_file)
+            fps = ctx.scene.render.fps / ctx.scene.render.fps_base
+            error = signals.audio_cache().errors.get((source, fps))
+            if error:
+                L.label(text=error, icon='ERROR')
+            elif signals.audio_cache().get(source, fps) is None:
+                L.label(text="Analyzing...", icon='SORTTIME')
+
+    def draw_routes_ui(self, L, ctx, it, index):
+        sc = ctx.scene
+        row = L.row()
+        row.label(text="Modulation", icon='MODIFIER')
+        row.operator("vjlooper.add_mod_route", text="", icon='ADD').index = index
+        for j, r in enumerate(it.mod_routes):
+            row = L.row(align=True)
+            row.prop(r, "source_kind", text="")
+            if r.source_kind == 'LFO':
+                row.prop_search(r, "source_name", sc, "vj_lfos", text="")
+            else:
+                row.prop(r, "source_object", text="")
+                if r.source_object:
+                    row.prop_search(r, "source_name", r.source_object, "signal_items", text="")
+            row.prop(r, "param", text="")
+            row.prop(r, "depth", text="Depth")
+            op = row.operator("vjlooper.remove_mod_route", text="", icon='X')
+            op.index = index
+            op.route = j
+        if signals.mod_state["error"] and it.mod_routes:
+            L.label(text=signals.mod_state["error"], icon='ERROR')
+
+    def draw_lfos_ui(self, L, ctx):
+        sc = ctx.scene
+        col = L.column()
+        row = col.row()
+        row.label(text="Global LFOs", icon='FORCE_HARMONIC')
+        row.operator("vjlooper.add_lfo", text="", icon='ADD')
+        for i, lfo in enumerate(sc.vj_lfos):
+            box = col.box()
+            header = box.row(align=True)
+            header.prop(lfo, "enabled", text="")
+            header.prop(lfo, "name", text="")
+            header.prop(lfo, "signal_type", text="")
+            header.operator("vjlooper.remove_lfo", text="", icon='X').index = i
+            r = box.row(align=True)
+            r.prop(lfo, "amplitude")
+            r.prop(lfo, "frequency")
+            r.prop(lfo, "duration")
+
+    def draw_tempo_ui(self, L, ctx):
+        sc = ctx.scene
+        box = L.box()
+        row = box.row(align=True)
+        row.label(text="Tempo", icon='TIME')
+        row.operator("vjlooper.tap_tempo", text="Tap")
+        row.operator("vjlooper.add_tempo_change", text="", icon='ADD')
+        row = box.row(align=True)
+        row.prop(sc, "offset_bpm", text="BPM")
+        row.prop(sc, "vj_beats_per_bar", text="Beats/Bar")
+        row = box.row(align=True)
+        row.prop(sc, "vj_midi_file", text="MIDI")
+        row.operator("vjlooper.import_midi", text="", icon='FILEBROWSER')
+        if signals.midi_state["error"]:
+            box.label(text=signals.midi_state["error"], icon='ERROR')
+        for i, change in enumerate(sc.vj_tempo_changes):
+            row = box.row(align=True)
+            row.prop(change, "frame")
+            row.prop(change, "bpm")
+            row.operator("vjlooper.remove_tempo_change", text="", icon='X').index = i
+
+    def draw_layers_ui(self, L, ctx):
+        sc = ctx.scene
+        box = L.box()
+        row = box.row(align=True)
+        row.label(text="Layers", icon='RENDERLAYERS')
+        row.operator("vjlooper.add_layer", text="", icon='ADD')
+        for i, layer in enumerate(sc.vj_layers):
+            r = box.row(align=True)
+            r.prop(layer, "name", text="")
+            r.prop(layer, "mute", text="", icon='HIDE_ON' if layer.mute else 'HIDE_OFF')
+            r.prop(layer, "solo", text="", icon='SOLO_ON' if layer.solo else 'SOLO_OFF')
+            r.operator("vjlooper.assign_layer", text="", icon='RESTRICT_SELECT_OFF').layer = layer.name
+            r.operator("vjlooper.remove_layer", text="", icon='X').index = i
+
+    def draw_stacks_ui(self, L, ctx):
+        sc = ctx.scene
+        obj = ctx.object
+        box = L.box()
+        row = box.row(align=True)
+        row.label(text="Shared Stacks", icon='LINKED')
+        row.operator("vjlooper.make_stack", text="", icon='ADD')
+        if obj is not None:
+            col = box.column(align=True)
+            col.prop_search(obj, "vj_stack", sc, "vj_stacks", text="Object")
+            if obj.vj_stack:
+                r = col.row(align=True)
+                r.prop(obj, "vj_stack_offset", text="Offset")
+                r.prop(obj, "vj_stack_phase", text="Phase")
+                r.prop(obj, "vj_stack_amp", text="Amp")
+        if not sc.vj_stacks:
+            return
+        row = box.row(align=True)
+        row.prop(sc, "vj_stack_index", text="Stack")
+        row.operator("vjlooper.link_stack", text="Link Selected")
+        row.operator("vjlooper.unlink_stack", text="Unlink")
+        if sc.vj_stack_index >= len(sc.vj_stacks):
+            return
+        stack = sc.vj_stacks[sc.vj_stack_index]
+        row = box.row(align=True)
+        row.prop(stack, "name", text="")
+        row.operator("vjlooper.add_stack_item", text="", icon='ADD')
+        for i, it in enumerate(stack.items):
+            sub = box.box().column(align=True)
+            r = sub.row(align=True)
+            r.prop(it, "enabled", text="")
+            r.prop(it, "name", text="")
+            r.prop(it, "signal_type", text="")
+            r.operator("vjlooper.remove_stack_item", text="", icon='X').index = i
+            sub.prop(it, "channel", text="")
+            if it.channel == 'DATA_PATH':
+                sub.prop(it, "data_path", text="Path")
+            r = sub.row(align=True)
+            r.prop(it, "amplitude")
+            r.prop(it, "frequency")
+            r = sub.row(align=True)
+            r.prop(it, "duration")
+            r.prop(it, "base_value")
+
+    def draw_osc_ui(self, L, ctx):
+        box = L.box()
+        listener = signals.osc_state["listener"]
+        row = box.row(align=True)
+        row.label(text="OSC Input", icon='LINKED')
+        row.prop(ctx.scene, "vj_osc_port", text="Port")
+        running = listener is not None and listener.running
+        row.operator(
+            "vjlooper.osc_listen", text="Stop" if running else "Listen", depress=running
+        ).enable = not running
+        if listener is None:
+            return
+        if listener.error:
+            box.label(text=listener.error, icon='ERROR')
+        st = listener.stats()
+        box.label(text=f"{st['messages']} messages, {st['dropped']} dropped, {st['addresses']} addresses")
+        box.label(text=f"{st['us_per_packet']:.0f} us/packet, {st['load'] * 100:.2f}% load")
+
     def draw_presets_ui(self, L, ctx):
         sc = ctx.scene
         col = L.column()
         col.use_property_split = True
         col.operator("vjlooper.add_preset", text="Save Preset")
-        col.operator("vjlooper.load_preset", text="Load Preset")
+        row = col.row(align=True)
+        row.operator("vjlooper.load_preset", text="Load Preset")
+        row.operator("vjlooper.morph_preset", text="Morph", icon='IPO_EASE_IN_OUT')
         col.operator("vjlooper.export_presets", text="Export Presets")
         col.operator("vjlooper.import_presets", text="Import Presets")
         col.prop(sc, "preset_category_filter", text="Category Filter")
@@ -277,11 +648,41 @@ class VJLOOPER_PT_panel(Panel):
             row2 = col.row(align=True)
             row2.prop(sc, "offset_mode", text="Mode")
             row2.operator("vjlooper.apply_preset_offset", text="Apply with Offset")
+            row2.operator("vjlooper.make_instancer", text="", icon='PARTICLES').mode = sc.offset_mode
             col.prop(sc, "offset_radial_factor")
             col.prop(sc, "offset_bpm")
             col.prop(sc, "preset_mirror", text="Mirror")
             col.prop(sc, "brush_offset_step", text="Brush Step")
             col.operator("vjlooper.toggle_preset_brush", text="Toggle Preset Brush", depress=sc.preset_brush_active)
+        self.draw_cues_ui(col, ctx)
+
+    def draw_cues_ui(self, L, ctx):
+        sc = ctx.scene
+        box = L.box()
+        row = box.row(align=True)
+        row.prop(sc, "vj_cues_enabled", text="Cue List", icon='SEQUENCE')
+        row.operator("vjlooper.compile_cues", text="", icon='FILE_REFRESH')
+        row.operator("vjlooper.add_cue", text="", icon='ADD')
+        cl = signals.cue_state["list"]
+        if cl is not None:
+            box.label(text=f"{len(cl)} cues compiled")
+        if signals.cue_state["error"]:
+            box.label(text=signals.cue_state["error"], icon='ERROR')
+        for i, cue in enumerate(sc.vj_cues):
+            col = box.box().column(align=True)
+            r = col.row(align=True)
+            r.prop(cue, "enabled", text="")
+            r.prop(cue, "name", text="")
+            r.operator("vjlooper.remove_cue", text="", icon='X').index = i
+            col.prop_search(cue, "marker", sc, "timeline_markers", text="", icon='MARKER')
+            col.prop_search(cue, "preset", sc, "signal_presets", text="", icon='PRESET')
+            col.prop(cue, "collection", text="", icon='OUTLINER_COLLECTION')
+            r = col.row(align=True)
+            r.prop(cue, "offset_mode", text="")
+            if cue.offset_mode == 'LINEAR':
+                r.prop(cue, "step")
+            elif cue.offset_mode == 'RADIAL':
+                r.prop(cue, "radial_factor", text="Factor")
 
     def draw_bake_ui(self, L):
         L.separator()
@@ -289,6 +690,9 @@ class VJLOOPER_PT_panel(Panel):
         col.use_property_split = True
         col.operator("vjlooper.bake_settings", icon='REC', text="Bake Settings")
         col.operator("vjlooper.bake_animation", text="Bake Animation")
+        row = col.row(align=True)
+        row.operator("vjlooper.compile_native", icon='FCURVE', text="Compile to Native")
+        row.operator("vjlooper.decompile_native", text="", icon='LOOP_BACK')
 
     def draw_materials_ui(self, L, ctx):
         sc = ctx.scene
@@ -326,6 +730,10 @@ class VJLOOPER_PT_panel(Panel):
 
         L.separator()
         L.prop(ctx.scene, "loop_lock", text="Loop Lock")
+        self.draw_tempo_ui(L, ctx)
+        self.draw_osc_ui(L, ctx)
+        self.draw_stacks_ui(L, ctx)
+        self.draw_layers_ui(L, ctx)
         L.operator("vjlooper.hot_reload", icon='FILE_REFRESH', text="Reload Addon")
 
 
@@ -378,7 +786,12 @@ def unregister_keymaps():
 
 
 property_classes = (
+    TempoChange,
+    Cue,
+    SignalLayer,
+    ModRoute,
     SignalItem,
+    SignalStack,
     SignalPreset,
     VJMaterialItem,
 )
@@ -409,13 +822,39 @@ def register_props():
     bpy.types.Object.signal_items = CollectionProperty(type=SignalItem)
     if hasattr(bpy.types.Object, "global_amp_scale"):
         del bpy.types.Object.global_amp_scale
-    bpy.types.Object.global_amp_scale = FloatProperty(default=1.0, description="Amplitude multiplier")
+    bpy.types.Object.global_amp_scale = FloatProperty(
+        default=1.0, description="Amplitude multiplier", update=signals.invalidate_preview
+    )
     if hasattr(bpy.types.Object, "global_freq_scale"):
         del bpy.types.Object.global_freq_scale
-    bpy.types.Object.global_freq_scale = FloatProperty(default=1.0, description="Frequency multiplier")
+    bpy.types.Object.global_freq_scale = FloatProperty(
+        default=1.0, description="Frequency multiplier", update=signals.invalidate_preview
+    )
     if hasattr(bpy.types.Object, "global_dur_scale"):
         del bpy.types.Object.global_dur_scale
-    bpy.types.Object.global_dur_scale = FloatProperty(default=1.0, description="Duration multiplier")
+    bpy.types.Object.global_dur_scale = FloatProperty(
+        default=1.0, description="Duration multiplier", update=signals.invalidate_preview
+    )
+    if hasattr(bpy.types.Object, "vj_stack"):
+        del bpy.types.Object.vj_stack
+    bpy.types.Object.vj_stack = StringProperty(
+        default="", description="Shared signal stack driving this object", update=signals.invalidate_stacks
+    )
+    if hasattr(bpy.types.Object, "vj_stack_offset"):
+        del bpy.types.Object.vj_stack_offset
+    bpy.types.Object.vj_stack_offset = IntProperty(
+        default=0, description="Frames this object runs behind its stack", update=signals.invalidate_stacks
+    )
+    if hasattr(bpy.types.Object, "vj_stack_phase"):
+        del bpy.types.Object.vj_stack_phase
+    bpy.types.Object.vj_stack_phase = FloatProperty(
+        default=0.0, description="Phase added to the stack in degrees", update=signals.invalidate_stacks
+    )
+    if hasattr(bpy.types.Object, "vj_stack_amp"):
+        del bpy.types.Object.vj_stack_amp
+    bpy.types.Object.vj_stack_amp = FloatProperty(
+        default=1.0, description="Amplitude scale of the stack", update=signals.invalidate_stacks
+    )
 
     sc = bpy.types.Scene
     if hasattr(sc, "signal_new_channel"):
@@ -423,10 +862,7 @@ def register_props():
     sc.signal_new_channel = EnumProperty(items=signals.CHANNEL_ITEMS, default='LOC_X')
     if hasattr(sc, "signal_new_type"):
         delattr(sc, "signal_new_type")
-    sc.signal_new_type = EnumProperty(items=[
-        ('SINE', 'Sine', ''), ('COSINE', 'Cosine', ''), ('SQUARE', 'Square', ''),
-        ('TRIANGLE', 'Triangle', ''), ('SAWTOOTH', 'Sawtooth', ''), ('NOISE', 'Noise', '')
-    ], default='SINE')
+    sc.signal_new_type = EnumProperty(items=signals.SIGNAL_TYPES, default='SINE')
     if hasattr(sc, "signal_new_amplitude"):
         delattr(sc, "signal_new_amplitude")
     sc.signal_new_amplitude = FloatProperty(default=1.0, description="Default amplitude")
@@ -468,10 +904,16 @@ def register_props():
     if hasattr(sc, "signal_new_smoothing"):
         delattr(sc, "signal_new_smoothing")
     sc.signal_new_smoothing = FloatProperty(default=0.0, description="Smoothing")
+    if hasattr(sc, "signal_new_data_path"):
+        delattr(sc, "signal_new_data_path")
+    sc.signal_new_data_path = StringProperty(default="", description="Property path for Data Path channels")
 
     if hasattr(sc, "signal_presets"):
         delattr(sc, "signal_presets")
     sc.signal_presets = CollectionProperty(type=SignalPreset)
+    if hasattr(sc, "vj_lfos"):
+        delattr(sc, "vj_lfos")
+    sc.vj_lfos = CollectionProperty(type=SignalItem)
     if hasattr(sc, "signal_preset_index"):
         delattr(sc, "signal_preset_index")
     sc.signal_preset_index = IntProperty(default=0)
@@ -518,13 +960,51 @@ def register_props():
     sc.offset_radial_factor = FloatProperty(default=1.0, description="Frames per unit for radial offset")
     if hasattr(sc, "offset_bpm"):
         delattr(sc, "offset_bpm")
-    sc.offset_bpm = IntProperty(default=120, description="BPM for beat grid")
+    sc.offset_bpm = IntProperty(default=120, description="BPM for beat grid", update=signals.update_tempo)
+    if hasattr(sc, "vj_tempo_changes"):
+        delattr(sc, "vj_tempo_changes")
+    sc.vj_tempo_changes = CollectionProperty(type=TempoChange)
+    if hasattr(sc, "vj_beats_per_bar"):
+        delattr(sc, "vj_beats_per_bar")
+    sc.vj_beats_per_bar = IntProperty(default=4, min=1, description="Beats per bar", update=signals.update_tempo)
+    if hasattr(sc, "vj_midi_file"):
+        delattr(sc, "vj_midi_file")
+    sc.vj_midi_file = StringProperty(
+        default="",
+        subtype='FILE_PATH',
+        description="MIDI file whose notes and controllers trigger signals",
+        update=signals.update_midi,
+    )
+    if hasattr(sc, "vj_osc_port"):
+        delattr(sc, "vj_osc_port")
+    sc.vj_osc_port = IntProperty(default=9000, min=1, max=65535, description="UDP port for OSC input")
+    if hasattr(sc, "vj_stacks"):
+        delattr(sc, "vj_stacks")
+    sc.vj_stacks = CollectionProperty(type=SignalStack)
+    if hasattr(sc, "vj_layers"):
+        delattr(sc, "vj_layers")
+    sc.vj_layers = CollectionProperty(type=SignalLayer)
+    if hasattr(sc, "vj_stack_index"):
+        delattr(sc, "vj_stack_index")
+    sc.vj_stack_index = IntProperty(default=0)
+    if hasattr(sc, "vj_cues"):
+        delattr(sc, "vj_cues")
+    sc.vj_cues = CollectionProperty(type=Cue)
+    if hasattr(sc, "vj_cues_enabled"):
+        delattr(sc, "vj_cues_enabled")
+    sc.vj_cues_enabled = BoolProperty(
+        default=False, description="Switch presets at cue markers during playback", update=signals.invalidate_cues
+    )
     if hasattr(sc, "preset_mirror"):
         delattr(sc, "preset_mirror")
-    sc.preset_mirror = BoolProperty(default=False, description="Mirror amplitude when loading")
+    sc.preset_mirror = BoolProperty(
+        default=False, description="Mirror amplitude when loading", update=signals.invalidate_cues
+    )
     if hasattr(sc, "loop_lock"):
         delattr(sc, "loop_lock")
-    sc.loop_lock = BoolProperty(default=False, description="Quantize signals for perfect loops")
+    sc.loop_lock = BoolProperty(
+        default=False, description="Quantize signals for perfect loops", update=signals.update_loop_lock
+    )
     if hasattr(sc, "preset_brush_active"):
         delattr(sc, "preset_brush_active")
     sc.preset_brush_active = BoolProperty(default=False, description="Enable preset brush mode")
@@ -566,16 +1046,21 @@ def unregister_props():
         del bpy.types.Object.global_freq_scale
     if hasattr(bpy.types.Object, "global_dur_scale"):
         del bpy.types.Object.global_dur_scale
+    for prop in ("vj_stack", "vj_stack_offset", "vj_stack_phase", "vj_stack_amp"):
+        if hasattr(bpy.types.Object, prop):
+            delattr(bpy.types.Object, prop)
 
     for prop in [
         "signal_new_channel", "signal_new_type", "signal_new_amplitude",
         "signal_new_frequency", "signal_new_phase", "signal_new_duration",
         "signal_new_offset", "signal_new_loops", "signal_new_clamp",
         "signal_new_clamp_min", "signal_new_clamp_max", "signal_new_noise",
-        "signal_new_smoothing", "signal_presets", "signal_preset_index",
+        "signal_new_smoothing", "signal_new_data_path", "signal_presets", "vj_lfos", "signal_preset_index",
         "preset_category_filter", "category_rename_from", "category_rename_to",
         "ui_show_create", "ui_show_items", "ui_show_presets", "ui_show_bake", "ui_show_materials", "ui_show_misc",
         "multi_offset_frames", "offset_mode", "offset_radial_factor", "offset_bpm",
+        "vj_tempo_changes", "vj_beats_per_bar", "vj_midi_file", "vj_osc_port",
+        "vj_cues", "vj_cues_enabled", "vj_stacks", "vj_stack_index", "vj_layers",
         "preset_mirror", "preset_brush_active", "brush_offset_step",
         "loop_lock",
         "bake_start", "bake_end", "bake_channel",